@@ -1,10 +1,22 @@
 """Logging configuration for the Agents service."""
 import logging
+import re
 import sys
 import structlog
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Union
 from .settings import settings
 
+# Emoji and pictographs (plus the variation selector that often trails them)
+_EMOJI_RE = re.compile(r"[\U0001F300-\U0001FAFF\u2600-\u27BF]\uFE0F?\s?")
+
+
+def _strip_emoji(logger: Any, method_name: str, event_dict: Dict[str, Any]) -> Dict[str, Any]:
+    """Remove emoji from the event message so plain logs stay ASCII-friendly."""
+    event = event_dict.get("event")
+    if isinstance(event, str):
+        event_dict["event"] = _EMOJI_RE.sub("", event)
+    return event_dict
+
 
 def setup_logging() -> None:
     """Configure structured logging for the service."""
@@ -21,18 +33,25 @@ def setup_logging() -> None:
     logging.getLogger("posthog").setLevel(logging.ERROR)
     logging.getLogger("chromadb.telemetry").setLevel(logging.ERROR)
 
+    processors = [
+        structlog.contextvars.merge_contextvars,
+        structlog.processors.add_log_level,
+        structlog.processors.StackInfoRenderer(),
+        structlog.processors.format_exc_info,
+        structlog.dev.set_exc_info,
+        structlog.processors.TimeStamper(fmt="iso"),
+    ]
+    # 生产环境可关闭 emoji，减少编码开销与日志体积
+    if settings.log_plain:
+        processors.append(_strip_emoji)
+    processors.append(
+        structlog.dev.ConsoleRenderer() if settings.log_level.lower() == "debug"
+        else structlog.processors.JSONRenderer()
+    )
+
     # 配置 structlog
     structlog.configure(
-        processors=[
-            structlog.contextvars.merge_contextvars,
-            structlog.processors.add_log_level,
-            structlog.processors.StackInfoRenderer(),
-            structlog.processors.format_exc_info,
-            structlog.dev.set_exc_info,
-            structlog.processors.TimeStamper(fmt="iso"),
-            structlog.dev.ConsoleRenderer() if settings.log_level.lower() == "debug"
-            else structlog.processors.JSONRenderer(),
-        ],
+        processors=processors,
         wrapper_class=structlog.make_filtering_bound_logger(
             getattr(logging, settings.log_level.upper(), logging.INFO)
         ),
@@ -46,9 +65,27 @@ def get_logger(name: str) -> structlog.BoundLogger:
     return structlog.get_logger(name)
 
 
-def log_grpc_call(method: str, request_data: Dict[str, Any]) -> None:
-    """Log gRPC method calls with structured data."""
-    logger = get_logger("grpc")
+_GRPC_CALL_LOGGER = "agents.grpc"
+
+
+def log_grpc_call(
+    method: str,
+    request_data: Union[Dict[str, Any], Callable[[], Dict[str, Any]]],
+) -> None:
+    """Log gRPC method calls with structured data.
+
+    ``request_data`` may be a zero-argument callable, in which case it is only
+    evaluated when request logging is turned on (``monitoring.log_requests``)
+    and INFO is enabled for the call logger.
+    """
+    # Not the "grpc" logger: setup_logging pins the grpc library's logger to WARNING
+    if not settings.monitoring.log_requests:
+        return
+    if not logging.getLogger(_GRPC_CALL_LOGGER).isEnabledFor(logging.INFO):
+        return
+    if callable(request_data):
+        request_data = request_data()
+    logger = get_logger(_GRPC_CALL_LOGGER)
     logger.info(
         "gRPC call received",
         method=method,
@@ -82,6 +82,7 @@ class MonitoringConfig(BaseSettings):
     metrics_enabled: bool = Field(default=True)
     metrics_port: int = Field(default=8080)
     health_check_interval: int = Field(default=30)
+    log_requests: bool = Field(default=False)
     
     class Config:
         env_prefix = "METRICS_" or "HEALTH_"
@@ -93,9 +94,11 @@ class Settings(BaseSettings):
     # Server Configuration
     agents_grpc_port: int = Field(default=50052)
     agents_host: str = Field(default="0.0.0.0")
+    agents_workers: int = Field(default_factory=lambda: os.cpu_count() or 1)
     fetcher_grpc_port: int = Field(default=50051)
     fetcher_host: str = Field(default="0.0.0.0")
     log_level: str = Field(default="debug")
+    log_plain: bool = Field(default=False, description="Strip emoji from log messages")
 
     # New: Data directory
     data_dir: Path = Field(default=Path("./data"), description="Local directory for data storage")
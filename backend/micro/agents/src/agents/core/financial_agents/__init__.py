@@ -1,6 +1,17 @@
 from .utils.agent_utils import Toolkit, create_msg_delete
-from .utils.agent_states import AgentState, InvestDebateState, RiskDebateState
+from .utils.agent_states import (
+    AgentState,
+    InvestDebateState,
+    RiskDebateState,
+    FundamentalsState,
+    RiskState,
+    SentimentState,
+    MacroState,
+    TradeAdviceState,
+    InvestmentAdviceState,
+)
 from .utils.memory import FinancialSituationMemory
+from .utils.result_cache import AnalysisResultCache
 
 from .analysts.fundamentals_analyst import create_fundamentals_analyst
 from .analysts.market_analyst import create_market_analyst
@@ -20,12 +31,19 @@ from .managers.risk_manager import create_risk_manager
 from .trader.trader import create_trader
 
 __all__ = [
+    "AnalysisResultCache",
     "FinancialSituationMemory",
     "Toolkit",
     "AgentState",
     "create_msg_delete",
     "InvestDebateState",
     "RiskDebateState",
+    "FundamentalsState",
+    "RiskState",
+    "SentimentState",
+    "MacroState",
+    "TradeAdviceState",
+    "InvestmentAdviceState",
     "create_bear_researcher",
     "create_bull_researcher",
     "create_research_manager",
@@ -1,4 +1,6 @@
-from typing import Annotated
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import Annotated, Any, Dict, List, Optional
 
 from langgraph.graph import MessagesState
 from typing_extensions import TypedDict
@@ -70,3 +72,79 @@ class AgentState(MessagesState):
         RiskDebateState, "Current state of the debate on evaluating risk"
     ]
     final_trade_decision: Annotated[str, "Final decision made by the Risk Analysts"]
+
+
+# Per-RPC request states built by the gRPC handlers
+class _SlottedState(Mapping):
+    """Read-only mapping view over a slotted dataclass, so nodes can keep using state["key"]."""
+
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        if key not in type(self).__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(type(self).__slots__)
+
+    def __len__(self):
+        return len(type(self).__slots__)
+
+
+@dataclass(slots=True)
+class FundamentalsState(_SlottedState):
+    user_id: str
+    symbols: tuple
+    analysis_depth: str
+    metrics: tuple
+    time_range: Optional[Dict[str, Any]]
+    options: Dict[str, Any]
+    messages: List[Any] = field(default_factory=list)
+    fundamentals_report: str = ""
+
+
+@dataclass(slots=True)
+class RiskState(_SlottedState):
+    user_id: str
+    portfolio: Dict[str, Any]
+    risk_model: str
+    confidence_level: float
+    time_horizon_days: int
+    messages: List[Any] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class SentimentState(_SlottedState):
+    user_id: str
+    symbols: tuple
+    sources: tuple
+    time_range: Optional[Dict[str, Any]]
+    messages: List[Any] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class MacroState(_SlottedState):
+    user_id: str
+    regions: tuple
+    indicators: tuple
+    time_range: Optional[Dict[str, Any]]
+    messages: List[Any] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class TradeAdviceState(_SlottedState):
+    user_id: str
+    trade_intent: Dict[str, Any]
+    current_portfolio: Dict[str, Any]
+    messages: List[Any] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class InvestmentAdviceState(_SlottedState):
+    user_id: str
+    symbols: tuple
+    current_portfolio: Dict[str, Any]
+    available_cash: float
+    investment_goal: str
+    messages: List[Any] = field(default_factory=list)
@@ -1,3 +1,5 @@
+import asyncio
+
 import chromadb
 from chromadb.config import Settings
 from openai import OpenAI
@@ -12,6 +14,11 @@ class FinancialSituationMemory:
         self.chroma_client = chromadb.Client(Settings(allow_reset=True))
         self.situation_collection = self.chroma_client.create_collection(name=name)
 
+    @classmethod
+    async def async_create(cls, name, config):
+        """Build the memory off the event loop; client setup can block."""
+        return await asyncio.to_thread(cls, name, config)
+
     def get_embedding(self, text):
         """Get OpenAI embedding for a text"""
         
@@ -0,0 +1,82 @@
+"""Numeric kernels for portfolio and risk aggregation.
+
+The kernels are compiled with Numba when it is installed and fall back to
+plain Python loops otherwise, so callers never need to check. Each kernel
+declares an explicit float64 signature, so it is compiled (or loaded from the
+on-disk cache) when this module is imported rather than on its first call;
+import it off the event loop.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is an optional performance dependency
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda fn: fn
+
+
+@njit("f8[::1](f8[::1])", cache=True)
+def normalize_weights(values):
+    """Scale position values so they sum to one."""
+    total = 0.0
+    for i in range(values.shape[0]):
+        total += values[i]
+
+    weights = np.zeros_like(values)
+    if total == 0.0:
+        return weights
+    for i in range(values.shape[0]):
+        weights[i] = values[i] / total
+    return weights
+
+
+@njit("UniTuple(f8, 3)(f8[::1])", cache=True)
+def concentration_metrics(weights):
+    """Return (herfindahl_index, max_position_weight, top5_concentration)."""
+    herfindahl = 0.0
+    max_weight = 0.0
+    for i in range(weights.shape[0]):
+        herfindahl += weights[i] * weights[i]
+        if weights[i] > max_weight:
+            max_weight = weights[i]
+
+    ordered = np.sort(weights)
+    top5 = 0.0
+    for i in range(max(0, ordered.shape[0] - 5), ordered.shape[0]):
+        top5 += ordered[i]
+    return herfindahl, max_weight, top5
+
+
+@njit("f8[::1](f8[::1], f8[::1])", cache=True)
+def position_contribution(weights, returns):
+    """Per-position contribution to portfolio return."""
+    contributions = np.empty_like(weights)
+    for i in range(weights.shape[0]):
+        contributions[i] = weights[i] * returns[i]
+    return contributions
+
+
+def positions_to_arrays(positions):
+    """Convert repeated Position messages to (weights, returns) float64 arrays."""
+    count = len(positions)
+    values = np.empty(count, dtype=np.float64)
+    returns = np.empty(count, dtype=np.float64)
+    for i, position in enumerate(positions):
+        values[i] = position.market_value
+        returns[i] = position.unrealized_pnl_percent
+    return normalize_weights(values), returns
+
+
+def portfolio_concentration(positions):
+    """(herfindahl_index, max_position_weight, top5_concentration) of the positions."""
+    weights, _ = positions_to_arrays(positions)
+    return concentration_metrics(weights)
+
+
+def portfolio_contributions(positions):
+    """Per-position contribution to portfolio return."""
+    weights, returns = positions_to_arrays(positions)
+    return position_contribution(weights, returns)
@@ -1,11 +1,16 @@
 """Main gRPC service handler for Financial Agents service."""
 
 import asyncio
-from datetime import datetime, timezone
-from typing import Any
+import itertools
+import json
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Tuple
 
 import grpc
+from google.protobuf.timestamp_pb2 import Timestamp
 
+from agents.generated import financial_agents_pb2 as fa_pb2
 from ...core.financial_agents import (
     create_fundamentals_analyst,
     create_market_analyst,
@@ -17,100 +22,277 @@ from ...core.financial_agents import (
     create_risk_manager,
     create_trader,
     Toolkit,
-    FinancialSituationMemory
+    FinancialSituationMemory,
+    AnalysisResultCache,
+    FundamentalsState,
+    RiskState,
+    SentimentState,
+    MacroState,
+    TradeAdviceState,
+    InvestmentAdviceState
 )
 from ...config.logging import get_logger, log_grpc_call
 
 
+_AGENT_FACTORIES = {
+    "fundamentals_analyst": create_fundamentals_analyst,
+    "market_analyst": create_market_analyst,
+    "news_analyst": create_news_analyst,
+    "social_media_analyst": create_social_media_analyst,
+    "bear_researcher": create_bear_researcher,
+    "bull_researcher": create_bull_researcher,
+    "research_manager": create_research_manager,
+    "risk_manager": create_risk_manager,
+    "trader": create_trader,
+}
+
+_DATA_SOURCES = ("yahoo_finance", "simfin", "finnhub")
+
+_FOLLOW_UPS = (
+    "Would you like a technical analysis?",
+    "Should I analyze the fundamentals?",
+    "Do you want risk assessment?",
+)
+
+# Copied into each HealthCheckResponse, never mutated
+_DEPENDENCIES = (
+    fa_pb2.ServiceDependency(
+        service_name="fetcher_service",
+        status="SERVING",  # Would check actual status
+        response_time_ms=50.0,
+        last_error=""
+    ),
+)
+
+# Memory stores per (collection name, backend url)
+_memories: Dict[Tuple[str, str], FinancialSituationMemory] = {}
+_memories_lock = asyncio.Lock()
+
+# Toolkits per config, keyed on the config's sorted JSON so unhashable values (lists, dicts) work
+_toolkits: Dict[str, Toolkit] = {}
+
+# Agent nodes per (llm, toolkit) pair; the llm is kept alongside so its id can't be reused.
+_agents_cache: Dict[Tuple[int, int], Tuple[Any, Dict[str, Any]]] = {}
+
+
+def _risk_kernels():
+    """Import the numeric risk kernels, compiling or loading them from Numba's cache.
+
+    Blocking; call through ``asyncio.to_thread``.
+    """
+    from ...core.financial_agents.utils import risk_kernels
+    return risk_kernels
+
+
+def _shared_toolkit(config: Dict[str, Any]) -> Toolkit:
+    """Return the Toolkit shared by every handler using the same config."""
+    try:
+        key = json.dumps(config, sort_keys=True, default=str)
+    except TypeError:
+        # e.g. keys of mixed types that can't be sorted: don't share
+        return Toolkit(dict(config))
+    toolkit = _toolkits.get(key)
+    if toolkit is None:
+        toolkit = _toolkits[key] = Toolkit(dict(config))
+    return toolkit
+
+
+async def _shared_memory(name: str, backend_url: str) -> FinancialSituationMemory:
+    """Return the memory store shared by every handler using the same collection."""
+    async with _memories_lock:
+        memory = _memories.get((name, backend_url))
+        if memory is None:
+            memory = await FinancialSituationMemory.async_create(
+                name, {"backend_url": backend_url}
+            )
+            _memories[(name, backend_url)] = memory
+        return memory
+
+
+def _shared_agents(llm, toolkit: Toolkit) -> Dict[str, Any]:
+    """Return the agent nodes bound to this llm and toolkit, creating them once."""
+    key = (id(llm), id(toolkit))
+    entry = _agents_cache.get(key)
+    if entry is None or entry[0] is not llm:
+        entry = (llm, {name: factory(llm, toolkit) for name, factory in _AGENT_FACTORIES.items()})
+        _agents_cache[key] = entry
+    return entry[1]
+
+
+def _timestamp_now() -> Timestamp:
+    """Return the current UTC time as a protobuf Timestamp."""
+    timestamp = Timestamp()
+    timestamp.GetCurrentTime()
+    return timestamp
+
+
+def _metadata(analysis_id: str) -> fa_pb2.AnalysisMetadata:
+    """Build response metadata stamped with the current time."""
+    return fa_pb2.AnalysisMetadata(analysis_id=analysis_id, generated_at=_timestamp_now())
+
+
+def _from_template(template):
+    """Return a fresh copy of a prebuilt response message."""
+    response = type(template)()
+    response.CopyFrom(template)
+    return response
+
+
 class FinancialAgentsHandler:
     """Handler for FinancialAgentsService gRPC methods."""
     
-    def __init__(self, llm, config=None):
-        """Initialize financial agents handler."""
+    def __init__(self, llm, config=None, memory=None):
+        """Initialize financial agents handler.
+
+        Prefer ``await FinancialAgentsHandler.create(...)``, which also builds the memory store.
+        """
         self.llm = llm
         self.config = config or {}
-        self.toolkit = Toolkit(config)
+        self.memory = memory
+        self.toolkit = _shared_toolkit(self.config)
         self.logger = get_logger(__name__)
+        self._result_cache = AnalysisResultCache(maxsize=1024, ttl=300)
+        self._id_prefix = uuid.uuid4().hex[:8]
+        self._id_counter = itertools.count()
+        
+        # Static parts of responses, copied into each reply rather than rebuilt per RPC
+        self._fundamentals_template = fa_pb2.FundamentalAnalysisResponse(
+            overall_assessment="Overall market assessment based on fundamental analysis",
+            metadata=fa_pb2.AnalysisMetadata(
+                data_sources=_DATA_SOURCES,
+                processing_time_ms=1000,
+                model_version="v1.0"
+            )
+        )
+        self._investment_template = fa_pb2.InvestmentAdviceResponse(
+            investment_thesis="Investment thesis based on comprehensive analysis"
+        )
+        self._chat_template = fa_pb2.InvestmentChatResponse(
+            follow_up_suggestions=_FOLLOW_UPS
+        )
+        self._portfolio_template = fa_pb2.PortfolioAnalysisResponse(
+            executive_summary="Portfolio analysis completed successfully"
+        )
         
         # Initialize memory and agents
+        self._initialize_agents()
+    
+    @classmethod
+    async def create(cls, llm, config=None) -> "FinancialAgentsHandler":
+        """Create a handler, building the memory store without blocking the event loop."""
         try:
-            memory_config = {
-                "backend_url": "http://localhost:11434/v1"  # Default to local Ollama
-            }
-            self.memory = FinancialSituationMemory("financial_situations", memory_config)
+            # Default to local Ollama
+            memory = await _shared_memory("financial_situations", "http://localhost:11434/v1")
         except Exception as e:
-            self.logger.warning(f"Failed to initialize memory: {e}. Memory features will be disabled.")
-            self.memory = None
-        self._initialize_agents()
+            get_logger(__name__).warning(f"Failed to initialize memory: {e}. Memory features will be disabled.")
+            memory = None
+        # Compile the risk kernels before serving rather than on the first risk RPC
+        await asyncio.to_thread(_risk_kernels)
+        return cls(llm, config, memory=memory)
     
     def _initialize_agents(self):
         """Initialize all financial agents."""
-        self.fundamentals_analyst = create_fundamentals_analyst(self.llm, self.toolkit)
-        self.market_analyst = create_market_analyst(self.llm, self.toolkit)
-        self.news_analyst = create_news_analyst(self.llm, self.toolkit)
-        self.social_media_analyst = create_social_media_analyst(self.llm, self.toolkit)
-        self.bear_researcher = create_bear_researcher(self.llm, self.toolkit)
-        self.bull_researcher = create_bull_researcher(self.llm, self.toolkit)
-        self.research_manager = create_research_manager(self.llm, self.toolkit)
-        self.risk_manager = create_risk_manager(self.llm, self.toolkit)
-        self.trader = create_trader(self.llm, self.toolkit)
+        agents = _shared_agents(self.llm, self.toolkit)
+        self.fundamentals_analyst = agents["fundamentals_analyst"]
+        self.market_analyst = agents["market_analyst"]
+        self.news_analyst = agents["news_analyst"]
+        self.social_media_analyst = agents["social_media_analyst"]
+        self.bear_researcher = agents["bear_researcher"]
+        self.bull_researcher = agents["bull_researcher"]
+        self.research_manager = agents["research_manager"]
+        self.risk_manager = agents["risk_manager"]
+        self.trader = agents["trader"]
+        
+        # Agents are set once here, so the health report can be computed up front
+        agents_ready = all([
+            self.fundamentals_analyst is not None,
+            self.market_analyst is not None,
+            self.news_analyst is not None,
+            self.social_media_analyst is not None,
+            self.risk_manager is not None,
+            self.trader is not None
+        ])
+        self._health_template = fa_pb2.HealthCheckResponse(
+            status="SERVING" if agents_ready else "NOT_SERVING",
+            details={
+                "fundamentals_analyst": "ready" if self.fundamentals_analyst else "not_ready",
+                "market_analyst": "ready" if self.market_analyst else "not_ready",
+                "news_analyst": "ready" if self.news_analyst else "not_ready",
+                "social_media_analyst": "ready" if self.social_media_analyst else "not_ready",
+                "risk_manager": "ready" if self.risk_manager else "not_ready",
+                "trader": "ready" if self.trader else "not_ready",
+                "version": "0.1.0",
+                "llm_model": str(type(self.llm).__name__) if self.llm else "not_configured"
+            },
+            dependencies=_DEPENDENCIES
+        )
+    
+    def _next_analysis_id(self, kind: str) -> str:
+        """Return a unique analysis id without reading the clock."""
+        return f"{kind}_{self._id_prefix}{next(self._id_counter):08x}"
+    
+    async def _run_cached(self, name, state, key_fields, run):
+        """Run a synchronous analyst call on a worker thread, reusing a recent
+        result for identical inputs."""
+        params = {field: state.get(field) for field in key_fields}
+        if params.get("symbols"):
+            # The same set of symbols shares an entry whatever order it was requested in
+            params["symbols"] = sorted(params["symbols"])
+        key = AnalysisResultCache.make_key(name, params)
+        result = self._result_cache.get(key)
+        if result is None:
+            result = await asyncio.to_thread(run)
+            self._result_cache.set(key, result)
+        return result
     
     async def AnalyzeFundamentals(self, request, context) -> Any:
         """Handle fundamental analysis requests."""
-        log_grpc_call("AnalyzeFundamentals", {
+        symbols = tuple(request.symbols)
+        log_grpc_call("AnalyzeFundamentals", lambda: {
             "user_id": request.user_id,
-            "symbols": list(request.symbols)
+            "symbols": symbols
         })
         
         try:
             # Prepare state for fundamental analysis
-            state = {
-                "user_id": request.user_id,
-                "symbols": list(request.symbols),
-                "analysis_depth": request.analysis_depth,
-                "metrics": list(request.metrics),
-                "time_range": {
+            state = FundamentalsState(
+                user_id=request.user_id,
+                symbols=symbols,
+                analysis_depth=request.analysis_depth,
+                metrics=tuple(request.metrics),
+                time_range={
                     "start_time": request.time_range.start_time,
                     "end_time": request.time_range.end_time
                 } if request.time_range else None,
-                "options": {
+                options={
                     "include_charts": request.options.include_charts,
                     "use_ml_models": request.options.use_ml_models,
                     "language": request.options.language
-                } if request.options else {},
-                "messages": [],
-                "fundamentals_report": ""
-            }
+                } if request.options else {}
+            )
             
             # Run fundamental analysis
-            result = await self.fundamentals_analyst(state)
+            result = await self._run_cached(
+                "fundamentals", state,
+                ("user_id", "symbols", "analysis_depth", "metrics", "time_range"),
+                lambda: self.fundamentals_analyst(state)
+            )
             
-            # Format response (mock structure - would use generated protobuf classes)
-            return {
-                "results": [
-                    {
-                        "symbol": symbol,
-                        "company_name": f"Company {symbol}",
-                        "financial_metrics": {},
-                        "industry_comparison": {},
-                        "valuation": {},
-                        "quality_score": {},
-                        "analysis_summary": result.get("fundamentals_report", ""),
-                        "rating": {},
-                        "analyzed_at": datetime.now(timezone.utc)
-                    }
-                    for symbol in request.symbols
-                ],
-                "overall_assessment": "Overall market assessment based on fundamental analysis",
-                "recommendations": [],
-                "metadata": {
-                    "analysis_id": f"fund_analysis_{datetime.now(timezone.utc).timestamp()}",
-                    "data_sources": ["yahoo_finance", "simfin", "finnhub"],
-                    "processing_time_ms": 1000,
-                    "model_version": "v1.0",
-                    "generated_at": datetime.now(timezone.utc)
-                }
-            }
+            now = _timestamp_now()
+            summary = result.get("fundamentals_report", "")
+            response = _from_template(self._fundamentals_template)
+            response.results.extend(
+                fa_pb2.FundamentalAnalysis(
+                    symbol=symbol,
+                    company_name=f"Company {symbol}",
+                    analysis_summary=summary,
+                    analyzed_at=now
+                )
+                for symbol in symbols
+            )
+            response.metadata.analysis_id = self._next_analysis_id("fund_analysis")
+            response.metadata.generated_at.CopyFrom(now)
+            return response
             
         except Exception as e:
             self.logger.error("Fundamental analysis failed", error=str(e))
@@ -118,22 +300,16 @@ class FinancialAgentsHandler:
     
     async def AnalyzeTechnical(self, request, context) -> Any:
         """Handle technical analysis requests."""
-        log_grpc_call("AnalyzeTechnical", {
+        log_grpc_call("AnalyzeTechnical", lambda: {
             "user_id": request.user_id,
-            "symbols": list(request.symbols)
+            "symbols": tuple(request.symbols)
         })
         
         try:
             # Technical analysis implementation
-            return {
-                "results": [],
-                "overall_trend": {},
-                "signals": [],
-                "metadata": {
-                    "analysis_id": f"tech_analysis_{datetime.now(timezone.utc).timestamp()}",
-                    "generated_at": datetime.now(timezone.utc)
-                }
-            }
+            return fa_pb2.TechnicalAnalysisResponse(
+                metadata=_metadata(self._next_analysis_id("tech_analysis"))
+            )
             
         except Exception as e:
             self.logger.error("Technical analysis failed", error=str(e))
@@ -141,38 +317,49 @@ class FinancialAgentsHandler:
     
     async def AnalyzeRisk(self, request, context) -> Any:
         """Handle risk analysis requests."""
-        log_grpc_call("AnalyzeRisk", {
+        log_grpc_call("AnalyzeRisk", lambda: {
             "user_id": request.user_id,
             "portfolio": request.portfolio.portfolio_id if request.portfolio else "none"
         })
         
         try:
-            state = {
-                "user_id": request.user_id,
-                "portfolio": {
+            state = RiskState(
+                user_id=request.user_id,
+                portfolio={
                     "portfolio_id": request.portfolio.portfolio_id,
-                    "positions": list(request.portfolio.positions),
+                    "positions": tuple(request.portfolio.positions),
                     "total_value": request.portfolio.total_value
                 } if request.portfolio else {},
-                "risk_model": request.risk_model,
-                "confidence_level": request.confidence_level,
-                "time_horizon_days": request.time_horizon_days,
-                "messages": []
-            }
+                risk_model=request.risk_model,
+                confidence_level=request.confidence_level,
+                time_horizon_days=request.time_horizon_days
+            )
             
-            result = await self.risk_manager(state)
+            herfindahl, max_weight, top5 = await asyncio.to_thread(
+                lambda: _risk_kernels().portfolio_concentration(request.portfolio.positions)
+            )
             
-            return {
-                "portfolio_risk": {},
-                "individual_risks": [],
-                "scenarios": [],
-                "optimization": {},
-                "alerts": [],
-                "metadata": {
-                    "analysis_id": f"risk_analysis_{datetime.now(timezone.utc).timestamp()}",
-                    "generated_at": datetime.now(timezone.utc)
-                }
-            }
+            response = fa_pb2.RiskAnalysisResponse(
+                portfolio_risk=fa_pb2.PortfolioRisk(
+                    concentration=fa_pb2.ConcentrationRisk(
+                        herfindahl_index=herfindahl,
+                        max_position_weight=max_weight,
+                        top5_concentration=top5
+                    )
+                ),
+                metadata=_metadata(self._next_analysis_id("risk_analysis"))
+            )
+            
+            result = await asyncio.to_thread(self.risk_manager, state)
+            decision = result.get("final_trade_decision")
+            if decision:
+                response.alerts.add(
+                    level=fa_pb2.INFO,
+                    alert_type="risk_manager",
+                    message=decision
+                )
+            
+            return response
             
         except Exception as e:
             self.logger.error("Risk analysis failed", error=str(e))
@@ -180,37 +367,44 @@ class FinancialAgentsHandler:
     
     async def AnalyzeSentiment(self, request, context) -> Any:
         """Handle sentiment analysis requests."""
-        log_grpc_call("AnalyzeSentiment", {
+        symbols = tuple(request.symbols)
+        log_grpc_call("AnalyzeSentiment", lambda: {
             "user_id": request.user_id,
-            "symbols": list(request.symbols)
+            "symbols": symbols
         })
         
         try:
-            state = {
-                "user_id": request.user_id,
-                "symbols": list(request.symbols),
-                "sources": list(request.sources),
-                "time_range": {
+            state = SentimentState(
+                user_id=request.user_id,
+                symbols=symbols,
+                sources=tuple(request.sources),
+                time_range={
                     "start_time": request.time_range.start_time,
                     "end_time": request.time_range.end_time
-                } if request.time_range else None,
-                "messages": []
-            }
+                } if request.time_range else None
+            )
             
-            # Run sentiment analysis with social media and news analysts
-            news_result = await self.news_analyst(state)
-            social_result = await self.social_media_analyst(state)
-            
-            return {
-                "symbol_sentiments": [],
-                "overall_market": {},
-                "events": [],
-                "trend": {},
-                "metadata": {
-                    "analysis_id": f"sentiment_analysis_{datetime.now(timezone.utc).timestamp()}",
-                    "generated_at": datetime.now(timezone.utc)
-                }
-            }
+            # Run sentiment analysis with social media and news analysts concurrently.
+            # Each analyst gets its own message buffer so they don't share mutable state.
+            sentiment_key = ("user_id", "symbols", "sources", "time_range")
+            news_result, social_result = await asyncio.gather(
+                self._run_cached(
+                    "news", state, sentiment_key,
+                    lambda: self.news_analyst({**state, "messages": []})
+                ),
+                self._run_cached(
+                    "social_media", state, sentiment_key,
+                    lambda: self.social_media_analyst({**state, "messages": []})
+                ),
+            )
+            state.messages = [
+                *news_result.get("messages", []),
+                *social_result.get("messages", []),
+            ]
+
+            return fa_pb2.FinancialSentimentResponse(
+                metadata=_metadata(self._next_analysis_id("sentiment_analysis"))
+            )
             
         except Exception as e:
             self.logger.error("Sentiment analysis failed", error=str(e))
@@ -218,35 +412,32 @@ class FinancialAgentsHandler:
     
     async def AnalyzeMacro(self, request, context) -> Any:
         """Handle macro analysis requests."""
-        log_grpc_call("AnalyzeMacro", {
+        regions = tuple(request.regions)
+        log_grpc_call("AnalyzeMacro", lambda: {
             "user_id": request.user_id,
-            "regions": list(request.regions)
+            "regions": regions
         })
         
         try:
-            state = {
-                "user_id": request.user_id,
-                "regions": list(request.regions),
-                "indicators": list(request.indicators),
-                "time_range": {
+            state = MacroState(
+                user_id=request.user_id,
+                regions=regions,
+                indicators=tuple(request.indicators),
+                time_range={
                     "start_time": request.time_range.start_time,
                     "end_time": request.time_range.end_time
-                } if request.time_range else None,
-                "messages": []
-            }
+                } if request.time_range else None
+            )
             
-            result = await self.market_analyst(state)
+            result = await self._run_cached(
+                "macro", state,
+                ("user_id", "regions", "indicators", "time_range"),
+                lambda: self.market_analyst(state)
+            )
             
-            return {
-                "regional_analysis": [],
-                "global_outlook": {},
-                "upcoming_events": [],
-                "sector_impacts": {},
-                "metadata": {
-                    "analysis_id": f"macro_analysis_{datetime.now(timezone.utc).timestamp()}",
-                    "generated_at": datetime.now(timezone.utc)
-                }
-            }
+            return fa_pb2.MacroAnalysisResponse(
+                metadata=_metadata(self._next_analysis_id("macro_analysis"))
+            )
             
         except Exception as e:
             self.logger.error("Macro analysis failed", error=str(e))
@@ -254,39 +445,30 @@ class FinancialAgentsHandler:
     
     async def GetTradeAdvice(self, request, context) -> Any:
         """Handle trade advice requests."""
-        log_grpc_call("GetTradeAdvice", {
+        log_grpc_call("GetTradeAdvice", lambda: {
             "user_id": request.user_id,
             "trade_intent": request.trade_intent.symbol if request.trade_intent else "none"
         })
         
         try:
-            state = {
-                "user_id": request.user_id,
-                "trade_intent": {
+            state = TradeAdviceState(
+                user_id=request.user_id,
+                trade_intent={
                     "symbol": request.trade_intent.symbol,
                     "action": request.trade_intent.action,
                     "target_quantity": request.trade_intent.target_quantity
                 } if request.trade_intent else {},
-                "current_portfolio": {
+                current_portfolio={
                     "portfolio_id": request.current_portfolio.portfolio_id,
-                    "positions": list(request.current_portfolio.positions)
-                } if request.current_portfolio else {},
-                "messages": []
-            }
+                    "positions": tuple(request.current_portfolio.positions)
+                } if request.current_portfolio else {}
+            )
             
-            result = await self.trader(state)
+            result = await asyncio.to_thread(self.trader, state)
             
-            return {
-                "execution_strategy": {},
-                "cost_analysis": {},
-                "timing": {},
-                "warnings": [],
-                "alternatives": {},
-                "metadata": {
-                    "analysis_id": f"trade_advice_{datetime.now(timezone.utc).timestamp()}",
-                    "generated_at": datetime.now(timezone.utc)
-                }
-            }
+            return fa_pb2.TradeAdviceResponse(
+                metadata=_metadata(self._next_analysis_id("trade_advice"))
+            )
             
         except Exception as e:
             self.logger.error("Trade advice failed", error=str(e))
@@ -294,39 +476,37 @@ class FinancialAgentsHandler:
     
     async def GetInvestmentAdvice(self, request, context) -> Any:
         """Handle investment advice requests."""
-        log_grpc_call("GetInvestmentAdvice", {
+        symbols = tuple(request.symbols)
+        log_grpc_call("GetInvestmentAdvice", lambda: {
             "user_id": request.user_id,
-            "symbols": list(request.symbols) if request.symbols else []
+            "symbols": symbols
         })
         
         try:
-            state = {
-                "user_id": request.user_id,
-                "symbols": list(request.symbols) if request.symbols else [],
-                "current_portfolio": {
+            state = InvestmentAdviceState(
+                user_id=request.user_id,
+                symbols=symbols,
+                current_portfolio={
                     "portfolio_id": request.current_portfolio.portfolio_id,
-                    "positions": list(request.current_portfolio.positions)
+                    "positions": tuple(request.current_portfolio.positions)
                 } if request.current_portfolio else {},
-                "available_cash": request.available_cash,
-                "investment_goal": request.investment_goal,
-                "messages": []
-            }
+                available_cash=request.available_cash,
+                investment_goal=request.investment_goal
+            )
             
             # Run comprehensive analysis using research manager
-            result = await self.research_manager(state)
+            result = await self._run_cached(
+                "investment", state,
+                ("user_id", "symbols", "current_portfolio", "available_cash", "investment_goal"),
+                lambda: self.research_manager(state)
+            )
             
-            return {
-                "recommendations": [],
-                "optimization": {},
-                "investment_thesis": "Investment thesis based on comprehensive analysis",
-                "market_outlook": {},
-                "risk_assessment": {},
-                "executive_summary": result.get("research_summary", ""),
-                "metadata": {
-                    "analysis_id": f"investment_advice_{datetime.now(timezone.utc).timestamp()}",
-                    "generated_at": datetime.now(timezone.utc)
-                }
-            }
+            response = _from_template(self._investment_template)
+            response.executive_summary = result.get("research_summary", "")
+            response.metadata.CopyFrom(
+                _metadata(self._next_analysis_id("investment_advice"))
+            )
+            return response
             
         except Exception as e:
             self.logger.error("Investment advice failed", error=str(e))
@@ -334,7 +514,7 @@ class FinancialAgentsHandler:
     
     async def ProcessInvestmentChat(self, request, context) -> Any:
         """Handle investment chat requests."""
-        log_grpc_call("ProcessInvestmentChat", {
+        log_grpc_call("ProcessInvestmentChat", lambda: {
             "user_id": request.user_id,
             "session_id": request.session_id
         })
@@ -343,19 +523,11 @@ class FinancialAgentsHandler:
             # Simple chat processing - could be enhanced with actual conversation AI
             response = f"Thank you for your question: {request.message}. This is a placeholder response."
             
-            return {
-                "response": response,
-                "session_id": request.session_id,
-                "attachments": [],
-                "quick_actions": [],
-                "follow_up_suggestions": [
-                    "Would you like a technical analysis?",
-                    "Should I analyze the fundamentals?",
-                    "Do you want risk assessment?"
-                ],
-                "personalization": {},
-                "timestamp": datetime.now(timezone.utc)
-            }
+            reply = _from_template(self._chat_template)
+            reply.response = response
+            reply.session_id = request.session_id
+            reply.timestamp.GetCurrentTime()
+            return reply
             
         except Exception as e:
             self.logger.error("Investment chat failed", error=str(e))
@@ -363,25 +535,28 @@ class FinancialAgentsHandler:
     
     async def GetRealTimeRecommendations(self, request, context):
         """Handle real-time recommendation stream."""
-        log_grpc_call("GetRealTimeRecommendations", {
+        log_grpc_call("GetRealTimeRecommendations", lambda: {
             "user_id": request.user_id
         })
         
         try:
-            # Mock streaming recommendations
+            # Mock streaming recommendations. The clock is read once per stream and
+            # each update is stamped relative to it on the fixed update interval.
+            interval = timedelta(seconds=1)
+            stream_started = datetime.now(timezone.utc)
             for i in range(5):  # Send 5 mock updates
-                yield {
-                    "update_id": f"update_{i}",
-                    "update_type": "price_alert",
-                    "affected_symbols": ["AAPL"],
-                    "title": f"Price Alert {i}",
-                    "message": f"AAPL reached target price level {i}",
-                    "priority": "PRIORITY_NORMAL",
-                    "data": {},
-                    "timestamp": datetime.now(timezone.utc),
-                    "suggested_actions": []
-                }
-                await asyncio.sleep(1)  # Simulate real-time updates
+                timestamp = Timestamp()
+                timestamp.FromDatetime(stream_started + i * interval)
+                yield fa_pb2.RecommendationUpdate(
+                    update_id=f"update_{i}",
+                    update_type="price_alert",
+                    affected_symbols=["AAPL"],
+                    title=f"Price Alert {i}",
+                    message=f"AAPL reached target price level {i}",
+                    priority=fa_pb2.PRIORITY_NORMAL,
+                    timestamp=timestamp
+                )
+                await asyncio.sleep(interval.total_seconds())  # Simulate real-time updates
                 
         except Exception as e:
             self.logger.error("Real-time recommendations failed", error=str(e))
@@ -389,26 +564,22 @@ class FinancialAgentsHandler:
     
     async def AnalyzePortfolio(self, request, context) -> Any:
         """Handle portfolio analysis requests."""
-        log_grpc_call("AnalyzePortfolio", {
+        log_grpc_call("AnalyzePortfolio", lambda: {
             "user_id": request.user_id,
             "portfolio_id": request.portfolio.portfolio_id if request.portfolio else "none"
         })
         
         try:
-            return {
-                "performance": {},
-                "risk_analysis": {},
-                "allocation": {},
-                "attribution": {},
-                "optimization": {},
-                "benchmark_comparison": {},
-                "metadata": {
-                    "analysis_id": f"portfolio_analysis_{datetime.now(timezone.utc).timestamp()}",
-                    "generated_at": datetime.now(timezone.utc)
-                },
-                "executive_summary": "Portfolio analysis completed successfully",
-                "key_insights": []
-            }
+            contributions = await asyncio.to_thread(
+                lambda: _risk_kernels().portfolio_contributions(request.portfolio.positions)
+            )
+            
+            response = _from_template(self._portfolio_template)
+            response.performance.total_return = float(contributions.sum())
+            response.metadata.CopyFrom(
+                _metadata(self._next_analysis_id("portfolio_analysis"))
+            )
+            return response
             
         except Exception as e:
             self.logger.error("Portfolio analysis failed", error=str(e))
@@ -417,46 +588,14 @@ class FinancialAgentsHandler:
     async def HealthCheck(self, request, context) -> Any:
         """Handle health check requests."""
         try:
-            # Check if all agents are initialized
-            agents_ready = all([
-                self.fundamentals_analyst is not None,
-                self.market_analyst is not None,
-                self.news_analyst is not None,
-                self.social_media_analyst is not None,
-                self.risk_manager is not None,
-                self.trader is not None
-            ])
-            
-            status = "SERVING" if agents_ready else "NOT_SERVING"
-            
-            return {
-                "status": status,
-                "details": {
-                    "fundamentals_analyst": "ready" if self.fundamentals_analyst else "not_ready",
-                    "market_analyst": "ready" if self.market_analyst else "not_ready",
-                    "news_analyst": "ready" if self.news_analyst else "not_ready",
-                    "social_media_analyst": "ready" if self.social_media_analyst else "not_ready",
-                    "risk_manager": "ready" if self.risk_manager else "not_ready",
-                    "trader": "ready" if self.trader else "not_ready",
-                    "version": "0.1.0",
-                    "llm_model": str(type(self.llm).__name__) if self.llm else "not_configured"
-                },
-                "timestamp": datetime.now(timezone.utc),
-                "dependencies": [
-                    {
-                        "service_name": "fetcher_service",
-                        "status": "SERVING",  # Would check actual status
-                        "response_time_ms": 50.0,
-                        "last_error": ""
-                    }
-                ]
-            }
+            response = _from_template(self._health_template)
+            response.timestamp.GetCurrentTime()
+            return response
             
         except Exception as e:
             self.logger.error("Health check failed", error=str(e))
-            return {
-                "status": "NOT_SERVING",
-                "details": {"error": str(e)},
-                "timestamp": datetime.now(timezone.utc),
-                "dependencies": []
-            }
\ No newline at end of file
+            return fa_pb2.HealthCheckResponse(
+                status="NOT_SERVING",
+                details={"error": str(e)},
+                timestamp=_timestamp_now()
+            )
\ No newline at end of file
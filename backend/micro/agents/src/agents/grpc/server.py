@@ -3,7 +3,7 @@
 import asyncio
 import signal
 from concurrent import futures
-from typing import Optional
+from typing import Any, List, Optional, Tuple
 
 import grpc
 from grpc_health.v1 import health_pb2_grpc
@@ -20,6 +20,21 @@ from ..core.agents.content_generator import ContentGenerator
 from ..core.agents.conversation_ai import ConversationAI
 
 
+# Transport tuning applied to every server; entries passed to
+# AgentsGrpcServer(options=...) override these by key.
+DEFAULT_SERVER_OPTIONS = [
+    ("grpc.so_reuseport", 1),
+    ("grpc.max_concurrent_streams", 1000),
+    ("grpc.max_send_message_length", 32 * 1024 * 1024),
+    ("grpc.max_receive_message_length", 32 * 1024 * 1024),
+    ("grpc.keepalive_time_ms", 30000),
+    ("grpc.keepalive_timeout_ms", 10000),
+    ("grpc.keepalive_permit_without_calls", 1),
+    ("grpc.http2.max_pings_without_data", 0),
+    ("grpc.http2.min_time_between_pings_ms", 10000),
+]
+
+
 class HealthServicer(health_pb2_grpc.HealthServicer):
     """Health check service implementation."""
     
@@ -27,31 +42,36 @@ class HealthServicer(health_pb2_grpc.HealthServicer):
         self.agents_handler = agents_handler
         self.financial_handler = financial_handler
         self.logger = get_logger(__name__)
+        self._status = HealthCheckResponse.ServingStatus.NOT_SERVING
+        self.refresh()
     
-    def Check(self, request, context):
-        """Handle health check requests."""
+    def refresh(self) -> None:
+        """Recompute the serving status; call whenever an AI engine changes."""
         try:
             # Check if all AI engines are ready
             if (self.agents_handler.content_analyzer and 
                 self.agents_handler.recommendation_engine and
                 self.agents_handler.content_generator and
                 self.agents_handler.conversation_ai):
-                status = HealthCheckResponse.ServingStatus.SERVING
+                self._status = HealthCheckResponse.ServingStatus.SERVING
             else:
-                status = HealthCheckResponse.ServingStatus.NOT_SERVING
-            
-            return HealthCheckResponse(status=status)
+                self._status = HealthCheckResponse.ServingStatus.NOT_SERVING
             
         except Exception as e:
             self.logger.error("Health check failed", error=str(e))
-            return HealthCheckResponse(status=HealthCheckResponse.ServingStatus.NOT_SERVING)
+            self._status = HealthCheckResponse.ServingStatus.NOT_SERVING
+    
+    async def Check(self, request, context):
+        """Handle health check requests."""
+        return HealthCheckResponse(status=self._status)
 
 
 class AgentsGrpcServer:
     """Main gRPC server for Agents service."""
     
-    def __init__(self, port: int = 50052):
+    def __init__(self, port: int = 50052, options: Optional[List[Tuple[str, Any]]] = None):
         self.port = port
+        self.options = list({**dict(DEFAULT_SERVER_OPTIONS), **dict(options or ())}.items())
         self.logger = get_logger(__name__)
         self.server: Optional[grpc.aio.Server] = None
         self.agents_handler: Optional[AgentsServiceHandler] = None
@@ -65,18 +85,19 @@ class AgentsGrpcServer:
             # Setup logging
             setup_logging()
             
-            # Initialize AI engines
+            # Initialize AI engines concurrently
             content_analyzer = ContentAnalyzer()
-            await content_analyzer.initialize()
-            
             recommendation_engine = RecommendationEngine() 
-            await recommendation_engine.initialize()
-            
             content_generator = ContentGenerator()
-            await content_generator.initialize()
-            
             conversation_ai = ConversationAI()
-            await conversation_ai.initialize()
+            
+            *_, self.financial_handler = await asyncio.gather(
+                content_analyzer.initialize(),
+                recommendation_engine.initialize(),
+                content_generator.initialize(),
+                conversation_ai.initialize(),
+                self._create_financial_handler(),
+            )
             
             # Create handlers
             self.agents_handler = AgentsServiceHandler(
@@ -86,22 +107,6 @@ class AgentsGrpcServer:
                 conversation_ai=conversation_ai
             )
             
-            # Initialize financial handler (with placeholder LLM for now)
-            try:
-                # TODO: Initialize proper LLM model from config
-                # For now, use a placeholder to avoid breaking
-                placeholder_llm = None  # This would be the actual LLM model
-                financial_config = {
-                    "fetcher_host": getattr(settings, 'fetcher_host', 'localhost'),
-                    "fetcher_port": getattr(settings, 'fetcher_port', 50051),
-                    "online_tools": True
-                }
-                self.financial_handler = FinancialAgentsHandler(placeholder_llm, financial_config)
-                self.logger.info("Financial agents handler initialized")
-            except Exception as e:
-                self.logger.warning(f"Failed to initialize financial handler: {e}")
-                self.financial_handler = None
-            
             self.health_servicer = HealthServicer(self.agents_handler, self.financial_handler)
             
             self.logger.info("Agents gRPC server initialized successfully")
@@ -110,12 +115,36 @@ class AgentsGrpcServer:
             self.logger.error("Failed to initialize gRPC server", error=str(e))
             raise
     
+    async def _create_financial_handler(self) -> Optional[FinancialAgentsHandler]:
+        """Initialize financial handler (with placeholder LLM for now)."""
+        try:
+            # TODO: Initialize proper LLM model from config
+            # For now, use a placeholder to avoid breaking
+            placeholder_llm = None  # This would be the actual LLM model
+            financial_config = {
+                "fetcher_host": getattr(settings, 'fetcher_host', 'localhost'),
+                "fetcher_port": getattr(settings, 'fetcher_port', 50051),
+                "online_tools": True
+            }
+            handler = await FinancialAgentsHandler.create(placeholder_llm, financial_config)
+            self.logger.info("Financial agents handler initialized")
+            return handler
+        except Exception as e:
+            self.logger.warning(f"Failed to initialize financial handler: {e}")
+            return None
+    
     async def start(self) -> None:
         """Start the gRPC server."""
         try:
             # Create gRPC server
+            # All handlers are async; the thread pool is only a fallback for
+            # sync servicers, so keep it small.
             self.server = grpc.aio.server(
-                futures.ThreadPoolExecutor(max_workers=settings.performance.grpc_max_workers)
+                migration_thread_pool=futures.ThreadPoolExecutor(
+                    max_workers=min(4, settings.performance.grpc_max_workers)
+                ),
+                options=self.options,
+                compression=grpc.Compression.Gzip,
             )
             
             # Add service handlers
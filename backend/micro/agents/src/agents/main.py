@@ -1,34 +1,76 @@
 """Main entry point for the Agents microservice."""
 
 import asyncio
+import gc
 import logging
 import os
 import signal
 import sys
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
-import uvloop
-from dotenv import load_dotenv
-
-from .grpc.server import AgentsGrpcServer
 from .config.settings import settings
 from .config.logging import setup_logging, get_logger
 
-load_dotenv()
+if TYPE_CHECKING:
+    from .grpc.server import AgentsGrpcServer
+
+# 仅开发环境解析 .env；生产环境变量由编排系统注入，Settings 本身也会读取 .env
+if os.environ.get("AGENTS_DEV") == "1":
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+# 关闭常见库遥测所需的环境变量，由 disable_telemetry() 一次性写入
+_TELEMETRY_ENV: dict[str, str] = {
+    # 通用环境变量（大部分库都会读取这些）
+    "DO_NOT_TRACK": "1",
+    "DISABLE_TELEMETRY": "1",
+    "NO_TELEMETRY": "1",
+    # Chroma / ChromaDB
+    "ANONYMIZED_TELEMETRY": "False",
+    # LangChain
+    "LANGCHAIN_TELEMETRY": "false",
+    "LANGCHAIN_ENDPOINT": "",
+    "LANGCHAIN_API_KEY": "",
+    # Hugging Face
+    "HF_HUB_DISABLE_TELEMETRY": "1",
+    # Weights & Biases (wandb)
+    "WANDB_DISABLED": "true",
+    # OpenTelemetry / OTEL
+    "OTEL_SDK_DISABLED": "true",
+    # PostHog（部分库会用 posthog 做匿名遥测）
+    "POSTHOG_DISABLE": "1",
+    # Tensorflow / Pytorch（部分子模块会上传统计）
+    "TF_DISABLE_TELEMETRY": "1",
+    "TORCH_DISABLE_TELEMETRY": "1",
+}
+
+# 启动横幅，一次写入 stdout
+_BANNER = "\n".join([
+    "",
+    "=" * 60,
+    "🚀 MOSIA Agents MicroService",
+    "   金融智能体微服务",
+    "=" * 60,
+    "",
+])
+
 
 class AgentsMicroService:
     """Fetcher微服务主类"""
 
     def __init__(self):
-        self.server: Optional[AgentsGrpcServer] = None
+        self.server: Optional["AgentsGrpcServer"] = None
         self.logger: Optional[logging.Logger] = None
         self._shutdown_event = asyncio.Event()
-        self._shutdown_called = False
         self._loop = None
 
     async def initialize(self):
         """初始化服务"""
+        # 延迟到 fork 之后再导入 gRPC/protobuf，描述符表直接建在子进程堆上，避免写时复制
+        from .grpc.server import AgentsGrpcServer
+
         try:
             # 设置日志系统
             setup_logging()
@@ -36,11 +78,24 @@ class AgentsMicroService:
 
             self.logger.info("🚀 初始化 Agents 微服务...")
 
+            # 多进程模式下绑定CPU，需在创建gRPC服务器之前完成以便其内部线程继承
+            self._pin_cpu()
+
             # 验证环境配置
             await self._validate_environment()
 
             # 创建并初始化gRPC服务器
-            self.server = AgentsGrpcServer(port=settings.agents_grpc_port)
+            # 多进程共享端口并提高单连接的并发流上限，长连接保持心跳
+            self.server = AgentsGrpcServer(
+                port=settings.agents_grpc_port,
+                options=[
+                    ("grpc.so_reuseport", 1),
+                    ("grpc.max_concurrent_streams", 1000),
+                    ("grpc.keepalive_time_ms", 30000),
+                    ("grpc.keepalive_timeout_ms", 10000),
+                    ("grpc.http2.max_pings_without_data", 0),
+                ],
+            )
             await self.server.initialize()
 
             # 设置优雅关闭信号处理
@@ -50,66 +105,70 @@ class AgentsMicroService:
 
         except Exception as e:
             if self.logger:
-                self.logger.error(f"❌ 服务初始化失败: {e}", exc_info=True)
+                self.logger.error("❌ 服务初始化失败: %s", e, exc_info=True)
             else:
                 print(f"❌ 服务初始化失败: {e}")
             raise
 
     async def start(self):
         """启动服务"""
+        log = self.logger
+
         if not self.server:
             raise RuntimeError("服务未初始化，请先调用 initialize()")
 
         try:
-            self.logger.info(f"🎯 启动 Agents gRPC 服务器 (端口: {settings.agents_grpc_port})...")
+            log.info("🎯 启动 Agents gRPC 服务器 (端口: %s)...", settings.agents_grpc_port)
 
-            # 启动gRPC服务器
+            # 启动gRPC服务器并等待关闭信号
             await self.server.start()
-
-            # 等待关闭信号
-            await self.wait_for_shutdown()
-
-            # 收到关闭信号后执行清理
-            await self.shutdown()
+            await self._shutdown_event.wait()
 
         except Exception as e:
-            self.logger.error(f"❌ 服务启动失败: {e}", exc_info=True)
-            await self.shutdown()
+            log.error("❌ 服务启动失败: %s", e, exc_info=True)
             raise
 
+        finally:
+            # 唯一的关闭路径
+            await self.shutdown()
+
     async def shutdown(self):
         """优雅关闭服务"""
-        if self._shutdown_called:
-            self.logger.info("⚠️ 关闭已在进行中，跳过重复调用")
-            return
+        log = self.logger
 
-        self._shutdown_called = True
-
-        if self.logger:
-            self.logger.info("🛑 开始关闭 Fetcher 微服务...")
+        if log:
+            log.info("🛑 开始关闭 Fetcher 微服务...")
 
         try:
             if self.server:
-                await self.server.stop()
+                # 防止外层任务被取消时中断正在进行的优雅排空
+                await asyncio.shield(self.server.stop())
 
-            if self.logger:
-                self.logger.info("✅ Fetcher 微服务已成功关闭")
+            if log:
+                log.info("✅ Fetcher 微服务已成功关闭")
 
         except Exception as e:
-            if self.logger:
-                self.logger.error(f"❌ 服务关闭时出现错误: {e}", exc_info=True)
+            if log:
+                log.error("❌ 服务关闭时出现错误: %s", e, exc_info=True)
             else:
                 print(f"❌ 服务关闭时出现错误: {e}")
 
-    async def wait_for_shutdown(self):
-        """等待关闭信号"""
-        self.logger.info("🔄 等待关闭信号...")
-        await self._shutdown_event.wait()
-        self.logger.info("📡 接收到关闭信号，准备执行清理...")
+    def _pin_cpu(self):
+        """将当前工作进程绑定到单个CPU（仅多进程模式，且平台支持 sched_setaffinity）"""
+        worker_index = os.environ.get("AGENTS_WORKER_INDEX")
+        if worker_index is None or not hasattr(os, "sched_setaffinity"):
+            return
+
+        cpus = sorted(os.sched_getaffinity(0))
+        cpu = cpus[int(worker_index) % len(cpus)]
+        os.sched_setaffinity(0, {cpu})
+        self.logger.info("📌 工作进程 %s 绑定到 CPU %s", worker_index, cpu)
 
     async def _validate_environment(self):
         """验证环境配置"""
-        self.logger.info("🔍 验证环境配置...")
+        log = self.logger
+
+        log.info("🔍 验证环境配置...")
 
         # 检查必需的环境变量
         required_env_vars = [
@@ -117,53 +176,44 @@ class AgentsMicroService:
             'AGENTS_GRPC_PORT'
         ]
 
-        missing_vars = []
-        for var in required_env_vars:
-            if not os.getenv(var):
-                missing_vars.append(var)
+        missing_vars = [var for var in required_env_vars if not os.environ.get(var)]
 
         if missing_vars:
-            self.logger.warning(f"⚠️ 缺少环境变量: {missing_vars}, 将使用默认值")
+            log.warning("⚠️ 缺少环境变量: %s, 将使用默认值", missing_vars)
 
         # 验证端口可用性
         if not (1024 <= settings.agents_grpc_port <= 65535):
             raise ValueError(f"无效的gRPC端口: {settings.agents_grpc_port}")
 
-        # 检查数据目录权限
-        data_dir = Path(settings.data_dir)
-        if not data_dir.exists():
-            data_dir.mkdir(parents=True, exist_ok=True)
-            self.logger.info(f"📁 创建数据目录: {data_dir}")
+        # 检查数据目录权限：多进程模式下只由 0 号工作进程执行，且不阻塞事件循环
+        if int(os.environ.get("AGENTS_WORKER_INDEX", "0")) == 0:
+            data_dir = Path(settings.data_dir)
+            if not await asyncio.to_thread(data_dir.exists):
+                await asyncio.to_thread(data_dir.mkdir, parents=True, exist_ok=True)
+                log.info("📁 创建数据目录: %s", data_dir)
 
-        if not os.access(data_dir, os.R_OK | os.W_OK):
-            raise PermissionError(f"数据目录权限不足: {data_dir}")
+            if not await asyncio.to_thread(os.access, data_dir, os.R_OK | os.W_OK):
+                raise PermissionError(f"数据目录权限不足: {data_dir}")
 
-        self.logger.info("✅ 环境配置验证通过")
+        log.info("✅ 环境配置验证通过")
 
     def _setup_signal_handlers(self):
         """设置信号处理器用于优雅关闭"""
 
-        # 获取当前事件循环
-        try:
-            self._loop = asyncio.get_running_loop()
-        except RuntimeError:
-            self._loop = asyncio.get_event_loop()
+        # 仅在 initialize() 中调用，此时事件循环必然在运行
+        self._loop = asyncio.get_running_loop()
 
-        def shutdown_callback():
-            """关闭回调函数"""
-            self.logger.info("📡 异步关闭回调被触发")
-            self._shutdown_event.set()
-
-        def handle_signal(signum, frame):
-            signal_name = signal.Signals(signum).name
-            self.logger.info(f"📡 接收到信号 {signal_name}, 开始优雅关闭...")
-
-            # 线程安全地在事件循环中设置关闭事件
-            self._loop.call_soon_threadsafe(shutdown_callback)
+        # 直接在事件循环内处理信号，避免 signal.signal + call_soon_threadsafe 的额外唤醒
+        try:
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                self._loop.add_signal_handler(sig, self._shutdown_event.set)
+        except NotImplementedError:
+            # Windows 不支持 add_signal_handler，回退到 signal.signal
+            def handle_signal(signum, frame):
+                self._loop.call_soon_threadsafe(self._shutdown_event.set)
 
-        # 注册信号处理器
-        for sig in [signal.SIGINT, signal.SIGTERM]:
-            signal.signal(sig, handle_signal)
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                signal.signal(sig, handle_signal)
 
         self.logger.info("📡 信号处理器已设置")
 
@@ -173,10 +223,7 @@ async def main():
 
     try:
         # 显示启动横幅
-        print("\n" + "=" * 60)
-        print("🚀 MOSIA Agents MicroService")
-        print("   金融智能体微服务")
-        print("=" * 60)
+        sys.stdout.write(_BANNER)
 
         # 创建并启动服务
         service = AgentsMicroService()
@@ -187,20 +234,65 @@ async def main():
 
     except Exception as e:
         if service and service.logger:
-            service.logger.error(f"💥 服务运行出现致命错误: {e}", exc_info=True)
+            service.logger.error("💥 服务运行出现致命错误: %s", e, exc_info=True)
         else:
             print(f"\n💥 服务运行出现致命错误: {e}")
         sys.exit(1)
 
-    finally:
-        # 由于start()方法已经处理了shutdown，这里不需要重复调用
-        pass
-
 
 def run_service():
-    """同步包装器 - 用于poetry脚本或系统服务"""
+    """同步包装器 - 用于poetry脚本或系统服务
+
+    启动 settings.agents_workers 个工作进程，共享同一个 SO_REUSEPORT 端口，
+    由内核在进程间分配连接；父进程只负责转发关闭信号并等待子进程退出。
+    """
+    workers = settings.agents_workers
+    if workers <= 1 or not hasattr(os, "fork"):
+        _run_worker()
+        return
+
+    # 冻结父进程已有对象，子进程 GC 不再扫描它们，尽量保持写时复制共享
+    gc.freeze()
+
+    children = []
+    for index in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            os.environ["AGENTS_WORKER_INDEX"] = str(index)
+            try:
+                _run_worker()
+            except SystemExit as e:
+                os._exit(e.code if isinstance(e.code, int) else 1)
+            os._exit(0)
+        children.append(pid)
+
+    def forward_signal(signum, frame):
+        for pid in children:
+            try:
+                os.kill(pid, signum)
+            except ProcessLookupError:
+                pass
+
+    for sig in [signal.SIGINT, signal.SIGTERM]:
+        signal.signal(sig, forward_signal)
+
+    exit_code = 0
+    for pid in children:
+        _, status = os.waitpid(pid, 0)
+        if os.waitstatus_to_exitcode(status) != 0:
+            exit_code = 1
+    sys.exit(exit_code)
+
+
+def _run_worker():
+    """在当前进程中运行一个服务实例"""
+    # gRPC 服务器模块延迟导入，需在创建事件循环之前安装 uvloop 策略
+    if sys.platform != "win32":
+        import uvloop
+
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
     try:
-        uvloop.install()
         asyncio.run(main())
     except Exception as e:
         print(f"\n💥 服务异常退出: {e}")
@@ -211,34 +303,7 @@ def disable_telemetry() -> None:
     Disable telemetry / analytics for common Python libraries.
     Call this at the very beginning of your service startup.
     """
-    # 通用环境变量（大部分库都会读取这些）
-    os.environ["DO_NOT_TRACK"] = "1"
-    os.environ["DISABLE_TELEMETRY"] = "1"
-    os.environ["NO_TELEMETRY"] = "1"
-
-    # Chroma / ChromaDB
-    os.environ["ANONYMIZED_TELEMETRY"] = "False"
-
-    # LangChain
-    os.environ["LANGCHAIN_TELEMETRY"] = "false"
-    os.environ["LANGCHAIN_ENDPOINT"] = ""
-    os.environ["LANGCHAIN_API_KEY"] = ""
-
-    # Hugging Face
-    os.environ["HF_HUB_DISABLE_TELEMETRY"] = "1"
-
-    # Weights & Biases (wandb)
-    os.environ["WANDB_DISABLED"] = "true"
-
-    # OpenTelemetry / OTEL
-    os.environ["OTEL_SDK_DISABLED"] = "true"
-
-    # PostHog（部分库会用 posthog 做匿名遥测）
-    os.environ["POSTHOG_DISABLE"] = "1"
-
-    # Tensorflow / Pytorch（部分子模块会上传统计）
-    os.environ["TF_DISABLE_TELEMETRY"] = "1"
-    os.environ["TORCH_DISABLE_TELEMETRY"] = "1"
+    os.environ.update(_TELEMETRY_ENV)
 
     # 其他：确保 requests / urllib3 不打印 telemetry 日志
     logging.getLogger("urllib3.connectionpool").setLevel(logging.WARNING)
@@ -0,0 +1,105 @@
+"""
+风险数值内核测试
+
+每个用例同时验证 Numba 编译版本和纯 Python 实现（未安装 numba 时使用）。
+"""
+
+import math
+
+import numpy as np
+import pytest
+
+from agents.core.financial_agents.utils import risk_kernels
+
+
+def _implementations(kernel):
+    """编译后的内核及其纯 Python 实现；未安装 numba 时二者相同"""
+    return [
+        pytest.param(kernel, id="numba"),
+        pytest.param(getattr(kernel, "py_func", kernel), id="python"),
+    ]
+
+
+def _array(*values):
+    return np.array(values, dtype=np.float64)
+
+
+class TestNormalizeWeights:
+    """测试持仓市值归一化"""
+
+    @pytest.mark.parametrize("normalize", _implementations(risk_kernels.normalize_weights))
+    def test_weights_sum_to_one(self, normalize):
+        """权重按市值占比分配，总和为1"""
+        np.testing.assert_allclose(normalize(_array(60.0, 40.0)), [0.6, 0.4])
+        np.testing.assert_allclose(normalize(_array(5.0)), [1.0])
+
+    @pytest.mark.parametrize("normalize", _implementations(risk_kernels.normalize_weights))
+    def test_zero_total_gives_zero_weights(self, normalize):
+        """总市值为0时（包括正负抵消）返回全0权重"""
+        np.testing.assert_array_equal(normalize(_array(0.0, 0.0)), [0.0, 0.0])
+        np.testing.assert_array_equal(normalize(_array(10.0, -10.0)), [0.0, 0.0])
+        assert normalize(_array()).shape == (0,)
+
+    @pytest.mark.parametrize("normalize", _implementations(risk_kernels.normalize_weights))
+    def test_negative_positions_keep_their_sign(self, normalize):
+        """空头持仓得到负权重"""
+        np.testing.assert_allclose(normalize(_array(150.0, -50.0)), [1.5, -0.5])
+
+
+class TestConcentrationMetrics:
+    """测试集中度指标"""
+
+    @pytest.mark.parametrize("metrics", _implementations(risk_kernels.concentration_metrics))
+    def test_single_position(self, metrics):
+        """单一持仓完全集中"""
+        assert metrics(_array(1.0)) == pytest.approx((1.0, 1.0, 1.0))
+
+    @pytest.mark.parametrize("metrics", _implementations(risk_kernels.concentration_metrics))
+    def test_zero_weights(self, metrics):
+        """全0权重（包括空组合）的各项指标为0"""
+        assert metrics(_array(0.0, 0.0, 0.0)) == (0.0, 0.0, 0.0)
+        assert metrics(_array()) == (0.0, 0.0, 0.0)
+
+    @pytest.mark.parametrize("metrics", _implementations(risk_kernels.concentration_metrics))
+    def test_negative_weights(self, metrics):
+        """负权重计入赫芬达尔指数，但不会成为最大持仓权重"""
+        herfindahl, max_weight, top5 = metrics(_array(1.5, -0.5))
+        assert herfindahl == pytest.approx(2.5)
+        assert max_weight == pytest.approx(1.5)
+        assert top5 == pytest.approx(1.0)
+        assert metrics(_array(-0.4, -0.6))[1] == 0.0
+
+    @pytest.mark.parametrize("metrics", _implementations(risk_kernels.concentration_metrics))
+    def test_top5_uses_largest_positions(self, metrics):
+        """前5大持仓集中度只累加最大的5个权重"""
+        weights = _array(0.05, 0.3, 0.1, 0.2, 0.05, 0.15, 0.15)
+        herfindahl, max_weight, top5 = metrics(weights)
+        assert herfindahl == pytest.approx(float(np.sum(weights ** 2)))
+        assert max_weight == pytest.approx(0.3)
+        assert top5 == pytest.approx(0.9)
+
+
+class TestPositionContribution:
+    """测试持仓收益贡献"""
+
+    @pytest.mark.parametrize("contribution", _implementations(risk_kernels.position_contribution))
+    def test_contribution_is_weight_times_return(self, contribution):
+        """贡献为权重乘以收益率"""
+        np.testing.assert_allclose(
+            contribution(_array(0.6, 0.4), _array(0.1, -0.05)), [0.06, -0.02]
+        )
+        np.testing.assert_allclose(contribution(_array(1.0), _array(0.2)), [0.2])
+
+    @pytest.mark.parametrize("contribution", _implementations(risk_kernels.position_contribution))
+    def test_nan_return_only_affects_its_position(self, contribution):
+        """缺失的收益率（NaN）只影响对应持仓的贡献"""
+        result = contribution(_array(0.5, 0.3, 0.2), _array(0.1, math.nan, -0.1))
+        assert math.isnan(result[1])
+        np.testing.assert_allclose(result[[0, 2]], [0.05, -0.02])
+
+    @pytest.mark.parametrize("contribution", _implementations(risk_kernels.position_contribution))
+    def test_zero_and_negative_weights(self, contribution):
+        """0权重不贡献收益，负权重反向贡献"""
+        np.testing.assert_allclose(
+            contribution(_array(0.0, -0.5), _array(0.3, 0.1)), [0.0, -0.05]
+        )
@@ -4,16 +4,23 @@ Fetcher项目安装和配置脚本
 """
 
 import os
+import shlex
+import shutil
 import sys
 import subprocess
 import argparse
 from pathlib import Path
 
+# proto文件数量达到该阈值时才拆分到多个进程并行编译
+PARALLEL_PROTO_THRESHOLD = 8
+
 
 def run_command(cmd, check=True):
     """运行系统命令"""
     print(f"执行命令: {cmd}")
-    result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
+    # 直接 exec 目标程序，不经过 /bin/sh
+    args = shlex.split(cmd) if isinstance(cmd, str) else cmd
+    result = subprocess.run(args, shell=False, capture_output=True, text=True, check=False)
     if check and result.returncode != 0:
         print(f"命令执行失败: {result.stderr}")
         sys.exit(1)
@@ -57,7 +64,23 @@ def setup_python_environment():
         print("警告: 未找到requirements.txt文件")
 
 
-def compile_proto_files():
+def _protoc(proto_files):
+    """在当前进程内调用 grpc_tools.protoc 编译一组proto文件，返回退出码"""
+    from importlib import resources
+    from grpc_tools import protoc
+
+    proto_include = resources.files("grpc_tools") / "_proto"
+    return protoc.main([
+        "grpc_tools.protoc",
+        "--proto_path=proto",
+        f"-I{proto_include}",
+        "--python_out=src/generated",
+        "--grpc_python_out=src/generated",
+        *[str(p) for p in proto_files],
+    ])
+
+
+def compile_proto_files(jobs=None):
     """编译Protocol Buffers文件"""
     print("正在编译Protocol Buffers文件...")
     
@@ -77,13 +100,33 @@ def compile_proto_files():
         print("警告: 未找到proto文件")
         return
     
+    # 跳过生成文件比源文件新的proto
+    stale_files = []
     for proto_file in proto_files:
-        cmd = f"""python -m grpc_tools.protoc \
-            --proto_path=proto \
-            --python_out=src/generated \
-            --grpc_python_out=src/generated \
-            {proto_file}"""
-        run_command(cmd)
+        out = output_dir / (proto_file.stem + "_pb2.py")
+        if out.exists() and out.stat().st_mtime >= proto_file.stat().st_mtime:
+            continue
+        stale_files.append(proto_file)
+    
+    if not stale_files:
+        print("Protocol Buffers文件已是最新，跳过编译")
+        return
+    proto_files = stale_files
+    
+    # 一次 protoc 调用编译全部文件；文件较多时再按CPU数分块并行
+    jobs = jobs or os.cpu_count() or 1
+    if jobs > 1 and len(proto_files) >= PARALLEL_PROTO_THRESHOLD:
+        from concurrent.futures import ProcessPoolExecutor
+
+        chunks = [proto_files[i::jobs] for i in range(jobs)]
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            codes = list(executor.map(_protoc, [c for c in chunks if c]))
+    else:
+        codes = [_protoc(proto_files)]
+
+    if any(codes):
+        print("Protocol Buffers文件编译失败")
+        sys.exit(1)
     
     # 创建__init__.py文件
     init_file = output_dir / "__init__.py"
@@ -108,7 +151,11 @@ def setup_redis():
     
     try:
         import redis
-        r = redis.Redis(host='localhost', port=6379, db=0)
+        # 设置超时，Redis不可达时快速失败而不是卡住安装流程
+        r = redis.Redis(
+            host='localhost', port=6379, db=0,
+            socket_connect_timeout=1.0, socket_timeout=1.0,
+        )
         r.ping()
         print("Redis连接正常")
     except Exception as e:
@@ -187,15 +234,13 @@ def setup_docker():
     """设置Docker环境"""
     print("正在设置Docker环境...")
     
-    # 检查Docker是否安装
-    result = run_command("docker --version", check=False)
-    if result.returncode != 0:
-        print("警告: Docker未安装或未启动")
+    # 检查Docker是否安装（只查找PATH，不启动子进程）
+    if shutil.which("docker") is None:
+        print("警告: Docker未安装")
         return
     
     # 检查Docker Compose是否安装
-    result = run_command("docker-compose --version", check=False)
-    if result.returncode != 0:
+    if shutil.which("docker-compose") is None:
         print("警告: Docker Compose未安装")
         return
     
@@ -226,6 +271,7 @@ def main():
     parser.add_argument("--skip-proto", action="store_true", help="跳过Proto编译")
     parser.add_argument("--skip-docker", action="store_true", help="跳过Docker设置")
     parser.add_argument("--tests", action="store_true", help="运行测试")
+    parser.add_argument("--jobs", type=int, default=None, help="并行编译Proto的进程数（默认CPU核数）")
     
     args = parser.parse_args()
     
@@ -239,7 +285,7 @@ def main():
             print()
         
         if not args.skip_proto:
-            compile_proto_files()
+            compile_proto_files(jobs=args.jobs)
             print()
         
         setup_config()
@@ -255,7 +301,7 @@ def main():
             setup_docker()
             print()
         
-        if args.test:
+        if args.tests:
             run_tests()
             print()
         
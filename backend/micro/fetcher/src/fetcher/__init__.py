@@ -12,9 +12,15 @@ This service provides data fetching and processing capabilities including:
 __version__ = "0.1.0"
 __author__ = "mofan <mofan@mosia.app>"
 
-from .grpc.services.fetch_service import FetchService       # 假设 FetchService 定义在 service.py
-from .config.settings import settings            # 假设 settings 定义在 config.py
-from .config.logging import setup_logging, get_logger  # 假设日志工具在 logging.py
+import importlib
+
+# 按需导入：仅在首次访问属性时加载 gRPC / 配置等重量级依赖
+_LAZY = {
+    "FetchService": (".grpc.services.fetch_service", "FetchService"),
+    "settings": (".config.settings", "settings"),
+    "setup_logging": (".config.logging", "setup_logging"),
+    "get_logger": (".config.logging", "get_logger"),
+}
 
 __all__ = [
     "FetchService",
@@ -22,3 +28,17 @@ __all__ = [
     "setup_logging",
     "get_logger",
 ]
+
+
+def __getattr__(name):
+    try:
+        module_name, attr = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(module_name, __name__), attr)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY))
@@ -0,0 +1,329 @@
+"""
+Numeric kernels for the AI analyzer.
+
+Kernels are compiled with Numba when it is installed. Each kernel declares an
+explicit float64 signature, so it is compiled (or loaded from the on-disk
+cache) when this module is imported rather than on its first call, and
+releases the GIL so independent analyses can run on worker threads
+concurrently.
+
+Without Numba the scalar loops would run as plain Python, far slower than
+NumPy, so the same names are bound to vectorized NumPy versions instead;
+callers never need to check.
+"""
+
+import math
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is an optional performance dependency
+    njit = None
+
+if njit is None:
+    # 保持下方的内核定义可以导入；文件末尾会替换为NumPy实现
+    def _jit(*args, **kwargs):
+        return lambda fn: fn
+else:
+    _jit = njit
+
+
+@_jit("UniTuple(f8, 2)(f8[::1], f8, f8)", cache=True, nogil=True)
+def _percentile_pair(values, q1, q2):
+    """Two linear-interpolated percentiles (same definition as np.percentile)
+    from a single partition of ``values``."""
+    n = values.shape[0]
+    pos1 = q1 / 100.0 * (n - 1)
+    pos2 = q2 / 100.0 * (n - 1)
+    lo1 = int(math.floor(pos1))
+    lo2 = int(math.floor(pos2))
+    hi1 = min(lo1 + 1, n - 1)
+    hi2 = min(lo2 + 1, n - 1)
+    part = np.partition(values, np.array([lo1, hi1, lo2, hi2]))
+    p1 = part[lo1] + (part[hi1] - part[lo1]) * (pos1 - lo1)
+    p2 = part[lo2] + (part[hi2] - part[lo2]) * (pos2 - lo2)
+    return p1, p2
+
+
+@_jit("UniTuple(f8, 5)(f8[::1])", cache=True, nogil=True)
+def risk_kernel(returns):
+    """Single pass over log returns: (var_95, var_99, max_drawdown, mean_ret, std_ret)."""
+    n = returns.shape[0]
+    total = 0.0
+    total_sq = 0.0
+    cumulative = 1.0
+    running_max = -np.inf
+    max_drawdown = 0.0
+    for i in range(n):
+        r = returns[i]
+        total += r
+        total_sq += r * r
+        cumulative *= 1.0 + r
+        if cumulative > running_max:
+            running_max = cumulative
+        drawdown = (cumulative - running_max) / running_max
+        if i == 0 or drawdown < max_drawdown:
+            max_drawdown = drawdown
+
+    mean_ret = total / n
+    std_ret = math.sqrt(max(total_sq / n - mean_ret * mean_ret, 0.0))
+    var_95, var_99 = _percentile_pair(returns, 5.0, 1.0)
+    return var_95, var_99, max_drawdown, mean_ret, std_ret
+
+
+@_jit("f8[::1](f8[::1], i8)", cache=True, nogil=True)
+def rolling_mean(values, window):
+    """Rolling mean via a running prefix sum; element i covers values[i:i + window]."""
+    n = values.shape[0]
+    prefix = np.empty(n + 1)
+    prefix[0] = 0.0
+    for i in range(n):
+        prefix[i + 1] = prefix[i] + values[i]
+
+    out = np.empty(max(n - window + 1, 0))
+    for i in range(window - 1, n):
+        out[i - window + 1] = (prefix[i + 1] - prefix[i + 1 - window]) / window
+    return out
+
+
+@_jit("UniTuple(b1, 2)(f8[::1], f8)", cache=True, nogil=True)
+def detect_double_patterns(prices, tolerance=0.05):
+    """Scan local extrema once and return (has_double_bottom, has_double_top).
+
+    The last two local minima (maxima) form a double bottom (top) when they
+    differ by less than ``tolerance`` relative to the lower (higher) one.
+    """
+    n = prices.shape[0]
+    if n < 7:
+        return False, False
+
+    last_min = -1
+    prev_min = -1
+    last_max = -1
+    prev_max = -1
+    for i in range(1, n - 1):
+        p = prices[i]
+        if p < prices[i - 1] and p < prices[i + 1]:
+            prev_min = last_min
+            last_min = i
+        elif p > prices[i - 1] and p > prices[i + 1]:
+            prev_max = last_max
+            last_max = i
+
+    double_bottom = False
+    if prev_min >= 0:
+        b1 = prices[prev_min]
+        b2 = prices[last_min]
+        double_bottom = abs(b1 - b2) / min(b1, b2) < tolerance
+
+    double_top = False
+    if prev_max >= 0:
+        t1 = prices[prev_max]
+        t2 = prices[last_max]
+        double_top = abs(t1 - t2) / max(t1, t2) < tolerance
+
+    return double_bottom, double_top
+
+
+@_jit("f8(f8[::1])", cache=True, nogil=True)
+def linreg_slope(y):
+    """Least-squares slope of y against x = 0..n-1, in closed form."""
+    n = y.shape[0]
+    sum_x = n * (n - 1) / 2.0
+    sum_x2 = n * (n - 1) * (2 * n - 1) / 6.0
+    sum_y = 0.0
+    sum_xy = 0.0
+    for i in range(n):
+        sum_y += y[i]
+        sum_xy += i * y[i]
+    return (n * sum_xy - sum_x * sum_y) / (n * sum_x2 - sum_x * sum_x)
+
+
+@_jit("f8(f8[::1], i8)", cache=True, nogil=True)
+def _tail_std(values, window):
+    """Population std of the last ``window`` values (two-pass, like np.std)."""
+    n = values.shape[0]
+    start = max(n - window, 0)
+    m = n - start
+    mean = 0.0
+    for i in range(start, n):
+        mean += values[i]
+    mean /= m
+    sq = 0.0
+    for i in range(start, n):
+        d = values[i] - mean
+        sq += d * d
+    return math.sqrt(sq / m)
+
+
+@_jit(
+    "Tuple((f8, f8, f8, f8, f8, f8, f8, f8, b1, b1, b1, f8, f8))"
+    "(f8[::1], f8[::1], f8[::1], f8[::1], f8[::1])",
+    cache=True,
+    nogil=True,
+)
+def default_pipeline(prices, returns, close, momentum, rsi):
+    """Numeric inputs of the default analyses (trend, momentum, volatility,
+    pattern) computed in one call over the tails of the input columns.
+
+    ``prices``/``returns`` are the valid closes and their log returns and must
+    hold at least 20 closes; ``close``/``momentum``/``rsi`` are the raw
+    NaN-padded columns. Returns::
+
+        (sma_20, sma_50, slope_10, mean_10,      # trend
+         avg_momentum, current_rsi,               # momentum, NaN when absent
+         std_5, std_20,                           # volatility (not annualised)
+         has_window, double_bottom, double_top,   # pattern over close[-10:]
+         recent_high, resistance)
+    """
+    n = prices.shape[0]
+
+    # One backward sweep accumulates the 10/20/50-close window sums
+    sum_10 = 0.0
+    sum_20 = 0.0
+    sum_50 = 0.0
+    for i in range(1, min(n, 50) + 1):
+        p = prices[n - i]
+        if i <= 10:
+            sum_10 += p
+        if i <= 20:
+            sum_20 += p
+        sum_50 += p
+    sma_20 = sum_20 / 20.0
+    sma_50 = sum_50 / 50.0 if n >= 50 else sma_20
+    slope_10 = linreg_slope(prices[n - 10:])
+    mean_10 = sum_10 / 10.0
+
+    # Mean of the last five valid momentum values within the last 14 records
+    m = momentum.shape[0]
+    total = 0.0
+    count = 0
+    for i in range(m - 1, max(m - 14, 0) - 1, -1):
+        v = momentum[i]
+        if not math.isnan(v):
+            total += v
+            count += 1
+            if count == 5:
+                break
+    avg_momentum = total / count if count else np.nan
+
+    # Last valid RSI within the last 14 records
+    current_rsi = np.nan
+    for i in range(rsi.shape[0] - 1, max(rsi.shape[0] - 14, 0) - 1, -1):
+        if not math.isnan(rsi[i]):
+            current_rsi = rsi[i]
+            break
+
+    std_5 = _tail_std(returns, 5)
+    std_20 = _tail_std(returns, 20)
+
+    # Patterns need the last ten records without gaps
+    window = close[close.shape[0] - 10:]
+    has_window = True
+    for i in range(10):
+        if math.isnan(window[i]):
+            has_window = False
+            break
+    double_bottom = False
+    double_top = False
+    recent_high = np.nan
+    resistance = np.nan
+    if has_window:
+        double_bottom, double_top = detect_double_patterns(window, 0.05)
+        recent_high = window[5:].max()
+        resistance = window[:5].max()
+
+    return (sma_20, sma_50, slope_10, mean_10, avg_momentum, current_rsi,
+            std_5, std_20, has_window, double_bottom, double_top,
+            recent_high, resistance)
+
+
+def _risk_kernel_numpy(returns):
+    """NumPy version of ``risk_kernel``."""
+    cumulative = np.cumprod(1.0 + returns)
+    running_max = np.maximum.accumulate(cumulative)
+    max_drawdown = np.min((cumulative - running_max) / running_max)
+    var_95, var_99 = np.percentile(returns, [5.0, 1.0])
+    return (float(var_95), float(var_99), float(max_drawdown),
+            float(np.mean(returns)), float(np.std(returns)))
+
+
+def _rolling_mean_numpy(values, window):
+    """NumPy version of ``rolling_mean``."""
+    if values.shape[0] < window:
+        return np.empty(0)
+    prefix = np.concatenate(([0.0], np.cumsum(values)))
+    return (prefix[window:] - prefix[:-window]) / window
+
+
+def _detect_double_patterns_numpy(prices, tolerance=0.05):
+    """NumPy version of ``detect_double_patterns``."""
+    if prices.shape[0] < 7:
+        return False, False
+    mid, left, right = prices[1:-1], prices[:-2], prices[2:]
+    minima = prices[1:-1][(mid < left) & (mid < right)]
+    maxima = prices[1:-1][(mid > left) & (mid > right)]
+
+    double_bottom = False
+    if minima.shape[0] >= 2:
+        b1, b2 = minima[-2], minima[-1]
+        double_bottom = bool(abs(b1 - b2) / min(b1, b2) < tolerance)
+
+    double_top = False
+    if maxima.shape[0] >= 2:
+        t1, t2 = maxima[-2], maxima[-1]
+        double_top = bool(abs(t1 - t2) / max(t1, t2) < tolerance)
+
+    return double_bottom, double_top
+
+
+def _linreg_slope_numpy(y):
+    """NumPy version of ``linreg_slope``."""
+    n = y.shape[0]
+    sum_x = n * (n - 1) / 2.0
+    sum_x2 = n * (n - 1) * (2 * n - 1) / 6.0
+    return float((n * np.dot(np.arange(n), y) - sum_x * y.sum()) / (n * sum_x2 - sum_x * sum_x))
+
+
+def _default_pipeline_numpy(prices, returns, close, momentum, rsi):
+    """NumPy version of ``default_pipeline``."""
+    n = prices.shape[0]
+    sma_20 = float(prices[-20:].mean())
+    sma_50 = float(prices[-50:].mean()) if n >= 50 else sma_20
+    slope_10 = _linreg_slope_numpy(prices[-10:])
+    mean_10 = float(prices[-10:].mean())
+
+    recent_momentum = momentum[-14:]
+    recent_momentum = recent_momentum[~np.isnan(recent_momentum)][-5:]
+    avg_momentum = float(recent_momentum.mean()) if recent_momentum.shape[0] else np.nan
+
+    recent_rsi = rsi[-14:]
+    recent_rsi = recent_rsi[~np.isnan(recent_rsi)]
+    current_rsi = float(recent_rsi[-1]) if recent_rsi.shape[0] else np.nan
+
+    std_5 = float(np.std(returns[-5:]))
+    std_20 = float(np.std(returns[-20:]))
+
+    window = close[-10:]
+    has_window = not np.isnan(window).any()
+    double_bottom = False
+    double_top = False
+    recent_high = np.nan
+    resistance = np.nan
+    if has_window:
+        double_bottom, double_top = _detect_double_patterns_numpy(window, 0.05)
+        recent_high = float(window[5:].max())
+        resistance = float(window[:5].max())
+
+    return (sma_20, sma_50, slope_10, mean_10, avg_momentum, current_rsi,
+            std_5, std_20, has_window, double_bottom, double_top,
+            recent_high, resistance)
+
+
+if njit is None:
+    risk_kernel = _risk_kernel_numpy
+    rolling_mean = _rolling_mean_numpy
+    detect_double_patterns = _detect_double_patterns_numpy
+    linreg_slope = _linreg_slope_numpy
+    default_pipeline = _default_pipeline_numpy
@@ -3,10 +3,14 @@ AI Financial Data Analyzer
 AI金融数据分析器 - 为大模型提供智能化分析能力
 """
 
+import asyncio
 import logging
+import math
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass, field
-from datetime import datetime
-from enum import Enum
+from datetime import datetime, timedelta, timezone
+from enum import Enum, IntEnum
+from types import MappingProxyType
 from typing import Any, Dict, List, Optional
 
 import numpy as np
@@ -14,6 +18,30 @@ import numpy as np
 from ..core.models.base import EnhancedPriceData
 
 
+# _to_arrays 生成的列式数组字段
+_ARRAY_FIELDS = (
+    "open", "high", "low", "close", "volume",
+    "momentum_1d", "rsi", "anomaly_score",
+)
+
+# 日波动率年化系数（按252个交易日）
+_ANNUALIZATION_FACTOR = math.sqrt(252)
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+_NS_PER_HOUR = 3.6e12
+
+
+# 风险等级评分的分档边界（升序）及总分到等级的映射
+_VAR_BINS = (-0.05, -0.03, -0.02)
+_DRAWDOWN_BINS = (-0.20, -0.15, -0.10)
+_VOLATILITY_BINS = (0.20, 0.30, 0.40)
+_RISK_LEVEL_BY_SCORE = (
+    "very_low", "low", "low", "medium", "medium",
+    "high", "high", "very_high", "very_high", "very_high",
+)
+
+
 class AnalysisType(Enum):
     """分析类型"""
     TREND = "trend"
@@ -26,13 +54,33 @@ class AnalysisType(Enum):
     ANOMALY = "anomaly"
 
 
-class SignalStrength(Enum):
-    """信号强度"""
-    VERY_STRONG = "very_strong"
-    STRONG = "strong"
-    MODERATE = "moderate"
-    WEAK = "weak"
-    VERY_WEAK = "very_weak"
+# 未指定分析类型时执行的默认分析；恰好为这组分析时走融合内核
+_DEFAULT_ANALYSES = (
+    AnalysisType.TREND,
+    AnalysisType.MOMENTUM,
+    AnalysisType.VOLATILITY,
+    AnalysisType.PATTERN,
+)
+
+# 各分析所需的最少数据量：(检查长度的数组, 最少长度)，不满足时直接跳过该分析。
+# 基于有效收盘价的分析检查 "prices"；读取原始列（含缺失值）的分析检查记录数 "close"
+_ANALYZER_MIN_LEN = MappingProxyType({
+    AnalysisType.TREND: ("prices", 20),
+    AnalysisType.MOMENTUM: ("close", 14),
+    AnalysisType.VOLATILITY: ("prices", 20),
+    AnalysisType.PATTERN: ("close", 10),
+    AnalysisType.RISK: ("prices", 20),
+    AnalysisType.ANOMALY: ("close", 20),
+})
+
+
+class SignalStrength(IntEnum):
+    """信号强度（取值即主导信号排序时的权重）"""
+    VERY_STRONG = 5
+    STRONG = 4
+    MODERATE = 3
+    WEAK = 2
+    VERY_WEAK = 1
 
 
 class SignalDirection(Enum):
@@ -43,7 +91,24 @@ class SignalDirection(Enum):
     MIXED = "mixed"
 
 
-@dataclass
+# 摘要中使用的中文标签
+_DIRECTION_LABELS = MappingProxyType({
+    SignalDirection.BULLISH: "看涨",
+    SignalDirection.BEARISH: "看跌",
+    SignalDirection.NEUTRAL: "中性",
+    SignalDirection.MIXED: "分歧",
+})
+
+_STRENGTH_LABELS = MappingProxyType({
+    SignalStrength.VERY_STRONG: "非常强",
+    SignalStrength.STRONG: "强",
+    SignalStrength.MODERATE: "中等",
+    SignalStrength.WEAK: "弱",
+    SignalStrength.VERY_WEAK: "非常弱",
+})
+
+
+@dataclass(slots=True)
 class AnalysisSignal:
     """分析信号"""
     signal_type: str
@@ -55,13 +120,19 @@ class AnalysisSignal:
     risk_factors: List[str] = field(default_factory=list)
     time_horizon: str = "short_term"  # short_term, medium_term, long_term
     metadata: Dict[str, Any] = field(default_factory=dict)
+    _dict_cache: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
     
     def to_dict(self) -> Dict[str, Any]:
-        """转换为字典"""
+        """转换为字典（信号构建后视为不可变，结果只计算一次）"""
+        if self._dict_cache is None:
+            self._dict_cache = self._build_dict()
+        return self._dict_cache
+    
+    def _build_dict(self) -> Dict[str, Any]:
         return {
             "signal_type": self.signal_type,
             "direction": self.direction.value,
-            "strength": self.strength.value,
+            "strength": self.strength.name.lower(),
             "confidence": self.confidence,
             "reasoning": self.reasoning,
             "supporting_indicators": self.supporting_indicators,
@@ -71,7 +142,7 @@ class AnalysisSignal:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class MarketContext:
     """市场环境上下文"""
     market_regime: str  # trending, ranging, volatile, crisis
@@ -80,8 +151,14 @@ class MarketContext:
     sector_rotation: bool
     risk_sentiment: str  # risk_on, risk_off, neutral
     economic_cycle: str  # expansion, peak, contraction, trough
+    _dict_cache: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
     
     def to_dict(self) -> Dict[str, Any]:
+        if self._dict_cache is None:
+            self._dict_cache = self._build_dict()
+        return self._dict_cache
+    
+    def _build_dict(self) -> Dict[str, Any]:
         return {
             "market_regime": self.market_regime,
             "volatility_level": self.volatility_level,
@@ -92,7 +169,7 @@ class MarketContext:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class AIAnalysisResult:
     """AI分析结果"""
     symbol: str
@@ -121,24 +198,8 @@ class AIAnalysisResult:
     
     def get_dominant_signal(self) -> Optional[AnalysisSignal]:
         """获取主导信号"""
-        if not self.signals:
-            return None
-        
-        # 按置信度和强度排序
-        weighted_signals = []
-        for signal in self.signals:
-            strength_weight = {
-                SignalStrength.VERY_STRONG: 5,
-                SignalStrength.STRONG: 4,
-                SignalStrength.MODERATE: 3,
-                SignalStrength.WEAK: 2,
-                SignalStrength.VERY_WEAK: 1
-            }
-            weight = signal.confidence * strength_weight[signal.strength]
-            weighted_signals.append((weight, signal))
-        
-        weighted_signals.sort(key=lambda x: x[0], reverse=True)
-        return weighted_signals[0][1]
+        # 按置信度 × 强度权重取最大者
+        return max(self.signals, key=lambda s: s.confidence * s.strength, default=None)
 
 
 class AIFinancialAnalyzer:
@@ -146,6 +207,22 @@ class AIFinancialAnalyzer:
     
     def __init__(self):
         self.logger = logging.getLogger("ai_analyzer")
+        self._kernels = None
+        self._analyzers = {
+            AnalysisType.TREND: self._analyze_trend,
+            AnalysisType.MOMENTUM: self._analyze_momentum,
+            AnalysisType.VOLATILITY: self._analyze_volatility,
+            AnalysisType.PATTERN: self._analyze_patterns,
+            AnalysisType.RISK: self._analyze_risk,
+            AnalysisType.ANOMALY: self._detect_anomalies,
+        }
+    
+    def _load_kernels(self):
+        """首次分析时才导入数值内核，避免仅导入本模块就承担编译/加载开销"""
+        if self._kernels is None:
+            from . import _kernels
+            self._kernels = _kernels
+        return self._kernels
     
     async def analyze_price_data(
         self, 
@@ -168,19 +245,21 @@ class AIFinancialAnalyzer:
             raise ValueError("No data provided for analysis")
         
         if analysis_types is None:
-            analysis_types = [
-                AnalysisType.TREND, 
-                AnalysisType.MOMENTUM, 
-                AnalysisType.VOLATILITY,
-                AnalysisType.PATTERN
-            ]
+            analysis_types = list(_DEFAULT_ANALYSES)
         
         symbol = data[0].symbol
         analysis_time = datetime.now()
         
+        if self._kernels is None:
+            # 首次导入会编译（或从磁盘缓存加载）内核，放到线程中进行，不阻塞事件循环
+            await asyncio.to_thread(self._load_kernels)
+        
+        # 一次遍历转换为列式数组，供所有分析复用
+        arrs = self._to_arrays(data)
+        
         # 如果没有提供市场环境，进行推断
         if market_context is None:
-            market_context = self._infer_market_context(data)
+            market_context = self._infer_market_context(arrs)
         
         # 初始化分析结果
         result = AIAnalysisResult(
@@ -189,55 +268,122 @@ class AIFinancialAnalyzer:
             market_context=market_context
         )
         
-        # 执行各类分析
-        for analysis_type in analysis_types:
-            if analysis_type == AnalysisType.TREND:
-                signals = await self._analyze_trend(data)
-                result.signals.extend(signals)
-            elif analysis_type == AnalysisType.MOMENTUM:
-                signals = await self._analyze_momentum(data)
-                result.signals.extend(signals)
-            elif analysis_type == AnalysisType.VOLATILITY:
-                signals = await self._analyze_volatility(data)
-                result.signals.extend(signals)
-            elif analysis_type == AnalysisType.PATTERN:
-                signals = await self._analyze_patterns(data)
-                result.signals.extend(signals)
-            elif analysis_type == AnalysisType.RISK:
-                risk_metrics = await self._analyze_risk(data)
-                result.risk_assessment.update(risk_metrics)
-            elif analysis_type == AnalysisType.ANOMALY:
-                anomaly_signals = await self._detect_anomalies(data)
-                result.signals.extend(anomaly_signals)
+        # 执行各类分析：数据长度只在此统一检查一次
+        selected = [
+            t for t in analysis_types
+            if t in self._analyzers
+            and len(arrs[_ANALYZER_MIN_LEN[t][0]]) >= _ANALYZER_MIN_LEN[t][1]
+        ]
+        if len(selected) == len(_DEFAULT_ANALYSES) and set(selected) == set(_DEFAULT_ANALYSES):
+            # 默认分析组合：一次融合内核调用算出全部数值，只需组装信号
+            outputs = self._run_default_pipeline(arrs, selected)
+        else:
+            # 各分析相互独立且内核释放GIL，放到线程池并行执行
+            outputs = await asyncio.gather(
+                *(asyncio.to_thread(self._analyzers[t], arrs) for t in selected)
+            )
+        for analysis_type, output in zip(selected, outputs):
+            if analysis_type == AnalysisType.RISK:
+                result.risk_assessment.update(output)
+            else:
+                result.signals.extend(output)
         
         # 计算关键指标
-        result.key_metrics = self._calculate_key_metrics(data)
+        result.key_metrics = self._calculate_key_metrics(arrs, data[-1])
         
         # 生成AI摘要和建议
         result.ai_summary = self._generate_ai_summary(result)
         result.recommendations = self._generate_recommendations(result)
         
         # 评估数据质量
-        result.data_quality_score = self._assess_data_quality(data)
+        result.data_quality_score = self._assess_data_quality(arrs)
         
         return result
     
-    async def _analyze_trend(self, data: List[EnhancedPriceData]) -> List[AnalysisSignal]:
+    @staticmethod
+    def _to_arrays(data: List[EnhancedPriceData]) -> Dict[str, np.ndarray]:
+        """一次遍历将价格数据转换为列式float64数组（缺失值记为NaN）
+
+        额外的 ``prices`` 为剔除缺失值后的有效收盘价，``log_returns`` 为其对数收益率，
+        供各分析共用，避免重复计算对数。
+        """
+        n = len(data)
+        arrs = {key: np.full(n, np.nan) for key in _ARRAY_FIELDS}
+        arrs["timestamps_ns"] = timestamps_ns = np.empty(n, dtype=np.int64)
+        open_, high, low, close = arrs["open"], arrs["high"], arrs["low"], arrs["close"]
+        volume = arrs["volume"]
+        momentum_1d, rsi, anomaly_score = arrs["momentum_1d"], arrs["rsi"], arrs["anomaly_score"]
+        
+        for i, d in enumerate(data):
+            o, h, l, c, v = d.open_value, d.high_value, d.low_value, d.close_value, d.volume
+            if o is not None:
+                open_[i] = o
+            if h is not None:
+                high[i] = h
+            if l is not None:
+                low[i] = l
+            if c is not None:
+                close[i] = c
+            if v is not None:
+                volume[i] = v
+            timestamps_ns[i] = (d.timestamp - _EPOCH) // _MICROSECOND * 1000
+            
+            ti = d.technical_indicators
+            if ti and ti.rsi is not None:
+                rsi[i] = ti.rsi
+            ai = d.ai_features
+            if ai:
+                if ai.momentum_1d is not None:
+                    momentum_1d[i] = ai.momentum_1d
+                if ai.anomaly_score is not None:
+                    anomaly_score[i] = ai.anomaly_score
+        
+        arrs["prices"] = prices = close[~np.isnan(close)]
+        arrs["log_returns"] = np.diff(np.log(prices))
+        return arrs
+    
+    def _run_default_pipeline(
+        self, arrs: Dict[str, np.ndarray], selected: List[AnalysisType]
+    ) -> List[List[AnalysisSignal]]:
+        """用融合内核执行默认分析组合，按 selected 的顺序返回各分析的信号"""
+        (sma_20, sma_50, slope, mean_10, avg_momentum, current_rsi,
+         std_5, std_20, has_window, double_bottom, double_top,
+         recent_high, resistance_level) = self._kernels.default_pipeline(
+            arrs["prices"], arrs["log_returns"], arrs["close"], arrs["momentum_1d"], arrs["rsi"]
+        )
+        signals = {
+            AnalysisType.TREND: self._trend_signals(
+                arrs["prices"][-1], sma_20, sma_50, slope, mean_10
+            ),
+            AnalysisType.MOMENTUM: self._momentum_signals(avg_momentum, current_rsi),
+            AnalysisType.VOLATILITY: self._volatility_signals(
+                std_5 * _ANNUALIZATION_FACTOR, std_20 * _ANNUALIZATION_FACTOR
+            ),
+            AnalysisType.PATTERN: self._pattern_signals(
+                double_bottom, double_top, recent_high, resistance_level
+            ) if has_window else [],
+        }
+        return [signals[t] for t in selected]
+    
+    def _analyze_trend(self, arrs: Dict[str, np.ndarray]) -> List[AnalysisSignal]:
         """趋势分析"""
-        signals = []
+        prices = arrs["prices"]
         
-        if len(data) < 20:
-            return signals
+        # 计算移动平均线趋势
+        sma_20 = self._kernels.rolling_mean(prices, 20)[-1]
+        sma_50 = self._kernels.rolling_mean(prices, 50)[-1] if len(prices) >= 50 else sma_20
         
-        # 提取收盘价
-        prices = [d.close_value for d in data if d.close_value is not None]
-        if len(prices) < 20:
-            return signals
+        # 近10日线性回归趋势
+        y = prices[-10:]
+        slope = self._kernels.linreg_slope(y)
         
-        # 计算移动平均线趋势
-        sma_20 = np.mean(prices[-20:])
-        sma_50 = np.mean(prices[-50:]) if len(prices) >= 50 else sma_20
-        current_price = prices[-1]
+        return self._trend_signals(prices[-1], sma_20, sma_50, slope, np.mean(y))
+    
+    def _trend_signals(
+        self, current_price: float, sma_20: float, sma_50: float, slope: float, mean_10: float
+    ) -> List[AnalysisSignal]:
+        """根据均线与回归斜率生成趋势信号"""
+        signals = []
         
         # 短期趋势信号
         if current_price > sma_20 > sma_50:
@@ -269,50 +415,44 @@ class AIFinancialAnalyzer:
         signals.append(signal)
         
         # 趋势强度分析
-        if len(prices) >= 10:
-            # 线性回归趋势
-            x = np.arange(len(prices[-10:]))
-            y = np.array(prices[-10:])
-            slope, _ = np.polyfit(x, y, 1)
-            
-            trend_strength = abs(slope) / np.mean(y)
+        trend_strength = abs(slope) / mean_10
+        
+        if trend_strength > 0.02:  # 每日2%以上的趋势
+            direction = SignalDirection.BULLISH if slope > 0 else SignalDirection.BEARISH
+            strength = SignalStrength.STRONG if trend_strength > 0.05 else SignalStrength.MODERATE
             
-            if trend_strength > 0.02:  # 每日2%以上的趋势
-                direction = SignalDirection.BULLISH if slope > 0 else SignalDirection.BEARISH
-                strength = SignalStrength.STRONG if trend_strength > 0.05 else SignalStrength.MODERATE
-                
-                signal = AnalysisSignal(
-                    signal_type="trend_regression",
-                    direction=direction,
-                    strength=strength,
-                    confidence=min(0.9, trend_strength * 20),
-                    reasoning=f"近10日线性趋势斜率为 {slope:.4f}，显示{'上升' if slope > 0 else '下降'}趋势",
-                    supporting_indicators=["Linear Regression"],
-                    time_horizon="short_term"
-                )
-                signals.append(signal)
+            signal = AnalysisSignal(
+                signal_type="trend_regression",
+                direction=direction,
+                strength=strength,
+                confidence=min(0.9, trend_strength * 20),
+                reasoning=f"近10日线性趋势斜率为 {slope:.4f}，显示{'上升' if slope > 0 else '下降'}趋势",
+                supporting_indicators=["Linear Regression"],
+                time_horizon="short_term"
+            )
+            signals.append(signal)
         
         return signals
     
-    async def _analyze_momentum(self, data: List[EnhancedPriceData]) -> List[AnalysisSignal]:
+    def _analyze_momentum(self, arrs: Dict[str, np.ndarray]) -> List[AnalysisSignal]:
         """动量分析"""
-        signals = []
-        
-        if len(data) < 14:
-            return signals
+        # 检查是否有AI特征中的动量数据（最近14个数据点），取最近5日平均动量
+        momentum_signals = arrs["momentum_1d"][-14:]
+        momentum_signals = momentum_signals[~np.isnan(momentum_signals)]
+        avg_momentum = np.mean(momentum_signals[-5:]) if len(momentum_signals) else math.nan
         
-        # 检查是否有AI特征中的动量数据
-        recent_data = data[-14:]
-        momentum_signals = []
+        # RSI取最近14个数据点中的最新值
+        rsi_values = arrs["rsi"][-14:]
+        rsi_values = rsi_values[~np.isnan(rsi_values)]
+        current_rsi = rsi_values[-1] if len(rsi_values) else math.nan
         
-        for dp in recent_data:
-            if dp.ai_features:
-                if dp.ai_features.momentum_1d is not None:
-                    momentum_signals.append(dp.ai_features.momentum_1d)
+        return self._momentum_signals(avg_momentum, current_rsi)
+    
+    def _momentum_signals(self, avg_momentum: float, current_rsi: float) -> List[AnalysisSignal]:
+        """根据平均动量与RSI生成动量信号（缺失值为NaN）"""
+        signals = []
         
-        if momentum_signals:
-            avg_momentum = np.mean(momentum_signals[-5:])  # 最近5日平均动量
-            
+        if not math.isnan(avg_momentum):
             if avg_momentum > 0.02:  # 2%以上的正动量
                 direction = SignalDirection.BULLISH
                 strength = SignalStrength.STRONG if avg_momentum > 0.05 else SignalStrength.MODERATE
@@ -338,14 +478,7 @@ class AIFinancialAnalyzer:
             signals.append(signal)
         
         # RSI动量分析
-        rsi_values = []
-        for dp in recent_data:
-            if dp.technical_indicators and dp.technical_indicators.rsi is not None:
-                rsi_values.append(dp.technical_indicators.rsi)
-        
-        if rsi_values:
-            current_rsi = rsi_values[-1]
-            
+        if not math.isnan(current_rsi):
             if current_rsi > 70:
                 direction = SignalDirection.BEARISH
                 strength = SignalStrength.MODERATE
@@ -376,21 +509,18 @@ class AIFinancialAnalyzer:
         
         return signals
     
-    async def _analyze_volatility(self, data: List[EnhancedPriceData]) -> List[AnalysisSignal]:
+    def _analyze_volatility(self, arrs: Dict[str, np.ndarray]) -> List[AnalysisSignal]:
         """波动率分析"""
-        signals = []
-        
-        if len(data) < 20:
-            return signals
-        
         # 计算历史波动率
-        prices = [d.close_value for d in data if d.close_value is not None]
-        if len(prices) < 20:
-            return signals
+        returns = arrs["log_returns"]
+        vol_20d = returns[-20:].std() * _ANNUALIZATION_FACTOR  # 年化波动率
+        vol_5d = returns[-5:].std() * _ANNUALIZATION_FACTOR if len(returns) >= 5 else vol_20d
         
-        returns = np.diff(np.log(prices))
-        vol_20d = np.std(returns[-20:]) * np.sqrt(252)  # 年化波动率
-        vol_5d = np.std(returns[-5:]) * np.sqrt(252) if len(returns) >= 5 else vol_20d
+        return self._volatility_signals(vol_5d, vol_20d)
+    
+    def _volatility_signals(self, vol_5d: float, vol_20d: float) -> List[AnalysisSignal]:
+        """根据短期/长期年化波动率生成波动率信号"""
+        signals = []
         
         # 波动率变化分析
         vol_ratio = vol_5d / vol_20d if vol_20d > 0 else 1.0
@@ -430,20 +560,28 @@ class AIFinancialAnalyzer:
         
         return signals
     
-    async def _analyze_patterns(self, data: List[EnhancedPriceData]) -> List[AnalysisSignal]:
+    def _analyze_patterns(self, arrs: Dict[str, np.ndarray]) -> List[AnalysisSignal]:
         """形态分析"""
-        signals = []
+        # 简单的形态识别（最近10个数据点，其中有缺失值时不做判断）
+        prices = arrs["close"][-10:]
+        if np.isnan(prices).any():
+            return []
         
-        if len(data) < 10:
-            return signals
+        double_bottom, double_top = self._kernels.detect_double_patterns(prices, 0.05)
         
-        # 简单的形态识别
-        prices = [d.close_value for d in data[-10:] if d.close_value is not None]
-        if len(prices) < 10:
-            return signals
+        # 突破形态：最近5日高点与之前5日高点（阻力位）
+        return self._pattern_signals(
+            double_bottom, double_top, prices[-5:].max(), prices[:-5].max()
+        )
+    
+    def _pattern_signals(
+        self, double_bottom: bool, double_top: bool, recent_high: float, resistance_level: float
+    ) -> List[AnalysisSignal]:
+        """根据形态检测结果生成形态信号"""
+        signals = []
         
         # 双底形态检测
-        if self._detect_double_bottom(prices):
+        if double_bottom:
             signal = AnalysisSignal(
                 signal_type="pattern_double_bottom",
                 direction=SignalDirection.BULLISH,
@@ -456,7 +594,7 @@ class AIFinancialAnalyzer:
             signals.append(signal)
         
         # 双顶形态检测
-        if self._detect_double_top(prices):
+        if double_top:
             signal = AnalysisSignal(
                 signal_type="pattern_double_top",
                 direction=SignalDirection.BEARISH,
@@ -470,9 +608,6 @@ class AIFinancialAnalyzer:
             signals.append(signal)
         
         # 突破形态
-        recent_high = max(prices[-5:])
-        resistance_level = max(prices[:-5])
-        
         if recent_high > resistance_level * 1.02:  # 突破2%以上
             signal = AnalysisSignal(
                 signal_type="pattern_breakout",
@@ -487,31 +622,14 @@ class AIFinancialAnalyzer:
         
         return signals
     
-    async def _analyze_risk(self, data: List[EnhancedPriceData]) -> Dict[str, Any]:
+    def _analyze_risk(self, arrs: Dict[str, np.ndarray]) -> Dict[str, Any]:
         """风险分析"""
         risk_metrics = {}
         
-        if len(data) < 20:
-            return risk_metrics
-        
-        prices = [d.close_value for d in data if d.close_value is not None]
-        if len(prices) < 20:
-            return risk_metrics
-        
-        # VaR计算（Value at Risk）
-        returns = np.diff(np.log(prices))
-        var_95 = np.percentile(returns, 5)  # 95% VaR
-        var_99 = np.percentile(returns, 1)  # 99% VaR
-        
-        # 最大回撤
-        cumulative = np.cumprod(1 + returns)
-        running_max = np.maximum.accumulate(cumulative)
-        drawdowns = (cumulative - running_max) / running_max
-        max_drawdown = np.min(drawdowns)
+        # VaR、最大回撤、收益均值与波动在一次遍历中完成
+        var_95, var_99, max_drawdown, mean_return, vol_return = self._kernels.risk_kernel(arrs["log_returns"])
         
         # 夏普比率（简化计算）
-        mean_return = np.mean(returns)
-        vol_return = np.std(returns)
         sharpe_ratio = mean_return / vol_return if vol_return > 0 else 0
         
         risk_metrics.update({
@@ -525,23 +643,19 @@ class AIFinancialAnalyzer:
         
         return risk_metrics
     
-    async def _detect_anomalies(self, data: List[EnhancedPriceData]) -> List[AnalysisSignal]:
+    def _detect_anomalies(self, arrs: Dict[str, np.ndarray]) -> List[AnalysisSignal]:
         """异常检测"""
         signals = []
         
-        if len(data) < 20:
-            return signals
-        
-        # 检查AI特征中的异常分数
-        anomaly_scores = []
-        for dp in data[-10:]:  # 最近10个数据点
-            if dp.ai_features and dp.ai_features.anomaly_score is not None:
-                anomaly_scores.append(dp.ai_features.anomaly_score)
-        
-        if anomaly_scores:
-            max_anomaly = max(anomaly_scores)
-            recent_anomaly = anomaly_scores[-1] if anomaly_scores else 0
-            
+        # 检查AI特征中的异常分数（最近10个数据点）
+        # 在倒序视图上扫描，取最后一个有效分数即可，不构造中间数组
+        recent_anomaly = None
+        for score in arrs["anomaly_score"][:-11:-1]:
+            if score == score:  # 跳过NaN
+                recent_anomaly = score
+                break
+
+        if recent_anomaly is not None:
             if recent_anomaly > 3.0:  # 3个标准差以上
                 signal = AnalysisSignal(
                     signal_type="anomaly_detection",
@@ -557,9 +671,10 @@ class AIFinancialAnalyzer:
         
         return signals
     
-    def _infer_market_context(self, data: List[EnhancedPriceData]) -> MarketContext:
+    def _infer_market_context(self, arrs: Dict[str, np.ndarray]) -> MarketContext:
         """推断市场环境"""
-        if len(data) < 20:
+        close = arrs["close"]
+        if len(close) < 20:
             return MarketContext(
                 market_regime="unknown",
                 volatility_level="normal",
@@ -569,13 +684,16 @@ class AIFinancialAnalyzer:
                 economic_cycle="unknown"
             )
         
-        # 分析价格数据推断市场环境
-        prices = [d.close_value for d in data[-20:] if d.close_value is not None]
-        returns = np.diff(np.log(prices)) if len(prices) > 1 else []
+        # 分析价格数据推断市场环境：最近20个数据点中的有效价格，
+        # 正是有效收盘价序列的末尾部分，对数收益率直接取共享数组的对应切片
+        valid = np.count_nonzero(~np.isnan(close[-20:]))
+        start = len(arrs["prices"]) - valid
+        prices = arrs["prices"][start:]
+        returns = arrs["log_returns"][start:]
         
         # 波动率水平
-        if returns:
-            vol = np.std(returns) * np.sqrt(252)
+        if len(returns):
+            vol = returns.std() * _ANNUALIZATION_FACTOR
             if vol > 0.4:
                 volatility_level = "extreme"
             elif vol > 0.3:
@@ -589,7 +707,7 @@ class AIFinancialAnalyzer:
         
         # 市场状态
         if len(prices) >= 10:
-            trend_slope = np.polyfit(range(len(prices)), prices, 1)[0]
+            trend_slope = self._kernels.linreg_slope(prices)
             trend_strength = abs(trend_slope) / np.mean(prices)
             
             if trend_strength > 0.02:
@@ -610,55 +728,12 @@ class AIFinancialAnalyzer:
             economic_cycle="unknown"  # 需要宏观数据
         )
     
-    def _detect_double_bottom(self, prices: List[float]) -> bool:
-        """检测双底形态"""
-        if len(prices) < 7:
-            return False
-        
-        # 简化的双底检测逻辑
-        min_indices = []
-        for i in range(1, len(prices) - 1):
-            if prices[i] < prices[i-1] and prices[i] < prices[i+1]:
-                min_indices.append(i)
-        
-        if len(min_indices) >= 2:
-            # 检查两个底部是否接近
-            last_two_mins = min_indices[-2:]
-            bottom1, bottom2 = prices[last_two_mins[0]], prices[last_two_mins[1]]
-            
-            if abs(bottom1 - bottom2) / min(bottom1, bottom2) < 0.05:  # 差异小于5%
-                return True
-        
-        return False
-    
-    def _detect_double_top(self, prices: List[float]) -> bool:
-        """检测双顶形态"""
-        if len(prices) < 7:
-            return False
-        
-        # 简化的双顶检测逻辑
-        max_indices = []
-        for i in range(1, len(prices) - 1):
-            if prices[i] > prices[i-1] and prices[i] > prices[i+1]:
-                max_indices.append(i)
-        
-        if len(max_indices) >= 2:
-            # 检查两个顶部是否接近
-            last_two_maxs = max_indices[-2:]
-            top1, top2 = prices[last_two_maxs[0]], prices[last_two_maxs[1]]
-            
-            if abs(top1 - top2) / max(top1, top2) < 0.05:  # 差异小于5%
-                return True
-        
-        return False
-    
-    def _calculate_key_metrics(self, data: List[EnhancedPriceData]) -> Dict[str, float]:
+    def _calculate_key_metrics(
+        self, arrs: Dict[str, np.ndarray], last: EnhancedPriceData
+    ) -> Dict[str, float]:
         """计算关键指标"""
-        if not data:
-            return {}
-        
-        prices = [d.close_value for d in data if d.close_value is not None]
-        if not prices:
+        prices = arrs["prices"]
+        if not len(prices):
             return {}
         
         metrics = {
@@ -668,64 +743,33 @@ class AIFinancialAnalyzer:
             "price_change_20d": (prices[-1] - prices[-21]) / prices[-21] if len(prices) >= 21 else 0,
         }
         
-        # 添加技术指标
-        if data[-1].technical_indicators:
-            ti = data[-1].technical_indicators
-            if ti.rsi is not None:
-                metrics["rsi"] = ti.rsi
-            if ti.sma_20 is not None:
-                metrics["sma_20"] = ti.sma_20
-            if ti.macd is not None:
-                metrics["macd"] = ti.macd
-        
-        # 添加AI特征
-        if data[-1].ai_features:
-            ai = data[-1].ai_features
-            if ai.volatility is not None:
-                metrics["volatility"] = ai.volatility
-            if ai.trend_strength is not None:
-                metrics["trend_strength"] = ai.trend_strength
+        # 添加技术指标和AI特征（仅保留非空值）
+        ti = last.technical_indicators
+        ai = last.ai_features
+        metrics.update({
+            key: value
+            for key, value in (
+                ("rsi", ti and ti.rsi),
+                ("sma_20", ti and ti.sma_20),
+                ("macd", ti and ti.macd),
+                ("volatility", ai and ai.volatility),
+                ("trend_strength", ai and ai.trend_strength),
+            )
+            if value is not None
+        })
         
         return metrics
     
     def _assess_risk_level(self, var_95: float, max_drawdown: float, volatility: float) -> str:
         """评估风险等级"""
-        risk_score = 0
-        
-        # VaR评分
-        if var_95 < -0.05:
-            risk_score += 3
-        elif var_95 < -0.03:
-            risk_score += 2
-        elif var_95 < -0.02:
-            risk_score += 1
-        
-        # 最大回撤评分
-        if max_drawdown < -0.20:
-            risk_score += 3
-        elif max_drawdown < -0.15:
-            risk_score += 2
-        elif max_drawdown < -0.10:
-            risk_score += 1
-        
-        # 波动率评分
-        if volatility > 0.40:
-            risk_score += 3
-        elif volatility > 0.30:
-            risk_score += 2
-        elif volatility > 0.20:
-            risk_score += 1
-        
-        if risk_score >= 7:
-            return "very_high"
-        elif risk_score >= 5:
-            return "high"
-        elif risk_score >= 3:
-            return "medium"
-        elif risk_score >= 1:
-            return "low"
-        else:
-            return "very_low"
+        # VaR与最大回撤越低分越高：低于 -5%/-3%/-2%（-20%/-15%/-10%）分别计3/2/1分；
+        # 波动率高于 20%/30%/40% 分别计1/2/3分
+        risk_score = (
+            3 - bisect_right(_VAR_BINS, var_95)
+            + 3 - bisect_right(_DRAWDOWN_BINS, max_drawdown)
+            + bisect_left(_VOLATILITY_BINS, volatility)
+        )
+        return _RISK_LEVEL_BY_SCORE[risk_score]
     
     def _generate_ai_summary(self, result: AIAnalysisResult) -> str:
         """生成AI摘要"""
@@ -735,25 +779,10 @@ class AIFinancialAnalyzer:
         if not dominant_signal:
             return f"{symbol} 的分析数据不足，无法生成明确的投资建议。"
         
-        direction_text = {
-            SignalDirection.BULLISH: "看涨",
-            SignalDirection.BEARISH: "看跌",
-            SignalDirection.NEUTRAL: "中性",
-            SignalDirection.MIXED: "分歧"
-        }
-        
-        strength_text = {
-            SignalStrength.VERY_STRONG: "非常强",
-            SignalStrength.STRONG: "强",
-            SignalStrength.MODERATE: "中等",
-            SignalStrength.WEAK: "弱",
-            SignalStrength.VERY_WEAK: "非常弱"
-        }
-        
         summary = f"""
 {symbol} 技术分析摘要：
 
-主导信号: {direction_text[dominant_signal.direction]}，强度{strength_text[dominant_signal.strength]}
+主导信号: {_DIRECTION_LABELS[dominant_signal.direction]}，强度{_STRENGTH_LABELS[dominant_signal.strength]}
 置信度: {dominant_signal.confidence:.1%}
 分析理由: {dominant_signal.reasoning}
 
@@ -807,49 +836,32 @@ class AIFinancialAnalyzer:
         
         return recommendations
     
-    def _assess_data_quality(self, data: List[EnhancedPriceData]) -> float:
+    def _assess_data_quality(self, arrs: Dict[str, np.ndarray]) -> float:
         """评估数据质量"""
-        if not data:
+        n = len(arrs["close"])
+        if not n:
             return 0.0
         
-        quality_scores = []
+        o, h, l, c, v = arrs["open"], arrs["high"], arrs["low"], arrs["close"], arrs["volume"]
+        # OHLC齐全（非缺失且非零）的记录；任一值为NaN时和也为NaN
+        has_ohlc = (o != 0) & (h != 0) & (l != 0) & (c != 0) & ~np.isnan(o + h + l + c)
+        total_ohlc = np.count_nonzero(has_ohlc)
         
         # 数据完整性
-        complete_records = sum(1 for d in data if all([
-            d.open_value, d.high_value, d.low_value, d.close_value, d.volume
-        ]))
-        completeness_score = complete_records / len(data)
-        quality_scores.append(completeness_score)
-        
-        # 时间连续性（简化检查）
-        timestamps = [d.timestamp for d in data]
-        if len(timestamps) > 1:
-            time_gaps = []
-            for i in range(1, len(timestamps)):
-                gap = (timestamps[i] - timestamps[i-1]).total_seconds() / 3600  # 小时
-                time_gaps.append(gap)
-            
-            # 如果时间间隔相对稳定，认为连续性较好
-            gap_std = np.std(time_gaps) if time_gaps else 0
-            continuity_score = max(0, 1 - gap_std / 24)  # 标准差超过24小时则扣分
-            quality_scores.append(continuity_score)
+        complete = np.count_nonzero(has_ohlc & (v != 0) & ~np.isnan(v))
+        quality_scores = [complete / n]
         
-        # 数据合理性（OHLC关系）
-        valid_ohlc = 0
-        total_ohlc = 0
-        
-        for d in data:
-            if all([d.open_value, d.high_value, d.low_value, d.close_value]):
-                total_ohlc += 1
-                if (d.low_value <= d.open_value <= d.high_value and 
-                    d.low_value <= d.close_value <= d.high_value):
-                    valid_ohlc += 1
+        # 时间连续性（简化检查）：时间间隔标准差超过24小时则扣分
+        if n > 1:
+            gap_std = np.std(np.diff(arrs["timestamps_ns"])) / _NS_PER_HOUR
+            quality_scores.append(max(0, 1 - gap_std / 24))
         
+        # 数据合理性（OHLC关系）
         if total_ohlc > 0:
-            validity_score = valid_ohlc / total_ohlc
-            quality_scores.append(validity_score)
+            valid_ohlc = np.count_nonzero(has_ohlc & (l <= o) & (o <= h) & (l <= c) & (c <= h))
+            quality_scores.append(valid_ohlc / total_ohlc)
         
-        return np.mean(quality_scores) if quality_scores else 0.5
+        return np.mean(quality_scores)
 
 
 # 创建全局分析器实例
@@ -1,54 +1,192 @@
 """Logging configuration for the Fetcher service."""
+import atexit
+import functools
+import json
 import logging
+import logging.handlers
+import queue
 import sys
 import structlog
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 from .settings import settings
 
+try:
+    import orjson
+except ImportError:  # orjson is an optional performance dependency
+    orjson = None
+
+def _orjson_dumps(event_dict: Dict[str, Any], **kwargs: Any) -> bytes:
+    """Serialize a log entry with orjson, falling back to the stdlib for what
+    orjson rejects (e.g. integers beyond 64 bits), so logging never raises."""
+    try:
+        return orjson.dumps(event_dict, option=orjson.OPT_NON_STR_KEYS, **kwargs)
+    except TypeError:
+        return json.dumps(event_dict, **kwargs).encode()
+
+
+# 日志队列在进程内只创建一次，重复调用 setup_logging 时已缓存的 logger 仍然有效；
+# 后台写日志的线程在 setup_logging 时启动
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class _BufferedStdoutHandler(logging.Handler):
+    """Write log lines to stdout from the listener thread.
+
+    Lines are collected and written out once the queue is drained (or 64 KiB
+    are pending), so bursts of log lines cost a single write syscall.
+    """
+
+    def __init__(self, log_queue: queue.SimpleQueue, limit: int = 65536) -> None:
+        super().__init__()
+        self._queue = log_queue
+        self._limit = limit
+        self._stream = sys.stdout.buffer
+        self._pending = bytearray()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            msg = record.msg
+            if isinstance(msg, bytes):
+                # BytesLogger 渲染好的行（已带换行符）
+                self._pending += msg
+            else:
+                self._pending += self.format(record).encode() + b"\n"
+            if len(self._pending) >= self._limit or self._queue.empty():
+                self.flush()
+        except Exception:
+            self.handleError(record)
+
+    def flush(self) -> None:
+        if self._pending:
+            self._stream.write(self._pending)
+            self._pending.clear()
+        self._stream.flush()
+
+
+class _QueueFile:
+    """File-like target for structlog's BytesLogger that hands lines to the queue."""
+
+    def __init__(self, log_queue: queue.SimpleQueue) -> None:
+        self._queue = log_queue
+
+    def write(self, data: bytes) -> None:
+        self._queue.put_nowait(logging.makeLogRecord({"msg": data}))
+
+    def flush(self) -> None:
+        pass
+
+
+def shutdown_logging() -> None:
+    """Stop the log writer thread after writing out everything still queued."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.flush()
+        _listener = None
+
+
+# 进程退出前把队列中剩余的日志写完
+atexit.register(shutdown_logging)
+
+
 def setup_logging() -> None:
     """Configure structured logging for the service."""
+    level = getattr(logging, settings.log_level.upper(), logging.INFO)
+    debug = settings.log_level.lower() == "debug"
 
-    # 先初始化标准 logging
-    logging.basicConfig(
-        format="%(message)s",
-        stream=sys.stdout,
-        level=getattr(logging, settings.log_level.upper(), logging.INFO),
-    )
+    # 先初始化标准 logging：请求路径上只入队，由后台线程负责写 stdout
+    global _listener
+    shutdown_logging()
+    root = logging.getLogger()
+    root.handlers[:] = [logging.handlers.QueueHandler(_log_queue)]
+    root.setLevel(level)
+    _listener = logging.handlers.QueueListener(_log_queue, _BufferedStdoutHandler(_log_queue))
+    _listener.start()
     
     # 抑制第三方库的冗余日志
     logging.getLogger("grpc").setLevel(logging.WARNING)
 
-    # 配置 structlog
-    structlog.configure(
-        processors=[
+    logger_factory = structlog.stdlib.LoggerFactory()
+
+    if debug:
+        # 开发模式：彩色控制台输出
+        processors = [
             structlog.contextvars.merge_contextvars,
             structlog.processors.add_log_level,
             structlog.processors.StackInfoRenderer(),
             structlog.processors.format_exc_info,
             structlog.dev.set_exc_info,
             structlog.processors.TimeStamper(fmt="iso"),
-            structlog.dev.ConsoleRenderer() if settings.log_level.lower() == "debug"
-            else structlog.processors.JSONRenderer(),
-        ],
-        wrapper_class=structlog.make_filtering_bound_logger(
-            getattr(logging, settings.log_level.upper(), logging.INFO)
-        ),
-        logger_factory=structlog.stdlib.LoggerFactory(),
+            structlog.dev.ConsoleRenderer(),
+        ]
+    else:
+        # 生产模式只保留必要的处理器：服务中没有绑定contextvars，也不使用stack_info；
+        # format_exc_info 在没有 exc_info 时只做一次字典查找
+        processors = [
+            structlog.processors.add_log_level,
+            structlog.processors.format_exc_info,
+            structlog.processors.TimeStamper(fmt="iso", utc=True),
+        ]
+        if orjson is not None:
+            # orjson 直接序列化为 bytes 并交给写日志线程，省去 str 编解码
+            processors.append(structlog.processors.JSONRenderer(serializer=_orjson_dumps))
+            logger_factory = structlog.BytesLoggerFactory(file=_QueueFile(_log_queue))
+        else:
+            processors.append(structlog.processors.JSONRenderer())
+
+    # 配置 structlog
+    structlog.configure(
+        processors=processors,
+        wrapper_class=structlog.make_filtering_bound_logger(level),
+        logger_factory=logger_factory,
         cache_logger_on_first_use=True,
     )
 
+@functools.lru_cache(maxsize=256)
 def get_logger(name: str) -> structlog.BoundLogger:
-    """Get a structured logger instance."""
+    """Get a structured logger instance (one shared instance per name)."""
     return structlog.get_logger(name)
 
 
+# gRPC 调用日志使用的 logger，导入时创建一次；在首次使用时才绑定配置，
+# 因此可以早于 setup_logging 创建
+_grpc_logger = get_logger("grpc")
+# setup_logging 把标准库的 "grpc" logger 限制为 WARNING；生产模式的 BytesLogger
+# 不经过标准库 logging，因此在 log_grpc_call 中显式检查该级别
+_grpc_stdlib_logger = logging.getLogger("grpc")
+
+
+class _LazyRequestSize:
+    """Request size that is only computed when the log entry is rendered."""
+
+    __slots__ = ("_data",)
+
+    def __init__(self, data: Dict[str, Any]) -> None:
+        self._data = data
+
+    def __structlog__(self) -> int:
+        # JSONRenderer 对无法直接序列化的对象调用此方法
+        return len(str(self._data))
+
+    def __repr__(self) -> str:
+        return str(self.__structlog__())
+
+
 def log_grpc_call(method: str, request_data: Dict[str, Any]) -> None:
     """Log gRPC method calls with structured data."""
-    logger = get_logger("grpc")
-    logger.info(
+    # 未开启请求日志或INFO级别被过滤时，直接返回，不构造任何日志参数
+    if (
+        not settings.monitoring.log_requests
+        or not _grpc_stdlib_logger.isEnabledFor(logging.INFO)
+        or not _grpc_logger.is_enabled_for(logging.INFO)
+    ):
+        return
+    _grpc_logger.info(
         "gRPC call received",
         method=method,
-        request_size=len(str(request_data)),
+        request_size=_LazyRequestSize(request_data),
         user_id=request_data.get("user_id"),
         workspace_id=request_data.get("workspace_id"),
     )
\ No newline at end of file
@@ -1,11 +1,18 @@
 """Configuration management for the Fetcher service."""
 
+from functools import lru_cache
 from typing import Optional
 
-from pydantic import Field
+from pydantic import AliasChoices, Field
 from pydantic_settings import BaseSettings
 from pathlib import Path
 
+
+def _env(name: str, legacy_prefix: str) -> AliasChoices:
+    """Read a field from ``NAME``, or from ``<legacy_prefix>NAME`` as it was read before."""
+    return AliasChoices(name, legacy_prefix + name)
+
+
 class DatabaseConfig(BaseSettings):
     """Database configuration."""
     
@@ -14,6 +21,7 @@ class DatabaseConfig(BaseSettings):
     max_connections: int = Field(default=20)
     
     class Config:
+        frozen = True
         env_prefix = "DB_"
 
 
@@ -26,6 +34,7 @@ class RedisConfig(BaseSettings):
     password: Optional[str] = Field(default=None)
     
     class Config:
+        frozen = True
         env_prefix = "REDIS_"
 
 
@@ -37,31 +46,32 @@ class KafkaConfig(BaseSettings):
     auto_offset_reset: str = Field(default="earliest")
     
     class Config:
+        frozen = True
         env_prefix = "KAFKA_"
 
 
 class FetchingConfig(BaseSettings):
     """Data fetching configuration."""
     
-    default_timeout: int = Field(default=30)
-    max_concurrent_fetches: int = Field(default=10)
-    cache_default_ttl: int = Field(default=3600)
-    max_file_size_mb: int = Field(default=100)
-    user_agent: str = Field(default="Mosia-Fetcher/1.0")
+    default_timeout: int = Field(default=30, validation_alias=_env("DEFAULT_TIMEOUT", "FETCHING_"))
+    max_concurrent_fetches: int = Field(default=10, validation_alias=_env("MAX_CONCURRENT_FETCHES", "FETCHING_"))
+    cache_default_ttl: int = Field(default=3600, validation_alias=_env("CACHE_DEFAULT_TTL", "FETCHING_"))
+    max_file_size_mb: int = Field(default=100, validation_alias=_env("MAX_FILE_SIZE_MB", "FETCHING_"))
+    user_agent: str = Field(default="Mosia-Fetcher/1.0", validation_alias=_env("USER_AGENT", "FETCHING_"))
     
     class Config:
-        env_prefix = "FETCHING_" or "DEFAULT_" or "MAX_" or "CACHE_" or "USER_"
+        frozen = True
 
 
 class ExternalAPIConfig(BaseSettings):
     """External API configuration."""
     
-    financial_api_key: Optional[str] = Field(default=None)
-    social_api_key: Optional[str] = Field(default=None)
-    news_api_key: Optional[str] = Field(default=None)
+    financial_api_key: Optional[str] = Field(default=None, validation_alias=_env("FINANCIAL_API_KEY", "FINANCIAL_"))
+    social_api_key: Optional[str] = Field(default=None, validation_alias=_env("SOCIAL_API_KEY", "FINANCIAL_"))
+    news_api_key: Optional[str] = Field(default=None, validation_alias=_env("NEWS_API_KEY", "FINANCIAL_"))
     
     class Config:
-        env_prefix = "FINANCIAL_" or "SOCIAL_" or "NEWS_"
+        frozen = True
 
 
 class RateLimitConfig(BaseSettings):
@@ -71,29 +81,30 @@ class RateLimitConfig(BaseSettings):
     burst: int = Field(default=10)
     
     class Config:
+        frozen = True
         env_prefix = "RATE_LIMIT_"
 
 
 class StorageConfig(BaseSettings):
     """File storage configuration."""
     
-    temp_storage_path: str = Field(default="/tmp/mosia_fetcher")
-    max_storage_size_gb: int = Field(default=10)
-    cleanup_interval_hours: int = Field(default=24)
+    temp_storage_path: str = Field(default="/tmp/mosia_fetcher", validation_alias=_env("TEMP_STORAGE_PATH", "TEMP_"))
+    max_storage_size_gb: int = Field(default=10, validation_alias=_env("MAX_STORAGE_SIZE_GB", "TEMP_"))
+    cleanup_interval_hours: int = Field(default=24, validation_alias=_env("CLEANUP_INTERVAL_HOURS", "TEMP_"))
     
     class Config:
-        env_prefix = "TEMP_" or "MAX_" or "CLEANUP_"
+        frozen = True
 
 
 class ProcessingConfig(BaseSettings):
     """Data processing configuration."""
     
-    batch_size: int = Field(default=100)
-    parallel_workers: int = Field(default=5)
-    processing_timeout: int = Field(default=300)
+    batch_size: int = Field(default=100, validation_alias=_env("BATCH_SIZE", "BATCH_"))
+    parallel_workers: int = Field(default=5, validation_alias=_env("PARALLEL_WORKERS", "BATCH_"))
+    processing_timeout: int = Field(default=300, validation_alias=_env("PROCESSING_TIMEOUT", "BATCH_"))
     
     class Config:
-        env_prefix = "BATCH_" or "PARALLEL_" or "PROCESSING_"
+        frozen = True
 
 
 class FeatureFlags(BaseSettings):
@@ -106,19 +117,20 @@ class FeatureFlags(BaseSettings):
     enable_webhooks: bool = Field(default=True)
     
     class Config:
+        frozen = True
         env_prefix = "ENABLE_"
 
 
 class MonitoringConfig(BaseSettings):
     """Monitoring configuration."""
     
-    metrics_enabled: bool = Field(default=True)
-    metrics_port: int = Field(default=8081)
-    health_check_interval: int = Field(default=30)
-    log_requests: bool = Field(default=True)
+    metrics_enabled: bool = Field(default=True, validation_alias=_env("METRICS_ENABLED", "METRICS_"))
+    metrics_port: int = Field(default=8081, validation_alias=_env("METRICS_PORT", "METRICS_"))
+    health_check_interval: int = Field(default=30, validation_alias=_env("HEALTH_CHECK_INTERVAL", "METRICS_"))
+    log_requests: bool = Field(default=True, validation_alias=_env("LOG_REQUESTS", "METRICS_"))
     
     class Config:
-        env_prefix = "METRICS_" or "HEALTH_" or "LOG_"
+        frozen = True
 
 
 class Settings(BaseSettings):
@@ -145,12 +157,14 @@ class Settings(BaseSettings):
     monitoring: MonitoringConfig = Field(default_factory=MonitoringConfig)
     
     class Config:
+        frozen = True
         env_file = ".env"
         env_file_encoding = "utf-8"
 
 
+@lru_cache(maxsize=None)
 def get_settings() -> Settings:
-    """Get application settings singleton."""
+    """Get application settings singleton (loaded from the environment once)."""
     return Settings()
 
 
@@ -0,0 +1,36 @@
+"""Shared HTTP connection pool for the API client and the web scraper."""
+
+from typing import Optional
+
+import aiohttp
+
+from fetcher.config.settings import settings
+
+
+_connector: Optional[aiohttp.TCPConnector] = None
+
+
+def shared_connector() -> aiohttp.TCPConnector:
+    """Return the process-wide connector, creating it on first use.
+
+    Sessions built on it must pass ``connector_owner=False`` so that closing
+    one session leaves the pooled keep-alive connections to the others.
+    Must be called from within the running event loop.
+    """
+    global _connector
+    if _connector is None or _connector.closed:
+        _connector = aiohttp.TCPConnector(
+            limit=settings.fetching.max_concurrent_fetches,
+            limit_per_host=20,
+            ttl_dns_cache=300,
+            keepalive_timeout=30,
+        )
+    return _connector
+
+
+async def close_shared_connector() -> None:
+    """Close the shared connector and all pooled connections."""
+    global _connector
+    if _connector is not None:
+        await _connector.close()
+        _connector = None
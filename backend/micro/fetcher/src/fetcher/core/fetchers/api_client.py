@@ -1,12 +1,63 @@
 """API client for external data fetching."""
 
 import asyncio
-from typing import Dict, List, Optional, Any
+import functools
+import json
+from collections import deque
+from time import monotonic
+from typing import AsyncIterator, Deque, Dict, Iterable, List, Optional, Tuple, Any
+from urllib.parse import urlsplit
 import aiohttp
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 from fetcher.config.settings import settings
 from fetcher.config.logging import get_logger
+from ._session import shared_connector
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:  # orjson is an optional performance dependency
+    _json_loads = json.loads
+
+try:
+    from aiolimiter import AsyncLimiter
+except ImportError:  # aiolimiter is an optional performance dependency
+    AsyncLimiter = None
+
+
+# 批量请求通常反复访问同一批URL，按URL缓存解析结果
+@functools.lru_cache(maxsize=4096)
+def _domain(url: str) -> str:
+    """Host part of ``url``, used as the rate-limiting key."""
+    return urlsplit(url).netloc or url.split('/')[0]
+
+
+class _SlidingWindowLimiter:
+    """At most ``max_rate`` acquisitions per ``time_period`` seconds.
+
+    Fallback with the same ``acquire()`` interface as aiolimiter's AsyncLimiter.
+    """
+
+    def __init__(self, max_rate: float, time_period: float = 60) -> None:
+        self._max_rate = int(max_rate)
+        self._time_period = time_period
+        self._timestamps: Deque[float] = deque()
+
+    async def acquire(self) -> None:
+        now = monotonic()
+        timestamps = self._timestamps
+        # 时间戳按顺序追加，只有队首会过期
+        while timestamps and now - timestamps[0] >= self._time_period:
+            timestamps.popleft()
+
+        start = now
+        if len(timestamps) >= self._max_rate:
+            start = timestamps[-self._max_rate] + self._time_period
+        # 先占用时间槽再等待，并发请求会依次排到后面的槽位，而不是同时醒来
+        timestamps.append(start)
+        if start > now:
+            await asyncio.sleep(start - now)
 
 
 class APIClient:
@@ -15,7 +66,7 @@ class APIClient:
     def __init__(self):
         self.logger = get_logger(__name__)
         self.session: Optional[aiohttp.ClientSession] = None
-        self.rate_limiter = {}
+        self.rate_limiter: Dict[str, Any] = {}
         
     async def __aenter__(self):
         """Async context manager entry."""
@@ -30,11 +81,12 @@ class APIClient:
         """Initialize the API client."""
         try:
             timeout = aiohttp.ClientTimeout(total=settings.fetching.default_timeout)
-            connector = aiohttp.TCPConnector(limit=settings.fetching.max_concurrent_fetches)
             
+            # 与网页抓取共用连接池，复用到同一主机的keep-alive连接
             self.session = aiohttp.ClientSession(
                 timeout=timeout,
-                connector=connector,
+                connector=shared_connector(),
+                connector_owner=False,
                 headers={
                     'User-Agent': settings.fetching.user_agent
                 }
@@ -69,11 +121,11 @@ class APIClient:
         if not self.session:
             raise RuntimeError("API client not initialized")
         
-        start_time = asyncio.get_event_loop().time()
+        start_time = monotonic()
         
         try:
             # Apply rate limiting
-            await self._apply_rate_limiting(url)
+            await self._apply_rate_limiting(_domain(url))
             
             # Prepare request
             request_headers = headers or {}
@@ -100,14 +152,19 @@ class APIClient:
                 # Get response data
                 content_type = response.headers.get('Content-Type', '')
                 
+                # 先读取原始字节：size_bytes 统一为响应体的字节数（文本响应不再按字符计数），之后只解码一次
+                raw = await response.read()
+                size_bytes = len(raw)
+                
                 if 'application/json' in content_type:
-                    data = await response.json()
+                    # 直接解析原始字节，避免先解码为str再交给标准库json；204等空响应体返回None
+                    data = _json_loads(raw) if raw else None
                 elif 'text/' in content_type:
-                    data = await response.text()
+                    data = await response.text()  # 复用已读取的响应体
                 else:
-                    data = await response.read()
+                    data = raw
                 
-                processing_time = asyncio.get_event_loop().time() - start_time
+                processing_time = monotonic() - start_time
                 
                 self.logger.info("API request completed",
                                url=url,
@@ -119,14 +176,15 @@ class APIClient:
                     "status": "success",
                     "status_code": response.status,
                     "data": data,
-                    "headers": dict(response.headers),
+                    # 只读的 CIMultiDictProxy，响应结束后依然可用；需要普通dict的调用方自行转换
+                    "headers": response.headers,
                     "content_type": content_type,
                     "processing_time": processing_time,
-                    "size_bytes": len(str(data)) if isinstance(data, str) else len(data) if isinstance(data, bytes) else 0
+                    "size_bytes": size_bytes
                 }
         
         except Exception as e:
-            processing_time = asyncio.get_event_loop().time() - start_time
+            processing_time = monotonic() - start_time
             self.logger.error("API request failed",
                             url=url,
                             method=method,
@@ -145,53 +203,47 @@ class APIClient:
         max_concurrent: int = None
     ) -> List[Dict[str, Any]]:
         """Fetch multiple URLs concurrently."""
+        results: List[Optional[Dict[str, Any]]] = [None] * len(requests)
+        async for index, result in self.fetch_stream(requests, max_concurrent):
+            results[index] = result
+        return results
+    
+    async def fetch_stream(
+        self,
+        requests: Iterable[Dict[str, Any]],
+        max_concurrent: int = None
+    ) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+        """Fetch URLs concurrently, yielding ``(index, result)`` as each one completes."""
         max_concurrent = max_concurrent or settings.fetching.max_concurrent_fetches
         
-        semaphore = asyncio.Semaphore(max_concurrent)
-        
-        async def fetch_with_semaphore(request_data):
-            async with semaphore:
-                return await self.fetch(**request_data)
-        
-        tasks = [fetch_with_semaphore(req) for req in requests]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        # Convert exceptions to error responses
-        processed_results = []
-        for result in results:
-            if isinstance(result, Exception):
-                processed_results.append({
-                    "status": "error",
-                    "error": str(result),
-                    "processing_time": 0
-                })
-            else:
-                processed_results.append(result)
-        
-        return processed_results
+        # 同时只存在 max_concurrent 个任务，完成一个再创建下一个，
+        # 请求再多也不会一次性创建全部协程，结果产出后即可被回收
+        pending: Dict[asyncio.Task, int] = {}
+        request_iter = enumerate(requests)
+        try:
+            while True:
+                for index, request_data in request_iter:
+                    pending[asyncio.create_task(self.fetch(**request_data))] = index
+                    if len(pending) >= max_concurrent:
+                        break
+                if not pending:
+                    return
+                
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    # fetch 自身已把请求错误转换为 status=error 的结果，
+                    # 这里抛出的只可能是程序错误，直接向上传播
+                    yield pending.pop(task), task.result()
+        finally:
+            for task in pending:
+                task.cancel()
     
-    async def _apply_rate_limiting(self, url: str) -> None:
+    async def _apply_rate_limiting(self, domain: str) -> None:
         """Apply rate limiting per domain."""
-        # Simple rate limiting implementation
-        # In production, you'd use a more sophisticated rate limiter
-        domain = url.split('://')[1].split('/')[0] if '://' in url else url.split('/')[0]
-        
-        current_time = asyncio.get_event_loop().time()
-        
-        if domain not in self.rate_limiter:
-            self.rate_limiter[domain] = []
-        
-        # Remove old requests
-        self.rate_limiter[domain] = [
-            timestamp for timestamp in self.rate_limiter[domain]
-            if current_time - timestamp < 60  # 1 minute window
-        ]
-        
-        # Check rate limit
-        if len(self.rate_limiter[domain]) >= settings.rate_limit.requests_per_minute:
-            sleep_time = 60 - (current_time - self.rate_limiter[domain][0])
-            if sleep_time > 0:
-                await asyncio.sleep(sleep_time)
-        
-        # Add current request
-        self.rate_limiter[domain].append(current_time)
\ No newline at end of file
+        limiter = self.rate_limiter.get(domain)
+        if limiter is None:
+            limiter_cls = AsyncLimiter or _SlidingWindowLimiter
+            limiter = self.rate_limiter[domain] = limiter_cls(
+                settings.rate_limit.requests_per_minute, 60
+            )
+        await limiter.acquire()
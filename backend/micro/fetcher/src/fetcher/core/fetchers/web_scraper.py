@@ -1,8 +1,14 @@
 """Web scraping engine for content extraction."""
 
 import asyncio
+import functools
+import io
+import json
+from time import monotonic
 from typing import Dict, List, Optional, Any
+from urllib.parse import urlsplit
 import aiohttp
+import soupsieve
 from bs4 import BeautifulSoup
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
@@ -12,6 +18,100 @@ from selenium.webdriver.support import expected_conditions as EC
 
 from fetcher.config.settings import settings
 from fetcher.config.logging import get_logger
+from ._session import shared_connector
+
+try:
+    from lxml import etree
+    # lxml 解析器基于C实现，比内置 html.parser 快数倍
+    _HTML_PARSER = "lxml"
+except ImportError:  # lxml is an optional performance dependency
+    from xml.etree import ElementTree as etree
+    _HTML_PARSER = "html.parser"
+
+try:
+    # selectolax 的 lexbor 后端为C实现，用于无需JavaScript的快速抓取路径
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # selectolax is an optional performance dependency
+    LexborHTMLParser = None
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:  # orjson is an optional performance dependency
+    _json_loads = json.loads
+
+try:
+    # Playwright 原生支持 asyncio，JavaScript 渲染无需把每一步丢进线程池
+    from playwright.async_api import async_playwright
+except ImportError:  # playwright is optional; Selenium is used without it
+    async_playwright = None
+
+_HEADING_TAGS = ("h1", "h2", "h3", "h4", "h5", "h6")
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_selector(selector: str) -> "soupsieve.SoupSieve":
+    """Compile a CSS selector once per distinct selector string."""
+    return soupsieve.compile(selector)
+
+
+def _sitemap_locs(raw: bytes) -> List[str]:
+    """Stream the ``<loc>`` values out of a sitemap (or sitemap index) document."""
+    urls = []
+    if _HTML_PARSER == "lxml":
+        events = etree.iterparse(io.BytesIO(raw), tag="{*}loc", resolve_entities=False)
+    else:
+        events = etree.iterparse(io.BytesIO(raw))
+    for _, elem in events:
+        if elem.tag != "loc" and not elem.tag.endswith("}loc"):
+            continue
+        if elem.text and elem.text.strip():
+            urls.append(elem.text.strip())
+        elem.clear()
+        if _HTML_PARSER == "lxml":
+            # 删除已处理的 <url> 条目，内存占用不随条目数增长
+            entry = elem.getparent()
+            while entry is not None and entry.getprevious() is not None:
+                del entry.getparent()[0]
+    return urls
+
+
+def _structured_data(elements) -> Dict[str, Any]:
+    """Bucket ``(tag, attrs, text)`` triples of <script>/<meta> elements into
+    JSON-LD, Open Graph and Twitter Card data. ``text`` is only called for
+    JSON-LD scripts."""
+    json_ld_data = None
+    og_data = {}
+    twitter_data = {}
+    for tag, attrs, text in elements:
+        if tag == "script":
+            if attrs.get("type") != "application/ld+json":
+                continue
+            if json_ld_data is None:
+                json_ld_data = []
+            content = text()
+            if content:
+                try:
+                    json_ld_data.append(_json_loads(content))
+                except ValueError:  # orjson.JSONDecodeError 也是 ValueError 的子类
+                    continue
+            continue
+        
+        prop = attrs.get("property") or ""
+        if prop.startswith("og:"):
+            og_data[prop] = attrs.get("content") or ""
+        name = attrs.get("name") or ""
+        if name.startswith("twitter:"):
+            twitter_data[name] = attrs.get("content") or ""
+    
+    structured_data = {}
+    if json_ld_data is not None:
+        structured_data["json_ld"] = json_ld_data
+    if og_data:
+        structured_data["open_graph"] = og_data
+    if twitter_data:
+        structured_data["twitter_card"] = twitter_data
+    return structured_data
 
 
 class WebScraper:
@@ -20,13 +120,26 @@ class WebScraper:
     def __init__(self):
         self.logger = get_logger(__name__)
         self.session: Optional[aiohttp.ClientSession] = None
+        # 长驻的无头Chrome池：按需创建，用完归还复用；每个使用中的driver占用一个名额，
+        # 只有空闲池为空时才新建，因此driver总数不超过名额数
+        self._driver_pool: asyncio.Queue = asyncio.Queue()
+        self._driver_slots = asyncio.Semaphore(max(1, settings.fetching.max_concurrent_fetches // 2))
+        # Playwright：整个抓取器共用一个浏览器，每次抓取新建独立的上下文
+        self._playwright = None
+        self._browser = None
+        self._browser_lock = asyncio.Lock()
+        # 浏览器启动失败（如未执行 playwright install）后不再尝试，JavaScript 渲染改用 Selenium
+        self._use_playwright = async_playwright is not None
         
     async def initialize(self) -> None:
         """Initialize the web scraper."""
         try:
             timeout = aiohttp.ClientTimeout(total=settings.fetching.default_timeout)
+            # 与API客户端共用连接池，复用到同一主机的keep-alive连接
             self.session = aiohttp.ClientSession(
                 timeout=timeout,
+                connector=shared_connector(),
+                connector_owner=False,
                 headers={'User-Agent': settings.fetching.user_agent}
             )
             
@@ -40,6 +153,18 @@ class WebScraper:
         """Close the web scraper."""
         if self.session:
             await self.session.close()
+        
+        loop = asyncio.get_running_loop()
+        while not self._driver_pool.empty():
+            driver = self._driver_pool.get_nowait()
+            await loop.run_in_executor(None, driver.quit)
+        
+        if self._browser is not None:
+            await self._browser.close()
+            await self._playwright.stop()
+            self._browser = self._playwright = None
+        
+        if self.session:
             self.logger.info("Web scraper closed")
     
     async def scrape_url(
@@ -50,15 +175,17 @@ class WebScraper:
         wait_for_element: Optional[str] = None
     ) -> Dict[str, Any]:
         """Scrape content from a URL."""
-        start_time = asyncio.get_event_loop().time()
+        start_time = monotonic()
         
         try:
-            if javascript:
+            if javascript and self._use_playwright:
+                result = await self._scrape_with_playwright(url, selectors, wait_for_element)
+            elif javascript:
                 result = await self._scrape_with_selenium(url, selectors, wait_for_element)
             else:
                 result = await self._scrape_with_aiohttp(url, selectors)
             
-            processing_time = asyncio.get_event_loop().time() - start_time
+            processing_time = monotonic() - start_time
             result["processing_time"] = processing_time
             
             self.logger.info("Web scraping completed",
@@ -94,36 +221,114 @@ class WebScraper:
                 )
             
             html_content = await response.text()
-            soup = BeautifulSoup(html_content, 'html.parser')
-            
-            # Extract content based on selectors
+        
+        if LexborHTMLParser is not None:
+            return self._parse_with_lexbor(url, html_content, selectors)
+        
+        soup = BeautifulSoup(html_content, _HTML_PARSER)
+        
+        # 一次遍历收集标题、链接和图片，默认提取与元数据统计共用
+        tags = self._collect_tags(soup)
+        
+        # Extract content based on selectors
+        if selectors:
+            extracted_data = self._extract_with_selectors(soup, selectors)
+        else:
+            # Default extraction
+            extracted_data = await self._extract_default_content(soup, tags)
+        
+        return {
+            "status": "success",
+            "url": url,
+            "data": extracted_data,
+            "metadata": {
+                "title": soup.title.string if soup.title else "",
+                "description": self._get_meta_content(soup, "description"),
+                "keywords": self._get_meta_content(soup, "keywords"),
+                "content_length": len(html_content),
+                "links_count": len(tags["a"]),
+                "images_count": len(tags["img"])
+            }
+        }
+    
+    def _parse_with_lexbor(
+        self,
+        url: str,
+        html_content: str,
+        selectors: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Any]:
+        """Parse a page with selectolax; same output shape as the BeautifulSoup path."""
+        tree = LexborHTMLParser(html_content)
+        
+        if selectors:
             extracted_data = {}
-            
-            if selectors:
-                for name, selector in selectors.items():
-                    elements = soup.select(selector)
-                    if elements:
-                        if len(elements) == 1:
-                            extracted_data[name] = elements[0].get_text(strip=True)
-                        else:
-                            extracted_data[name] = [el.get_text(strip=True) for el in elements]
-            else:
-                # Default extraction
-                extracted_data = await self._extract_default_content(soup)
-            
-            return {
-                "status": "success",
-                "url": url,
-                "data": extracted_data,
-                "metadata": {
-                    "title": soup.title.string if soup.title else "",
-                    "description": self._get_meta_content(soup, "description"),
-                    "keywords": self._get_meta_content(soup, "keywords"),
-                    "content_length": len(html_content),
-                    "links_count": len(soup.find_all('a')),
-                    "images_count": len(soup.find_all('img'))
-                }
+            for name, selector in selectors.items():
+                nodes = tree.css(selector)
+                if nodes:
+                    if len(nodes) == 1:
+                        extracted_data[name] = nodes[0].text(strip=True)
+                    else:
+                        extracted_data[name] = [node.text(strip=True) for node in nodes]
+        else:
+            extracted_data = self._extract_default_content_lexbor(tree)
+        
+        title = tree.css_first("title")
+        return {
+            "status": "success",
+            "url": url,
+            "data": extracted_data,
+            "metadata": {
+                "title": title.text() if title else "",
+                "description": self._get_meta_content_lexbor(tree, "description"),
+                "keywords": self._get_meta_content_lexbor(tree, "keywords"),
+                "content_length": len(html_content),
+                "links_count": len(tree.css("a")),
+                "images_count": len(tree.css("img"))
             }
+        }
+    
+    @staticmethod
+    def _extract_default_content_lexbor(tree: "LexborHTMLParser") -> Dict[str, Any]:
+        """selectolax version of _extract_default_content."""
+        extracted = {}
+        
+        # Extract main text content
+        main_content = tree.css_first("main") or tree.css_first("article") or tree.css_first("div.content")
+        if main_content is None:
+            # Fallback to body content
+            main_content = tree.body
+        if main_content is not None:
+            extracted["main_content"] = main_content.text(strip=True)
+        
+        # Extract headings（一次查询全部标题，再按级别分组保持原有顺序）
+        by_level = {name: [] for name in _HEADING_TAGS}
+        for heading in tree.css(",".join(_HEADING_TAGS)):
+            by_level[heading.tag].append(heading)
+        extracted["headings"] = [
+            {"level": i, "text": heading.text(strip=True)}
+            for i, name in enumerate(_HEADING_TAGS, 1)
+            for heading in by_level[name]
+        ]
+        
+        # Extract links
+        extracted["links"] = [
+            {"text": link.text(strip=True), "href": link.attributes["href"] or ""}
+            for link in tree.css("a[href]")[:20]  # Limit to first 20 links
+        ]
+        
+        # Extract images
+        extracted["images"] = [
+            {"alt": img.attributes.get("alt") or "", "src": img.attributes["src"] or ""}
+            for img in tree.css("img[src]")[:10]  # Limit to first 10 images
+        ]
+        
+        return extracted
+    
+    @staticmethod
+    def _get_meta_content_lexbor(tree: "LexborHTMLParser", name: str) -> str:
+        """selectolax version of _get_meta_content."""
+        meta = tree.css_first(f'meta[name="{name}"]') or tree.css_first(f'meta[property="og:{name}"]')
+        return (meta.attributes.get("content") or "") if meta else ""
     
     async def _scrape_with_selenium(
         self,
@@ -132,24 +337,10 @@ class WebScraper:
         wait_for_element: Optional[str] = None
     ) -> Dict[str, Any]:
         """Scrape using Selenium (supports JavaScript)."""
-        
-        # Configure Chrome options for headless mode
-        chrome_options = Options()
-        chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument(f"--user-agent={settings.fetching.user_agent}")
-        
-        driver = None
+        # Run in executor to avoid blocking
+        loop = asyncio.get_running_loop()
+        driver = await self._acquire_driver()
         try:
-            # Run in executor to avoid blocking
-            loop = asyncio.get_event_loop()
-            driver = await loop.run_in_executor(
-                None, 
-                lambda: webdriver.Chrome(options=chrome_options)
-            )
-            
             # Navigate to URL
             await loop.run_in_executor(None, driver.get, url)
             
@@ -161,43 +352,202 @@ class WebScraper:
                     lambda: wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, wait_for_element)))
                 )
             
-            # Get page source and parse
+            # Get page source
             page_source = await loop.run_in_executor(None, lambda: driver.page_source)
-            soup = BeautifulSoup(page_source, 'html.parser')
             
-            # Extract content
-            extracted_data = {}
-            if selectors:
-                for name, selector in selectors.items():
-                    elements = soup.select(selector)
-                    if elements:
-                        if len(elements) == 1:
-                            extracted_data[name] = elements[0].get_text(strip=True)
-                        else:
-                            extracted_data[name] = [el.get_text(strip=True) for el in elements]
-            else:
-                extracted_data = await self._extract_default_content(soup)
+        finally:
+            await self._release_driver(driver)
+        
+        return await self._parse_rendered_page(url, page_source, selectors)
+    
+    async def _scrape_with_playwright(
+        self,
+        url: str,
+        selectors: Optional[Dict[str, str]] = None,
+        wait_for_element: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Scrape using Playwright (supports JavaScript, native asyncio)."""
+        browser = await self._get_browser()
+        if browser is None:
+            return await self._scrape_with_selenium(url, selectors, wait_for_element)
+        # 每次抓取使用独立上下文，cookie/缓存互不影响
+        context = await browser.new_context(user_agent=settings.fetching.user_agent)
+        try:
+            page = await context.new_page()
+            await page.goto(url)
             
-            return {
-                "status": "success",
-                "url": url,
-                "data": extracted_data,
-                "metadata": {
-                    "title": soup.title.string if soup.title else "",
-                    "description": self._get_meta_content(soup, "description"),
-                    "keywords": self._get_meta_content(soup, "keywords"),
-                    "content_length": len(page_source),
-                    "javascript_enabled": True
-                }
-            }
+            # Wait for specific element if specified
+            if wait_for_element:
+                await page.wait_for_selector(wait_for_element, timeout=10000)
             
+            page_source = await page.content()
         finally:
-            if driver:
+            await context.close()
+        
+        return await self._parse_rendered_page(url, page_source, selectors)
+    
+    async def _get_browser(self):
+        """Launch the shared Playwright browser on first use (or after it disconnected).
+
+        Returns ``None`` and disables Playwright if the browser cannot be launched.
+        """
+        async with self._browser_lock:
+            if not self._use_playwright:
+                return None
+            if self._browser is None or not self._browser.is_connected():
+                try:
+                    if self._playwright is None:
+                        self._playwright = await async_playwright().start()
+                    self._browser = await self._playwright.chromium.launch(
+                        headless=True,
+                        args=["--no-sandbox", "--disable-dev-shm-usage", "--disable-gpu"],
+                    )
+                except Exception as e:
+                    self.logger.warning("Playwright browser launch failed, falling back to Selenium",
+                                        error=str(e))
+                    self._use_playwright = False
+                    self._browser = None
+                    if self._playwright is not None:
+                        try:
+                            await self._playwright.stop()
+                        except Exception:
+                            pass
+                        self._playwright = None
+                    return None
+            return self._browser
+    
+    async def _parse_rendered_page(
+        self,
+        url: str,
+        page_source: str,
+        selectors: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Any]:
+        """Extract content from the HTML of a JavaScript-rendered page."""
+        soup = BeautifulSoup(page_source, _HTML_PARSER)
+        
+        # Extract content
+        if selectors:
+            extracted_data = self._extract_with_selectors(soup, selectors)
+        else:
+            extracted_data = await self._extract_default_content(soup)
+        
+        return {
+            "status": "success",
+            "url": url,
+            "data": extracted_data,
+            "metadata": {
+                "title": soup.title.string if soup.title else "",
+                "description": self._get_meta_content(soup, "description"),
+                "keywords": self._get_meta_content(soup, "keywords"),
+                "content_length": len(page_source),
+                "javascript_enabled": True
+            }
+        }
+    
+    @staticmethod
+    def _create_driver() -> webdriver.Chrome:
+        """Start a headless Chrome (blocking; run in an executor)."""
+        # Configure Chrome options for headless mode
+        chrome_options = Options()
+        chrome_options.add_argument("--headless")
+        chrome_options.add_argument("--no-sandbox")
+        chrome_options.add_argument("--disable-dev-shm-usage")
+        chrome_options.add_argument("--disable-gpu")
+        chrome_options.add_argument(f"--user-agent={settings.fetching.user_agent}")
+        return webdriver.Chrome(options=chrome_options)
+    
+    async def _acquire_driver(self) -> webdriver.Chrome:
+        """Take an idle driver from the pool, starting a new one if none is idle.
+
+        Waits while all driver slots are in use; the slot is given back by ``_release_driver``.
+        """
+        await self._driver_slots.acquire()
+        try:
+            try:
+                return self._driver_pool.get_nowait()
+            except asyncio.QueueEmpty:
+                pass
+            
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(None, self._create_driver)
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # 执行器线程中的Chrome仍在启动，启动完成后直接退出
+                future.add_done_callback(self._quit_started_driver)
+                raise
+        except BaseException:
+            # 包括取消在内的任何失败都要归还名额，否则等待中的抓取永远无法继续
+            self._driver_slots.release()
+            raise
+    
+    @staticmethod
+    def _quit_started_driver(future: asyncio.Future) -> None:
+        """Quit a driver whose start-up finished after the requesting scrape was cancelled."""
+        if not future.cancelled() and future.exception() is None:
+            asyncio.get_running_loop().run_in_executor(None, future.result().quit)
+    
+    async def _release_driver(self, driver: webdriver.Chrome) -> None:
+        """Reset a driver and return it to the pool; drivers that fail to reset are quit."""
+        loop = asyncio.get_running_loop()
+        
+        def reset() -> None:
+            # delete_all_cookies 只清当前域名的cookie；用CDP清掉所有cookie，
+            # 并清除当前页面源的localStorage/sessionStorage/IndexedDB/缓存等存储，避免带到下一次抓取
+            parts = urlsplit(driver.current_url)
+            if parts.scheme in ("http", "https"):
+                driver.execute_cdp_cmd("Storage.clearDataForOrigin", {
+                    "origin": f"{parts.scheme}://{parts.netloc}",
+                    "storageTypes": "all",
+                })
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            driver.get("about:blank")
+        
+        try:
+            try:
+                await loop.run_in_executor(None, reset)
+            except asyncio.CancelledError:
+                # 重置途中被取消：不再等待，浏览器在后台退出
+                loop.run_in_executor(None, driver.quit)
+                raise
+            except Exception as e:
+                self.logger.warning("Discarding selenium driver", error=str(e))
                 await loop.run_in_executor(None, driver.quit)
+                return
+            
+            self._driver_pool.put_nowait(driver)
+        finally:
+            # 丢弃的driver同样归还名额，等待者会新建一个替代
+            self._driver_slots.release()
+    
+    @staticmethod
+    def _extract_with_selectors(soup: BeautifulSoup, selectors: Dict[str, str]) -> Dict[str, Any]:
+        """Extract text for each named CSS selector."""
+        extracted_data = {}
+        for name, selector in selectors.items():
+            elements = _compile_selector(selector).select(soup)
+            if elements:
+                if len(elements) == 1:
+                    extracted_data[name] = elements[0].get_text(strip=True)
+                else:
+                    extracted_data[name] = [el.get_text(strip=True) for el in elements]
+        return extracted_data
     
-    async def _extract_default_content(self, soup: BeautifulSoup) -> Dict[str, Any]:
+    @staticmethod
+    def _collect_tags(soup: BeautifulSoup) -> Dict[str, list]:
+        """Bucket heading, link and image tags (in document order) in one tree walk."""
+        tags = {name: [] for name in (*_HEADING_TAGS, "a", "img")}
+        for tag in soup.find_all(tags.keys()):
+            tags[tag.name].append(tag)
+        return tags
+    
+    async def _extract_default_content(
+        self, soup: BeautifulSoup, tags: Optional[Dict[str, list]] = None
+    ) -> Dict[str, Any]:
         """Extract default content when no selectors are provided."""
         extracted = {}
+        if tags is None:
+            tags = self._collect_tags(soup)
         
         # Extract main text content
         main_content = soup.find('main') or soup.find('article') or soup.find('div', class_='content')
@@ -211,8 +561,8 @@ class WebScraper:
         
         # Extract headings
         headings = []
-        for i in range(1, 7):
-            for heading in soup.find_all(f'h{i}'):
+        for i, name in enumerate(_HEADING_TAGS, 1):
+            for heading in tags[name]:
                 headings.append({
                     "level": i,
                     "text": heading.get_text(strip=True)
@@ -221,21 +571,29 @@ class WebScraper:
         
         # Extract links
         links = []
-        for link in soup.find_all('a', href=True):
+        for link in tags["a"]:
+            if not link.has_attr('href'):
+                continue
             links.append({
                 "text": link.get_text(strip=True),
                 "href": link['href']
             })
-        extracted["links"] = links[:20]  # Limit to first 20 links
+            if len(links) == 20:  # Limit to first 20 links
+                break
+        extracted["links"] = links
         
         # Extract images
         images = []
-        for img in soup.find_all('img', src=True):
+        for img in tags["img"]:
+            if not img.has_attr('src'):
+                continue
             images.append({
                 "alt": img.get('alt', ''),
                 "src": img['src']
             })
-        extracted["images"] = images[:10]  # Limit to first 10 images
+            if len(images) == 10:  # Limit to first 10 images
+                break
+        extracted["images"] = images
         
         return extracted
     
@@ -247,62 +605,48 @@ class WebScraper:
     async def scrape_sitemap(self, sitemap_url: str) -> List[str]:
         """Extract URLs from a sitemap."""
         try:
-            result = await self.fetch(sitemap_url)
-            if result["status"] != "success":
-                return []
-            
-            soup = BeautifulSoup(result["data"], 'xml')
-            urls = []
-            
-            # Extract URLs from sitemap
-            for loc in soup.find_all('loc'):
-                if loc.string:
-                    urls.append(loc.string.strip())
-            
-            return urls
+            # 直接解析原始字节，不经过文本解码
+            raw = await self._fetch_bytes(sitemap_url)
+            return _sitemap_locs(raw)
             
         except Exception as e:
             self.logger.error("Sitemap parsing failed", sitemap_url=sitemap_url, error=str(e))
             return []
     
+    async def _fetch_bytes(self, url: str) -> bytes:
+        """GET ``url`` with the scraper's session and return the raw body."""
+        if not self.session:
+            raise RuntimeError("Web scraper not initialized")
+        
+        async with self.session.get(url) as response:
+            if response.status >= 400:
+                raise aiohttp.ClientResponseError(
+                    request_info=response.request_info,
+                    history=response.history,
+                    status=response.status
+                )
+            return await response.read()
+    
     async def extract_structured_data(self, url: str) -> Dict[str, Any]:
         """Extract structured data (JSON-LD, microdata) from a page."""
         try:
-            result = await self.fetch(url)
-            if result["status"] != "success":
-                return {}
+            raw = await self._fetch_bytes(url)
             
-            soup = BeautifulSoup(result["data"], 'html.parser')
-            structured_data = {}
-            
-            # Extract JSON-LD
-            json_ld_scripts = soup.find_all('script', type='application/ld+json')
-            if json_ld_scripts:
-                import json
-                json_ld_data = []
-                for script in json_ld_scripts:
-                    try:
-                        data = json.loads(script.string)
-                        json_ld_data.append(data)
-                    except json.JSONDecodeError:
-                        continue
-                structured_data["json_ld"] = json_ld_data
-            
-            # Extract Open Graph data
-            og_data = {}
-            for meta in soup.find_all('meta', property=lambda x: x and x.startswith('og:')):
-                og_data[meta['property']] = meta.get('content', '')
-            if og_data:
-                structured_data["open_graph"] = og_data
-            
-            # Extract Twitter Card data
-            twitter_data = {}
-            for meta in soup.find_all('meta', attrs={'name': lambda x: x and x.startswith('twitter:')}):
-                twitter_data[meta['name']] = meta.get('content', '')
-            if twitter_data:
-                structured_data["twitter_card"] = twitter_data
-            
-            return structured_data
+            # 只解析一次，单次遍历 <script>/<meta> 元素完成全部提取
+            if LexborHTMLParser is not None:
+                tree = LexborHTMLParser(raw)
+                elements = (
+                    (node.tag, node.attributes, node.text)
+                    for node in tree.css('script[type="application/ld+json"], meta')
+                )
+            else:
+                soup = BeautifulSoup(raw, _HTML_PARSER)
+                # node.string 是 str 的子类 Script，orjson 只接受精确的 str
+                elements = (
+                    (node.name, node.attrs, lambda node=node: str(node.string or ""))
+                    for node in soup.find_all(['script', 'meta'])
+                )
+            return _structured_data(elements)
             
         except Exception as e:
             self.logger.error("Structured data extraction failed", url=url, error=str(e))
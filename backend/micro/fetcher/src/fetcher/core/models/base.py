@@ -3,11 +3,26 @@ Base Data Models
 标准化数据模型基类，适配AI分析需求
 """
 
-from typing import Any, Dict, List, Optional, Union
-from dataclasses import dataclass, field
-from datetime import datetime, timezone
+from typing import (
+    TYPE_CHECKING, Any, Callable, Dict, List, Mapping, Optional, Sequence, Union,
+    get_args, get_origin
+)
+from collections import deque
+from dataclasses import dataclass, field, fields, is_dataclass
+from datetime import datetime, timedelta, timezone
 from enum import Enum
 import json
+import operator
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # orjson is an optional performance dependency
+    orjson = None
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 class TimeseriesFrequency(Enum):
@@ -40,7 +55,90 @@ class CurrencyCode(Enum):
     CHF = "CHF"
 
 
-@dataclass
+def _json_default(value: Any) -> Any:
+    """to_json 中无法直接序列化的值（嵌套的dataclass、共享的只读映射等）"""
+    if isinstance(value, Mapping):
+        return dict(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if is_dataclass(value):
+        return {f.name: getattr(value, f.name) for f in fields(value)}
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _to_dict_value(value: Any) -> Any:
+    """to_dict 中单个字段值的转换"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if hasattr(value, 'to_dict'):
+        return value.to_dict()
+    return value
+
+
+def _is_plain_type(tp: Any) -> bool:
+    """字段类型为标量、dict、list（或其 Optional）时，值无需转换"""
+    origin = get_origin(tp)
+    if origin is Union:
+        return all(arg is type(None) or _is_plain_type(arg) for arg in get_args(tp))
+    if origin in (dict, list):
+        return True
+    return tp in (str, int, float, bool)
+
+
+# 每个模型类生成一次的 to_dict 实现
+_TO_DICT_FUNCS: Dict[type, Callable[[Any], Dict[str, Any]]] = {}
+
+
+def _build_to_dict(cls: type) -> Callable[[Any], Dict[str, Any]]:
+    """为模型类生成 to_dict：字段列表展开为字典字面量，只有类型可能需要
+    转换的字段（datetime、枚举、嵌套模型等）才调用 _to_dict_value"""
+    items = []
+    for f in fields(cls):
+        if _is_plain_type(f.type):
+            items.append(f"        {f.name!r}: self.{f.name},")
+        else:
+            items.append(f"        {f.name!r}: _to_dict_value(self.{f.name}),")
+    source = "def to_dict(self):\n    return {\n" + "\n".join(items) + "\n    }\n"
+    namespace: Dict[str, Any] = {}
+    exec(source, {"_to_dict_value": _to_dict_value}, namespace)
+    return namespace["to_dict"]
+
+
+class _SharedMap(dict):
+    """所有实例共享的只读dict，首次写入时才复制为实例自己的dict（写时复制）
+    
+    与 MappingProxyType 不同，可以被 pickle、deepcopy 和 dataclasses.asdict 处理。
+    """
+    __slots__ = ()
+    
+    def _readonly(self, *args: Any, **kwargs: Any) -> None:
+        raise TypeError("shared default mapping is read-only")
+    
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    update = pop = popitem = clear = setdefault = _readonly
+    
+    def __reduce__(self):
+        # 默认的 dict 子类序列化会逐项调用 __setitem__
+        return (_SharedMap, (dict(self),))
+    
+    def __copy__(self) -> "_SharedMap":
+        return self
+    
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "_SharedMap":
+        # 内容只读且值均为str，副本之间共享同一对象即可
+        return self
+
+
+_EMPTY_MAP: Mapping[str, str] = _SharedMap()
+
+
+@dataclass(slots=True)
 class MultiLanguageText:
     """多语言文本"""
     zh_cn: Optional[str] = None
@@ -64,11 +162,11 @@ class MultiLanguageText:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class AIMetadata:
     """AI增强元数据"""
-    semantic_tags: Dict[str, str] = field(default_factory=dict)
-    field_descriptions: Dict[str, str] = field(default_factory=dict)
+    semantic_tags: Mapping[str, str] = field(default_factory=lambda: _EMPTY_MAP)
+    field_descriptions: Mapping[str, str] = field(default_factory=lambda: _EMPTY_MAP)
     analysis_hints: Dict[str, str] = field(default_factory=dict)
     related_symbols: List[str] = field(default_factory=list)
     keywords: List[str] = field(default_factory=list)
@@ -77,12 +175,36 @@ class AIMetadata:
     
     def add_semantic_tag(self, key: str, value: str) -> None:
         """添加语义标签"""
+        if type(self.semantic_tags) is _SharedMap:
+            self.semantic_tags = dict(self.semantic_tags)
         self.semantic_tags[key] = value
     
     def add_field_description(self, field: str, description: str) -> None:
         """添加字段描述"""
+        if type(self.field_descriptions) is _SharedMap:
+            self.field_descriptions = dict(self.field_descriptions)
         self.field_descriptions[field] = description
     
+    def use_shared_defaults(
+        self,
+        field_descriptions: Optional[Mapping[str, str]] = None,
+        semantic_tags: Optional[Mapping[str, str]] = None
+    ) -> None:
+        """使用模型类共享的字段描述和语义标签
+        
+        共享映射必须包含父类的全部默认项；实例已拥有的dict则在原地合并。
+        """
+        if field_descriptions is not None:
+            if type(self.field_descriptions) is _SharedMap:
+                self.field_descriptions = field_descriptions
+            else:
+                self.field_descriptions.update(field_descriptions)
+        if semantic_tags is not None:
+            if type(self.semantic_tags) is _SharedMap:
+                self.semantic_tags = semantic_tags
+            else:
+                self.semantic_tags.update(semantic_tags)
+    
     def add_ai_feature(self, feature: str, value: float) -> None:
         """添加AI特征"""
         self.ai_features[feature] = value
@@ -91,7 +213,7 @@ class AIMetadata:
         pass
 
 
-@dataclass
+@dataclass(slots=True)
 class BaseDataModel:
     """基础数据模型"""
     timestamp: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
@@ -111,21 +233,20 @@ class BaseDataModel:
     
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典，便于AI处理"""
-        result = {}
-        for key, value in self.__dict__.items():
-            if isinstance(value, datetime):
-                result[key] = value.isoformat()
-            elif isinstance(value, Enum):
-                result[key] = value.value
-            elif hasattr(value, 'to_dict'):
-                result[key] = value.to_dict()
-            else:
-                result[key] = value
-        return result
+        to_dict = _TO_DICT_FUNCS.get(type(self))
+        if to_dict is None:
+            to_dict = _TO_DICT_FUNCS[type(self)] = _build_to_dict(type(self))
+        return to_dict(self)
     
     def to_json(self) -> str:
         """转换为JSON字符串"""
-        return json.dumps(self.to_dict(), ensure_ascii=False, indent=2)
+        if orjson is not None:
+            return orjson.dumps(
+                self.to_dict(),
+                default=_json_default,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+            ).decode()
+        return json.dumps(self.to_dict(), ensure_ascii=False, indent=2, default=_json_default)
     
     def add_ai_context(self, context: str) -> None:
         """添加AI上下文"""
@@ -136,7 +257,44 @@ class BaseDataModel:
         return self.ai_metadata.field_descriptions.get(field)
 
 
-@dataclass
+# 时间序列和价格模型的默认字段描述与语义标签，按类（及币种）只构建一次
+_TIMESERIES_FIELD_DESCRIPTIONS: Mapping[str, str] = _SharedMap({
+    "open_value": "Opening price/value for the period",
+    "high_value": "Highest price/value for the period",
+    "low_value": "Lowest price/value for the period",
+    "close_value": "Closing price/value for the period",
+    "volume": "Trading volume for the period",
+})
+_TIMESERIES_SEMANTIC_TAGS: Mapping[str, str] = _SharedMap({
+    "data_type": "timeseries",
+    "category": "financial",
+})
+_PRICE_FIELD_DESCRIPTIONS: Mapping[str, str] = _SharedMap({
+    **_TIMESERIES_FIELD_DESCRIPTIONS,
+    "adjusted_close": "Price adjusted for dividends and splits",
+    "change": "Absolute price change from open to close",
+    "change_percent": "Percentage price change from open to close",
+})
+_PRICE_SEMANTIC_TAGS: Dict[CurrencyCode, Mapping[str, str]] = {
+    currency: _SharedMap({
+        **_TIMESERIES_SEMANTIC_TAGS,
+        "value_type": "price",
+        "currency": currency.value,
+    })
+    for currency in CurrencyCode
+}
+_ENHANCED_SEMANTIC_TAGS: Dict[CurrencyCode, Mapping[str, str]] = {
+    currency: _SharedMap({
+        **tags,
+        "enriched": "true",
+        "has_technicals": "true",
+        "has_ai_features": "true",
+    })
+    for currency, tags in _PRICE_SEMANTIC_TAGS.items()
+}
+
+
+@dataclass(slots=True)
 class TimeseriesDataPoint(BaseDataModel):
     """时间序列数据点基类"""
     open_value: Optional[float] = None
@@ -147,21 +305,16 @@ class TimeseriesDataPoint(BaseDataModel):
     frequency: Optional[TimeseriesFrequency] = None
     
     def __post_init__(self):
-        super().__post_init__()
-        
-        # 添加字段描述
-        self.ai_metadata.add_field_description("open_value", "Opening price/value for the period")
-        self.ai_metadata.add_field_description("high_value", "Highest price/value for the period")
-        self.ai_metadata.add_field_description("low_value", "Lowest price/value for the period")
-        self.ai_metadata.add_field_description("close_value", "Closing price/value for the period")
-        self.ai_metadata.add_field_description("volume", "Trading volume for the period")
+        # slots=True 的 dataclass 会重新创建类，无参数的 super() 在其中不可用
+        super(TimeseriesDataPoint, self).__post_init__()
         
-        # 添加语义标签
-        self.ai_metadata.add_semantic_tag("data_type", "timeseries")
-        self.ai_metadata.add_semantic_tag("category", "financial")
+        # 字段描述和语义标签
+        self.ai_metadata.use_shared_defaults(
+            _TIMESERIES_FIELD_DESCRIPTIONS, _TIMESERIES_SEMANTIC_TAGS
+        )
 
 
-@dataclass
+@dataclass(slots=True)
 class PriceData(TimeseriesDataPoint):
     """价格数据模型"""
     currency: CurrencyCode = CurrencyCode.USD
@@ -172,7 +325,7 @@ class PriceData(TimeseriesDataPoint):
     change_percent: Optional[float] = None
     
     def __post_init__(self):
-        super().__post_init__()
+        super(PriceData, self).__post_init__()
         
         # 计算涨跌额和涨跌幅
         if self.close_value and self.open_value:
@@ -180,17 +333,13 @@ class PriceData(TimeseriesDataPoint):
             if self.open_value != 0:
                 self.change_percent = (self.change / self.open_value) * 100
         
-        # 添加价格相关的字段描述
-        self.ai_metadata.add_field_description("adjusted_close", "Price adjusted for dividends and splits")
-        self.ai_metadata.add_field_description("change", "Absolute price change from open to close")
-        self.ai_metadata.add_field_description("change_percent", "Percentage price change from open to close")
-        
-        # 语义标签
-        self.ai_metadata.add_semantic_tag("value_type", "price")
-        self.ai_metadata.add_semantic_tag("currency", self.currency.value)
+        # 价格相关的字段描述和语义标签
+        self.ai_metadata.use_shared_defaults(
+            _PRICE_FIELD_DESCRIPTIONS, _PRICE_SEMANTIC_TAGS[self.currency]
+        )
 
 
-@dataclass
+@dataclass(slots=True)
 class TechnicalIndicators:
     """技术指标数据"""
     # 趋势指标
@@ -222,21 +371,50 @@ class TechnicalIndicators:
     
     def to_dict(self) -> Dict[str, Optional[float]]:
         """转换为字典"""
-        return {k: v for k, v in self.__dict__.items() if v is not None}
+        return {
+            f.name: value for f in fields(self)
+            if (value := getattr(self, f.name)) is not None
+        }
     
     def get_trend_score(self) -> Optional[float]:
         """计算趋势强度分数"""
-        if not all([self.sma_20, self.sma_50, self.ema_12, self.ema_26]):
+        if not (self.sma_20 and self.sma_50 and self.ema_12 and self.ema_26):
             return None
         
         # 简单的趋势强度计算
-        short_trend = 1 if self.ema_12 > self.ema_26 else -1
-        medium_trend = 1 if self.sma_20 > self.sma_50 else -1
-        
-        return (short_trend + medium_trend) / 2
+        return 0.5 * ((1 if self.ema_12 > self.ema_26 else -1)
+                      + (1 if self.sma_20 > self.sma_50 else -1))
+    
+    @staticmethod
+    def batch_trend_score(
+        ema_12: np.ndarray,
+        ema_26: np.ndarray,
+        sma_20: np.ndarray,
+        sma_50: np.ndarray
+    ) -> np.ndarray:
+        """按列批量计算趋势强度分数，规则与 get_trend_score 相同；
+        任一输入缺失（NaN）或为0的行结果为 NaN"""
+        ema_12, ema_26, sma_20, sma_50 = (
+            np.asarray(col, dtype=np.float64) for col in (ema_12, ema_26, sma_20, sma_50)
+        )
+        score = 0.5 * (np.where(ema_12 > ema_26, 1.0, -1.0) + np.where(sma_20 > sma_50, 1.0, -1.0))
+        valid = np.logical_and.reduce([
+            ~np.isnan(col) & (col != 0) for col in (ema_12, ema_26, sma_20, sma_50)
+        ])
+        return np.where(valid, score, np.nan)
+
 
+# 特征向量中的基础数值特征（顺序固定）
+_NUMERIC_FEATURES = (
+    'volatility', 'beta', 'momentum_1d', 'momentum_5d', 'momentum_20d',
+    'mean_reversion', 'trend_strength', 'volume_profile',
+    'sentiment_score', 'prediction_confidence', 'anomaly_score'
+)
+# 一次C调用取出全部基础特征
+_get_numeric_features = operator.attrgetter(*_NUMERIC_FEATURES)
 
-@dataclass
+
+@dataclass(slots=True)
 class AIFeatures:
     """AI分析特征"""
     volatility: Optional[float] = None
@@ -261,51 +439,40 @@ class AIFeatures:
     
     def get_feature_vector(self) -> List[float]:
         """获取特征向量，用于机器学习"""
-        features = []
-        
         # 基础特征
-        numeric_fields = [
-            'volatility', 'beta', 'momentum_1d', 'momentum_5d', 'momentum_20d',
-            'mean_reversion', 'trend_strength', 'volume_profile',
-            'sentiment_score', 'prediction_confidence', 'anomaly_score'
-        ]
-        
-        for field in numeric_fields:
-            value = getattr(self, field)
-            features.append(value if value is not None else 0.0)
+        features = [0.0 if value is None else value for value in _get_numeric_features(self)]
         
         # 自定义特征
-        features.extend(list(self.custom_features.values()))
+        features.extend(self.custom_features.values())
         
         return features
     
-    def to_dict(self) -> Dict[str, Any]:
-        """转换为字典"""
-        return {
-            "volatility": self.volatility,
-            "beta": self.beta,
-            "momentum_1d": self.momentum_1d,
-            "momentum_5d": self.momentum_5d,
-            "momentum_20d": self.momentum_20d,
-            "mean_reversion": self.mean_reversion,
-            "trend_strength": self.trend_strength,
-            "volume_profile": self.volume_profile,
-            "pattern_signals": self.pattern_signals,
-            "sentiment_score": self.sentiment_score,
-            "prediction_confidence": self.prediction_confidence,
-            "anomaly_score": self.anomaly_score,
-            "custom_features": self.custom_features
-        }
+    @staticmethod
+    def batch_feature_matrix(instances: Sequence["AIFeatures"]) -> np.ndarray:
+        """批量构建 (N, 11) 的基础特征矩阵，缺失值（None/NaN）为0
+        
+        各实例的自定义特征不一定相同，不包含在矩阵中。
+        """
+        matrix = np.array(
+            [_get_numeric_features(f) for f in instances], dtype=np.float64
+        ).reshape(len(instances), len(_NUMERIC_FEATURES))
+        matrix[np.isnan(matrix)] = 0.0
+        return matrix
+
+
+# 与 BaseDataModel 相同，按字段列表生成一次字典字面量形式的 to_dict，
+# 新增字段时无需再手动同步键列表
+AIFeatures.to_dict = _build_to_dict(AIFeatures)
 
 
-@dataclass
+@dataclass(slots=True)
 class EnhancedPriceData(PriceData):
     """增强型价格数据，包含技术指标和AI特征"""
     technical_indicators: Optional[TechnicalIndicators] = None
     ai_features: Optional[AIFeatures] = None
     
     def __post_init__(self):
-        super().__post_init__()
+        super(EnhancedPriceData, self).__post_init__()
         
         if self.technical_indicators is None:
             self.technical_indicators = TechnicalIndicators()
@@ -314,12 +481,83 @@ class EnhancedPriceData(PriceData):
             self.ai_features = AIFeatures()
         
         # 语义标签
-        self.ai_metadata.add_semantic_tag("enriched", "true")
-        self.ai_metadata.add_semantic_tag("has_technicals", "true")
-        self.ai_metadata.add_semantic_tag("has_ai_features", "true")
+        self.ai_metadata.use_shared_defaults(
+            semantic_tags=_ENHANCED_SEMANTIC_TAGS[self.currency]
+        )
+
+
+class StreamingIndicatorState:
+    """按K线增量维护的技术指标状态
+    
+    按时间顺序对每个新数据点调用 update，每根K线 O(1) 更新：SMA 使用定长窗口和滚动和，
+    EMA 以前 n 个收盘价的 SMA 为初值再逐根递推。计算口径与数据源一次性计算的指标相同；
+    缺失（或为0）的收盘价、成交量不计入。
+    """
+    
+    SMA_WINDOWS = (5, 10, 20, 50, 200)
+    EMA_PERIODS = (12, 26)
+    VOLUME_WINDOW = 20
+    
+    def __init__(self):
+        self._windows = {n: deque(maxlen=n) for n in self.SMA_WINDOWS}
+        self._sums = dict.fromkeys(self.SMA_WINDOWS, 0.0)
+        self._ema: Dict[int, Optional[float]] = dict.fromkeys(self.EMA_PERIODS)
+        self._closes_seen = 0
+        self._seed_sum = 0.0  # 前 max(EMA_PERIODS) 个收盘价之和，用作EMA初值
+        self._volumes: deque = deque(maxlen=self.VOLUME_WINDOW)
+        self._volume_sum = 0.0
+    
+    def _push_close(self, close: float) -> None:
+        for n, window in self._windows.items():
+            old = window[0] if len(window) == n else 0.0
+            window.append(close)
+            self._sums[n] += close - old
+        
+        self._closes_seen += 1
+        if self._closes_seen <= self.EMA_PERIODS[-1]:
+            self._seed_sum += close
+        for n, ema in self._ema.items():
+            if ema is not None:
+                self._ema[n] = ema + 2 / (n + 1) * (close - ema)
+            elif self._closes_seen == n:
+                self._ema[n] = self._seed_sum / n
+    
+    def _push_volume(self, volume: float) -> None:
+        old = self._volumes[0] if len(self._volumes) == self.VOLUME_WINDOW else 0.0
+        self._volumes.append(volume)
+        self._volume_sum += volume - old
+    
+    def update(self, price_data: "EnhancedPriceData") -> TechnicalIndicators:
+        """加入一根新K线，并把最新指标写入 price_data.technical_indicators"""
+        if price_data.close_value:
+            self._push_close(price_data.close_value)
+        if price_data.volume:
+            self._push_volume(price_data.volume)
+        
+        indicators = price_data.technical_indicators
+        if indicators is None:
+            indicators = price_data.technical_indicators = TechnicalIndicators()
+        
+        for n, window in self._windows.items():
+            if len(window) == n:
+                setattr(indicators, f"sma_{n}", self._sums[n] / n)
+        
+        ema_12 = self._ema[12]
+        ema_26 = self._ema[26]
+        indicators.ema_12 = ema_12
+        indicators.ema_26 = ema_26
+        if ema_12 and ema_26:
+            indicators.macd = ema_12 - ema_26
+        
+        if len(self._volumes) == self.VOLUME_WINDOW:
+            indicators.volume_sma = self._volume_sum / self.VOLUME_WINDOW
+            if indicators.volume_sma > 0:
+                indicators.volume_ratio = self._volumes[-1] / indicators.volume_sma
+        
+        return indicators
 
 
-@dataclass
+@dataclass(slots=True)
 class DataValidationResult:
     """数据验证结果"""
     is_valid: bool
@@ -327,6 +565,8 @@ class DataValidationResult:
     warnings: List[str] = field(default_factory=list)
     completeness_score: float = 0.0
     quality_score: float = 0.0
+    # 批量验证时每行的错误数
+    errors_per_row: Optional[np.ndarray] = None
     
     def add_error(self, error: str) -> None:
         """添加错误"""
@@ -338,6 +578,16 @@ class DataValidationResult:
         self.warnings.append(warning)
 
 
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+# 计算完整性分数的主要字段
+_PRICE_COMPLETENESS_FIELDS = (
+    'open_value', 'high_value', 'low_value', 'close_value', 'volume',
+    'adjusted_close', 'dividend_amount', 'split_ratio', 'change', 'change_percent'
+)
+
+
 class BaseDataValidator:
     """数据验证器基类"""
     
@@ -372,10 +622,8 @@ class BaseDataValidator:
                 result.add_warning("Close price outside of high-low range")
         
         # 计算完整性分数
-        total_fields = 10  # 主要字段数量
-        non_null_fields = sum(1 for field in 
-            ['open_value', 'high_value', 'low_value', 'close_value', 'volume',
-             'adjusted_close', 'dividend_amount', 'split_ratio', 'change', 'change_percent']
+        total_fields = len(_PRICE_COMPLETENESS_FIELDS)  # 主要字段数量
+        non_null_fields = sum(1 for field in _PRICE_COMPLETENESS_FIELDS
             if getattr(data, field) is not None)
         
         result.completeness_score = non_null_fields / total_fields
@@ -388,6 +636,82 @@ class BaseDataValidator:
         
         return result
     
+    @staticmethod
+    def validate_price_batch(
+        data: Union["pd.DataFrame", Mapping[str, Any]]
+    ) -> DataValidationResult:
+        """按列批量验证价格数据，逐行规则与 validate_price_data 相同
+        
+        data 为 DataFrame 或 {字段名: 一维数组} 的映射，列名与 PriceData 字段一致；
+        数值列中的 NaN/None 视为空值，缺少的数值列视为整列为空。timestamp、symbol
+        列仅在提供时检查。返回汇总结果，分数为各行平均值，errors_per_row 为每行错误数。
+        """
+        if isinstance(data, Mapping):
+            n = len(next(iter(data.values()), ()))
+        else:
+            n = len(data.index)
+        
+        result = DataValidationResult(is_valid=True)
+        if n == 0:
+            result.errors_per_row = np.zeros(0, dtype=np.int64)
+            return result
+        
+        def column(name: str) -> np.ndarray:
+            if name not in data:
+                return np.full(n, np.nan)
+            return np.asarray(data[name], dtype=np.float64)
+        
+        values = {name: column(name) for name in _PRICE_COMPLETENESS_FIELDS}
+        present = {name: ~np.isnan(col) for name, col in values.items()}
+        open_, high, low, close = (values[name] for name in
+            ('open_value', 'high_value', 'low_value', 'close_value'))
+        
+        # 错误：缺少必填字段、收盘价非正、成交量为负
+        missing = ~present['close_value']
+        for name in ('timestamp', 'symbol'):
+            if name in data:
+                missing |= np.asarray(
+                    [v is None or v != v for v in data[name]], dtype=bool
+                )
+        non_positive_close = close <= 0
+        negative_volume = values['volume'] < 0
+        errors_per_row = (
+            missing.astype(np.int64) + non_positive_close + negative_volume
+        )
+        
+        # 警告：OHLC 四个值均非空且非零时检查开盘价、收盘价是否在高低价之间
+        ohlc_checked = np.logical_and.reduce([
+            present[name] & (values[name] != 0)
+            for name in ('open_value', 'high_value', 'low_value', 'close_value')
+        ])
+        open_outside = ohlc_checked & ~((low <= open_) & (open_ <= high))
+        close_outside = ohlc_checked & ~((low <= close) & (close <= high))
+        warnings_per_row = open_outside.astype(np.int64) + close_outside
+        
+        for count, message in (
+            (missing.sum(), "Missing required fields"),
+            (non_positive_close.sum(), "Close price must be positive"),
+            (negative_volume.sum(), "Volume cannot be negative"),
+        ):
+            if count:
+                result.add_error(f"{message} ({count} rows)")
+        for count, message in (
+            (open_outside.sum(), "Open price outside of high-low range"),
+            (close_outside.sum(), "Close price outside of high-low range"),
+        ):
+            if count:
+                result.add_warning(f"{message} ({count} rows)")
+        
+        completeness = np.add.reduce(list(present.values()), dtype=np.float64)
+        completeness /= len(_PRICE_COMPLETENESS_FIELDS)
+        quality = np.where(
+            errors_per_row == 0, completeness * (1 - warnings_per_row * 0.1), 0.0
+        )
+        result.completeness_score = float(completeness.mean())
+        result.quality_score = float(quality.mean())
+        result.errors_per_row = errors_per_row
+        return result
+    
     @staticmethod
     def validate_timeseries_consistency(data_points: List[PriceData]) -> DataValidationResult:
         """验证时间序列数据一致性"""
@@ -396,23 +720,38 @@ class BaseDataValidator:
         if len(data_points) < 2:
             return result
         
+        n = len(data_points)
+        
+        # 时间戳转换为整数微秒，相邻差值同时用于排序和重复检查
+        timestamps = np.fromiter(
+            ((dp.timestamp - _EPOCH) // _MICROSECOND for dp in data_points),
+            dtype=np.int64, count=n
+        )
+        steps = np.diff(timestamps)
+        ordered = bool((steps >= 0).all())
+        
         # 检查时间序列是否排序
-        timestamps = [dp.timestamp for dp in data_points]
-        if timestamps != sorted(timestamps):
+        if not ordered:
             result.add_warning("Time series data is not chronologically ordered")
         
-        # 检查是否有重复时间戳
-        if len(timestamps) != len(set(timestamps)):
+        # 检查是否有重复时间戳（未排序时重复值不一定相邻）
+        if (steps == 0).any() if ordered else np.unique(timestamps).size != n:
             result.add_warning("Duplicate timestamps found in time series")
         
-        # 检查异常的价格跳跃
-        for i in range(1, len(data_points)):
-            prev_close = data_points[i-1].close_value
-            curr_open = data_points[i].open_value
-            
-            if prev_close and curr_open:
-                gap_percent = abs((curr_open - prev_close) / prev_close) * 100
-                if gap_percent > 20:  # 20%的价格跳跃
-                    result.add_warning(f"Large price gap detected at {data_points[i].timestamp}")
+        # 检查异常的价格跳跃：前一收盘价与当前开盘价均非空且非零时比较
+        closes = np.array([dp.close_value for dp in data_points], dtype=np.float64)
+        opens = np.array([dp.open_value for dp in data_points], dtype=np.float64)
+        prev_close = closes[:-1]
+        curr_open = opens[1:]
+        comparable = (
+            ~np.isnan(prev_close) & (prev_close != 0)
+            & ~np.isnan(curr_open) & (curr_open != 0)
+        )
+        gap_percent = np.abs(
+            np.divide(curr_open - prev_close, prev_close,
+                      out=np.zeros_like(prev_close), where=comparable)
+        ) * 100
+        for i in np.flatnonzero(gap_percent > 20) + 1:  # 20%的价格跳跃
+            result.add_warning(f"Large price gap detected at {data_points[i].timestamp}")
         
         return result
\ No newline at end of file
@@ -1,10 +1,11 @@
 """Data processing engine for various data formats."""
 
 import asyncio
+import functools
 import io
 import json
 from datetime import datetime, timezone
-from typing import Dict, Any, Union
+from typing import Any, Callable, Dict, Optional, TypeVar, Union
 
 import pandas as pd
 import xmltodict
@@ -12,6 +13,231 @@ from bs4 import BeautifulSoup
 
 from fetcher.config.logging import get_logger
 
+try:
+    import orjson
+except ImportError:  # orjson is an optional performance dependency
+    orjson = None
+
+try:
+    # selectolax 的 lexbor 后端为C实现的HTML解析器
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # selectolax is an optional performance dependency
+    LexborHTMLParser = None
+
+try:
+    # libxml2 解析XML，比 xmltodict 基于Python回调的SAX解析快一个数量级
+    from lxml import etree
+except ImportError:  # lxml is an optional performance dependency
+    etree = None
+
+T = TypeVar("T")
+
+# 小于该大小的数据直接在事件循环中解析，线程切换的开销比解析本身更大
+_OFFLOAD_MIN_BYTES = 64 * 1024
+
+
+_HEADING_TAGS = ("h1", "h2", "h3", "h4", "h5", "h6")
+_HTML_TARGETS = "title, " + ", ".join(_HEADING_TAGS) + ", a[href], img[src]"
+_MAX_LINKS = 20
+_MAX_IMAGES = 10
+_XML_NAMESPACE = "http://www.w3.org/XML/1998/namespace"
+
+
+async def _offload(size: int, func: Callable[..., T], *args: Any) -> T:
+    """Run a blocking parse step inline for small payloads, on a worker thread otherwise."""
+    if size < _OFFLOAD_MIN_BYTES:
+        return func(*args)
+    return await asyncio.to_thread(func, *args)
+
+
+def _extract_html_lexbor(data: str) -> Dict[str, Any]:
+    """Extract title, text, headings, links and images with selectolax in one
+    selector query; same output as the BeautifulSoup version."""
+    tree = LexborHTMLParser(data)
+    # BeautifulSoup 的 get_text 不包含 script/style 的内容
+    tree.strip_tags(["script", "style"])
+    
+    title = None
+    headings = []
+    links = []
+    images = []
+    # 一次查询按文档顺序返回全部目标元素
+    for node in tree.css(_HTML_TARGETS):
+        tag = node.tag
+        if tag == "a":
+            if len(links) < _MAX_LINKS:
+                links.append({"text": node.text(strip=True), "href": node.attributes.get("href") or ""})
+        elif tag == "img":
+            if len(images) < _MAX_IMAGES:
+                images.append({"alt": node.attributes.get("alt") or "", "src": node.attributes.get("src") or ""})
+        elif tag == "title":
+            if title is None:
+                title = node
+        else:
+            headings.append(node.text(strip=True))
+    
+    return {
+        # 与 soup.title.string 一致：没有 <title> 时为空串，<title> 为空时为 None
+        "title": (title.text() or None) if title is not None else "",
+        "text_content": tree.root.text(strip=True) if tree.root is not None else "",
+        "headings": headings,
+        "links": links,
+        "images": images
+    }
+
+
+def _extract_html_bs4(data: str) -> Dict[str, Any]:
+    """Extract title, text, headings, links and images with BeautifulSoup."""
+    soup = BeautifulSoup(data, 'html.parser')
+    return {
+        "title": soup.title.string if soup.title else "",
+        "text_content": soup.get_text(strip=True),
+        "headings": [h.get_text(strip=True) for h in soup.find_all(list(_HEADING_TAGS))],
+        "links": [{"text": a.get_text(strip=True), "href": a.get('href')} for a in soup.find_all('a', href=True, limit=_MAX_LINKS)],
+        "images": [{"alt": img.get('alt', ''), "src": img.get('src')} for img in soup.find_all('img', src=True, limit=_MAX_IMAGES)]
+    }
+
+
+def _extract_html(data: str) -> Dict[str, Any]:
+    """Extract structured content from an HTML document."""
+    if LexborHTMLParser is not None:
+        try:
+            return _extract_html_lexbor(data)
+        except Exception:
+            # selectolax 解析失败时退回 BeautifulSoup
+            pass
+    return _extract_html_bs4(data)
+
+
+def _parse_json(data: Union[str, bytes]) -> Any:
+    """Decode and parse a JSON payload."""
+    if orjson is not None:
+        try:
+            # orjson 直接解析UTF-8字节，无需先解码为str
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # orjson 不接受 NaN/Infinity 和超过64位的整数；交给标准库重新解析，
+            # 结果和错误信息与之前保持一致
+            pass
+    if isinstance(data, bytes):
+        data = data.decode('utf-8')
+    return json.loads(data)
+
+
+def _xml_tag(element: Any) -> str:
+    """Element name as written in the document (``prefix:local``), the way xmltodict names keys."""
+    local = element.tag.rpartition("}")[2]
+    return f"{element.prefix}:{local}" if element.prefix else local
+
+
+def _xml_attribute_name(name: str, element: Any) -> str:
+    """Attribute name as written in the document; ``{uri}local`` -> ``prefix:local``."""
+    if name[0] != "{":
+        return name
+    uri, local = name[1:].split("}", 1)
+    if uri == _XML_NAMESPACE:
+        return "xml:" + local
+    for prefix, namespace in element.nsmap.items():
+        if prefix and namespace == uri:
+            return f"{prefix}:{local}"
+    return local
+
+
+def _xml_element_to_dict(element: Any, parent_nsmap: Optional[Dict[Any, str]]) -> Any:
+    """Convert an lxml element to the value xmltodict produces for it:
+    ``@``-prefixed attributes, child elements by name (repeated names become
+    lists), text under ``#text``; a text-only element is its string and an
+    empty element is None.
+
+    ``parent_nsmap`` is None for documents without namespace declarations,
+    where tags can be used as keys directly.
+    """
+    item: Dict[str, Any] = {}
+    
+    nsmap = None
+    if parent_nsmap is not None:
+        nsmap = element.nsmap
+        # xmltodict 把命名空间声明当作普通属性（@xmlns / @xmlns:prefix）
+        for prefix, uri in nsmap.items():
+            if parent_nsmap.get(prefix) != uri:
+                item["@xmlns:" + prefix if prefix else "@xmlns"] = uri
+    for name, value in element.items():
+        item["@" + _xml_attribute_name(name, element)] = value
+    
+    text = element.text
+    # 叶子元素不创建子节点迭代器
+    if len(element):
+        # 混合内容中的文本包括元素自身的 text 和各子节点的 tail
+        text = [text] if text else []
+        for child in element:
+            tag = child.tag
+            # 未展开的实体引用不是元素，只保留其后的文本
+            if isinstance(tag, str):
+                key = tag if nsmap is None else _xml_tag(child)
+                value = _xml_element_to_dict(child, nsmap)
+                if key in item:
+                    existing = item[key]
+                    if isinstance(existing, list):
+                        existing.append(value)
+                    else:
+                        item[key] = [existing, value]
+                else:
+                    item[key] = value
+            if child.tail:
+                text.append(child.tail)
+        text = "".join(text)
+    
+    data = (text.strip() or None) if text else None
+    if not item:
+        return data
+    if data:
+        item["#text"] = data
+    return item
+
+
+def _parse_xml(data: Union[str, bytes]) -> Dict[str, Any]:
+    """Parse an XML payload into xmltodict's dictionary layout."""
+    if etree is None:
+        if isinstance(data, bytes):
+            data = data.decode('utf-8')
+        return xmltodict.parse(data)
+    
+    encoding = None
+    if isinstance(data, str):
+        # lxml 不接受带编码声明的str，按UTF-8编码后解析
+        data = data.encode('utf-8')
+        encoding = 'utf-8'
+    # 不展开DTD中定义的实体，也不访问外部资源；注释和处理指令在 xmltodict 中同样被忽略
+    parser = etree.XMLParser(
+        encoding=encoding, resolve_entities=False, remove_comments=True, remove_pis=True
+    )
+    root = etree.fromstring(data, parser)
+    # 与 xmltodict 一致，拒绝声明了实体的文档
+    dtd = root.getroottree().docinfo.internalDTD
+    if dtd is not None and any(True for _ in dtd.iterentities()):
+        raise ValueError("entities are disabled")
+    # 没有命名空间声明的文档（常见情况）跳过逐个元素的 nsmap 计算
+    nsmap = {} if b"xmlns" in data else None
+    return {_xml_tag(root): _xml_element_to_dict(root, nsmap)}
+
+
+@functools.lru_cache(maxsize=32)
+def _read_csv_cached(data: Union[str, bytes]) -> pd.DataFrame:
+    """Parse a CSV payload once; repeated requests with the same payload
+    (e.g. ``parse`` then ``validate``) reuse the DataFrame.
+
+    The frame is shared between callers and must not be modified in place.
+    """
+    buffer = io.BytesIO(data) if isinstance(data, bytes) else io.StringIO(data)
+    return pd.read_csv(buffer)
+
+
+def _frame_to_data(df: pd.DataFrame, parameters: Dict[str, str]) -> Any:
+    """Columnar ``{column: [values]}`` by default; row records when ``records=true``."""
+    if parameters.get("records", "false").lower() == "true":
+        return df.to_dict('records')
+    return df.to_dict('list')
+
 
 class DataProcessor:
     """Engine for processing various data formats."""
@@ -74,10 +300,7 @@ class DataProcessor:
     ) -> Dict[str, Any]:
         """Process JSON data."""
         try:
-            if isinstance(data, bytes):
-                data = data.decode('utf-8')
-            
-            parsed_data = json.loads(data)
+            parsed_data = await _offload(len(data), _parse_json, data)
             
             if processing_type == "parse":
                 return {
@@ -129,16 +352,13 @@ class DataProcessor:
     ) -> Dict[str, Any]:
         """Process CSV data."""
         try:
-            if isinstance(data, bytes):
-                data = data.decode('utf-8')
-            
-            # Use pandas for CSV processing
-            df = pd.read_csv(io.StringIO(data))
+            # Use pandas for CSV processing (字节直接交给pandas解析，相同内容复用解析结果)
+            df = await _offload(len(data), _read_csv_cached, data)
             
             if processing_type == "parse":
                 return {
                     "status": "success",
-                    "data": df.to_dict('records'),
+                    "data": await _offload(len(data), _frame_to_data, df, parameters),
                     "metadata": {
                         "type": "csv",
                         "rows": len(df),
@@ -152,7 +372,7 @@ class DataProcessor:
                 transformed_df = await self._apply_dataframe_transformations(df, parameters)
                 return {
                     "status": "success",
-                    "data": transformed_df.to_dict('records'),
+                    "data": await _offload(len(data), _frame_to_data, transformed_df, parameters),
                     "metadata": {
                         "type": "csv",
                         "rows": len(transformed_df),
@@ -166,14 +386,14 @@ class DataProcessor:
                 validation_result = await self._validate_dataframe(df, parameters)
                 return {
                     "status": "success",
-                    "data": df.to_dict('records'),
+                    "data": await _offload(len(data), _frame_to_data, df, parameters),
                     "validation": validation_result
                 }
             
             else:
                 return {
                     "status": "success",
-                    "data": df.to_dict('records'),
+                    "data": await _offload(len(data), _frame_to_data, df, parameters),
                     "metadata": {"type": "csv"}
                 }
                 
@@ -191,11 +411,8 @@ class DataProcessor:
     ) -> Dict[str, Any]:
         """Process XML data."""
         try:
-            if isinstance(data, bytes):
-                data = data.decode('utf-8')
-            
             # Convert XML to dictionary
-            parsed_data = xmltodict.parse(data)
+            parsed_data = await _offload(len(data), _parse_xml, data)
             
             return {
                 "status": "success",
@@ -223,16 +440,8 @@ class DataProcessor:
             if isinstance(data, bytes):
                 data = data.decode('utf-8')
             
-            soup = BeautifulSoup(data, 'html.parser')
-            
             # Extract structured content
-            extracted = {
-                "title": soup.title.string if soup.title else "",
-                "text_content": soup.get_text(strip=True),
-                "headings": [h.get_text(strip=True) for h in soup.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])],
-                "links": [{"text": a.get_text(strip=True), "href": a.get('href')} for a in soup.find_all('a', href=True)][:20],
-                "images": [{"alt": img.get('alt', ''), "src": img.get('src')} for img in soup.find_all('img', src=True)][:10]
-            }
+            extracted = await _offload(len(data), _extract_html, data)
             
             return {
                 "status": "success",
@@ -331,14 +540,21 @@ class DataProcessor:
     
     def _flatten_dict(self, d: Dict[str, Any], parent_key: str = '', sep: str = '.') -> Dict[str, Any]:
         """Flatten nested dictionary."""
-        items = []
-        for k, v in d.items():
-            new_key = f"{parent_key}{sep}{k}" if parent_key else k
-            if isinstance(v, dict):
-                items.extend(self._flatten_dict(v, new_key, sep=sep).items())
+        flat: Dict[str, Any] = {}
+        # 显式栈代替递归：每层保存(前缀, 剩余条目迭代器)，遇到子字典先压栈深入，
+        # 子字典处理完再继续父层，键的输出顺序与递归版本一致
+        stack = [(parent_key, iter(d.items()))]
+        while stack:
+            prefix, entries = stack[-1]
+            for k, v in entries:
+                new_key = f"{prefix}{sep}{k}" if prefix else k
+                if isinstance(v, dict):
+                    stack.append((new_key, iter(v.items())))
+                    break
+                flat[new_key] = v
             else:
-                items.append((new_key, v))
-        return dict(items)
+                stack.pop()
+        return flat
     
     async def _apply_dataframe_transformations(
         self,
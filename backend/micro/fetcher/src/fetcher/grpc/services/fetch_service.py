@@ -7,6 +7,7 @@ import uuid
 
 from fetcher.core.fetchers.api_client import APIClient
 from fetcher.core.fetchers.web_scraper import WebScraper
+from fetcher.core.fetchers._session import close_shared_connector
 from fetcher.core.processors.data_processor import DataProcessor
 from fetcher.config.settings import settings
 from fetcher.config.logging import get_logger
@@ -37,6 +38,7 @@ class FetchService:
         """Close all connections."""
         await self.api_client.close()
         await self.web_scraper.close()
+        await close_shared_connector()
         self.logger.info("Fetch service closed")
     
     async def fetch_external_data(
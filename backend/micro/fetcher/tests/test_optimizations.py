@@ -309,6 +309,416 @@ class TestArchitectureIntegration:
         # 如果没有提供商，结果可能为空，但不应该报错
 
 
+def _make_price_series(count, start=100.0, step=0.5):
+    """构造一段带技术指标和AI特征的价格序列"""
+    from datetime import timedelta
+    from fetcher.core.models.base import EnhancedPriceData, TechnicalIndicators, AIFeatures
+
+    series = []
+    for i in range(count):
+        close = start + step * i + (1.5 if i % 2 else -1.5)
+        series.append(EnhancedPriceData(
+            timestamp=datetime(2024, 1, 1) + timedelta(days=i),
+            symbol="TEST",
+            open_value=close - 0.5,
+            high_value=close + 1.0,
+            low_value=close - 1.0,
+            close_value=close,
+            volume=1000.0 + i,
+            technical_indicators=TechnicalIndicators(rsi=55.0),
+            ai_features=AIFeatures(momentum_1d=0.01, anomaly_score=0.5),
+        ))
+    return series
+
+
+class TestAIAnalyzer:
+    """测试AI金融分析器"""
+
+    def test_analyze_long_series(self):
+        """20个以上数据点时应完成全部分析而不报错"""
+        import asyncio
+        from fetcher.ai.analyzer import AIFinancialAnalyzer, AnalysisType
+
+        data = _make_price_series(60)
+        result = asyncio.run(
+            AIFinancialAnalyzer().analyze_price_data(data, list(AnalysisType))
+        )
+
+        assert result.symbol == "TEST"
+        assert result.market_context.market_regime != "unknown"
+        assert {s.signal_type for s in result.signals} >= {"trend_ma", "volatility", "momentum"}
+        assert result.key_metrics["current_price"] == data[-1].close_value
+        assert result.risk_assessment["max_drawdown"] <= 0
+        assert 0.0 <= result.data_quality_score <= 1.0
+
+    def test_missing_close_values_are_skipped(self):
+        """缺失的收盘价不应参与计算"""
+        import asyncio
+        from fetcher.ai.analyzer import AIFinancialAnalyzer
+
+        data = _make_price_series(30)
+        data[-1].close_value = None
+        result = asyncio.run(AIFinancialAnalyzer().analyze_price_data(data))
+
+        assert result.key_metrics["current_price"] == data[-2].close_value
+
+    def test_missing_prices_do_not_skip_record_based_analyses(self):
+        """有效收盘价不足时跳过基于收盘价的分析，但动量和异常检测按记录数判断"""
+        import asyncio
+        from fetcher.ai.analyzer import AIFinancialAnalyzer, AnalysisType
+
+        data = _make_price_series(30)
+        for point in data[:12]:
+            point.close_value = None
+        data[-1].ai_features.anomaly_score = 4.0
+        result = asyncio.run(
+            AIFinancialAnalyzer().analyze_price_data(data, list(AnalysisType))
+        )
+
+        signal_types = {s.signal_type for s in result.signals}
+        assert {"momentum", "anomaly_detection"} <= signal_types
+        assert "trend_ma" not in signal_types
+        assert result.risk_assessment == {}
+
+    def test_risk_kernel_matches_numpy(self):
+        """融合风险内核应与逐步NumPy计算结果一致"""
+        import numpy as np
+        from fetcher.ai._kernels import risk_kernel
+
+        prices = 100 * np.cumprod(1 + np.random.default_rng(0).normal(0, 0.02, 250))
+        returns = np.diff(np.log(prices))
+        cumulative = np.cumprod(1 + returns)
+        running_max = np.maximum.accumulate(cumulative)
+
+        var_95, var_99, max_drawdown, mean_ret, std_ret = risk_kernel(returns)
+
+        assert var_95 == pytest.approx(np.percentile(returns, 5))
+        assert var_99 == pytest.approx(np.percentile(returns, 1))
+        assert max_drawdown == pytest.approx(np.min((cumulative - running_max) / running_max))
+        assert mean_ret == pytest.approx(np.mean(returns))
+        assert std_ret == pytest.approx(np.std(returns))
+
+    def test_numpy_fallback_matches_kernels(self):
+        """未安装numba时使用的NumPy实现应与内核结果一致"""
+        import numpy as np
+        from fetcher.ai import _kernels
+
+        rng = np.random.default_rng(1)
+        prices = 100 * np.cumprod(1 + rng.normal(0, 0.02, 80))
+        returns = np.diff(np.log(prices))
+        momentum = rng.normal(size=80)
+        momentum[::3] = np.nan
+        rsi = rng.uniform(0, 100, 80)
+        rsi[-2:] = np.nan
+
+        np.testing.assert_allclose(_kernels._risk_kernel_numpy(returns), _kernels.risk_kernel(returns))
+        np.testing.assert_allclose(_kernels._rolling_mean_numpy(prices, 20), _kernels.rolling_mean(prices, 20))
+        assert _kernels._linreg_slope_numpy(prices) == pytest.approx(_kernels.linreg_slope(prices))
+        np.testing.assert_allclose(
+            np.array(_kernels._default_pipeline_numpy(prices, returns, prices, momentum, rsi), dtype=float),
+            np.array(_kernels.default_pipeline(prices, returns, prices, momentum, rsi), dtype=float),
+        )
+
+    def test_default_pipeline_matches_individual_analyses(self):
+        """默认分析的融合内核应与逐项分析生成相同的信号"""
+        from fetcher.ai.analyzer import AIFinancialAnalyzer, _DEFAULT_ANALYSES
+
+        analyzer = AIFinancialAnalyzer()
+        analyzer._load_kernels()
+        arrs = analyzer._to_arrays(_make_price_series(60, step=-0.8))
+
+        fused = analyzer._run_default_pipeline(arrs, list(_DEFAULT_ANALYSES))
+        individual = [analyzer._analyzers[t](arrs) for t in _DEFAULT_ANALYSES]
+
+        for fused_signals, signals in zip(fused, individual):
+            assert [s.signal_type for s in fused_signals] == [s.signal_type for s in signals]
+            for a, b in zip(fused_signals, signals):
+                assert a.direction == b.direction
+                assert a.strength == b.strength
+                assert a.confidence == pytest.approx(b.confidence)
+
+
+class TestAPIClient:
+    """测试API客户端的批量抓取"""
+
+    def test_fetch_multiple_bounds_concurrency_and_keeps_order(self):
+        """同时进行的请求数不超过上限，结果按请求顺序返回"""
+        import asyncio
+        from fetcher.core.fetchers.api_client import APIClient
+
+        client = APIClient()
+        in_flight = 0
+        peak = 0
+
+        async def fake_fetch(url, **kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.001 * (url % 3))
+            in_flight -= 1
+            return {"status": "success", "data": url}
+
+        client.fetch = fake_fetch
+        results = asyncio.run(
+            client.fetch_multiple([{"url": i} for i in range(20)], max_concurrent=4)
+        )
+
+        assert [r["data"] for r in results] == list(range(20))
+        assert peak == 4
+
+    def test_fetch_empty_json_body_returns_none(self):
+        """Content-Type为JSON但响应体为空（如204）时返回成功且data为None"""
+        import asyncio
+        from contextlib import asynccontextmanager
+        from fetcher.core.fetchers.api_client import APIClient
+
+        response = Mock()
+        response.status = 204
+        response.headers = {'Content-Type': 'application/json'}
+
+        async def read():
+            return b''
+
+        response.read = read
+
+        @asynccontextmanager
+        async def request(**kwargs):
+            yield response
+
+        client = APIClient()
+        client.session = Mock()
+        client.session.request = request
+        result = asyncio.run(client.fetch("https://example.com/empty"))
+
+        assert result["status"] == "success"
+        assert result["status_code"] == 204
+        assert result["data"] is None
+        assert result["size_bytes"] == 0
+
+
+class TestDataValidator:
+    """测试价格数据验证"""
+
+    def test_price_batch_matches_row_validation(self):
+        """按列批量验证应与逐行验证的结果一致"""
+        import pandas as pd
+        from fetcher.core.models.base import BaseDataValidator, PriceData
+
+        points = [
+            PriceData(symbol="A", open_value=10, high_value=12, low_value=9, close_value=11, volume=100),
+            PriceData(symbol="A", open_value=10, high_value=12, low_value=9, close_value=13),
+            PriceData(symbol="A", close_value=-1, volume=-5),
+            PriceData(symbol=None, open_value=10),
+        ]
+        frame = pd.DataFrame([
+            {name: getattr(p, name) for name in (
+                "symbol", "open_value", "high_value", "low_value", "close_value", "volume",
+                "adjusted_close", "dividend_amount", "split_ratio", "change", "change_percent",
+            )}
+            for p in points
+        ])
+
+        batch = BaseDataValidator.validate_price_batch(frame)
+        rows = [BaseDataValidator.validate_price_data(p) for p in points]
+
+        assert list(batch.errors_per_row) == [len(r.errors) for r in rows]
+        assert batch.is_valid is False
+        assert batch.completeness_score == pytest.approx(sum(r.completeness_score for r in rows) / len(rows))
+        assert batch.quality_score == pytest.approx(sum(r.quality_score for r in rows) / len(rows))
+
+
+class TestStreamingIndicators:
+    """测试增量技术指标"""
+
+    def test_streaming_matches_full_recomputation(self):
+        """逐根更新的指标应与对全部历史一次性计算的结果一致"""
+        import numpy as np
+        from fetcher.core.models.base import EnhancedPriceData, StreamingIndicatorState
+
+        rng = np.random.default_rng(1)
+        closes = list(100 * np.cumprod(1 + rng.normal(0, 0.01, 260)))
+        volumes = list(rng.uniform(1e5, 2e5, 260))
+
+        def ema(prices, period):
+            value = sum(prices[:period]) / period
+            for price in prices[period:]:
+                value = price * (2 / (period + 1)) + value * (1 - 2 / (period + 1))
+            return value
+
+        state = StreamingIndicatorState()
+        for i, (close, volume) in enumerate(zip(closes, volumes), 1):
+            bar = EnhancedPriceData(symbol="TEST", close_value=close, volume=volume)
+            indicators = state.update(bar)
+            seen = closes[:i]
+
+            assert bar.technical_indicators is indicators
+            for n in (5, 10, 20, 50, 200):
+                expected = sum(seen[-n:]) / n if i >= n else None
+                assert getattr(indicators, f"sma_{n}") == pytest.approx(expected)
+            assert indicators.ema_12 == pytest.approx(ema(seen, 12) if i >= 12 else None)
+            assert indicators.ema_26 == pytest.approx(ema(seen, 26) if i >= 26 else None)
+            if i >= 26:
+                assert indicators.macd == pytest.approx(ema(seen, 12) - ema(seen, 26))
+            if i >= 20:
+                assert indicators.volume_sma == pytest.approx(sum(volumes[i - 20:i]) / 20)
+
+
+class TestDataProcessor:
+    """测试XML解析"""
+
+    def test_xml_matches_xmltodict_layout(self):
+        """lxml 解析结果应与 xmltodict 的字典结构一致"""
+        import xmltodict
+        from fetcher.core.processors.data_processor import _parse_xml
+
+        documents = [
+            '<a/>',
+            '<a x="1">  text </a>',
+            '<a><b>1</b><c/><b>2</b><b x="3">4</b></a>',
+            '<a>x<!--c-->y<b/>z</a>',
+            '<r xmlns="urn:d" xmlns:p="urn:p"><p:b p:at="1" xml:lang="en">t</p:b><c/></r>',
+            '<a><![CDATA[<raw>]]> &amp; more</a>',
+        ]
+        for document in documents:
+            assert _parse_xml(document) == xmltodict.parse(document)
+            assert _parse_xml(document.encode()) == xmltodict.parse(document)
+
+        with pytest.raises(ValueError):
+            _parse_xml('<!DOCTYPE a [<!ENTITY e "x">]><a>&e;</a>')
+
+
+class TestModelSerialization:
+    """测试共享默认映射的模型序列化"""
+
+    def test_pickle_and_deepcopy_round_trip(self):
+        """共享默认映射的模型可以 pickle、deepcopy 和 asdict，副本写入不影响原对象"""
+        import copy
+        import pickle
+        from dataclasses import asdict
+        from fetcher.core.models.base import EnhancedPriceData
+
+        data = EnhancedPriceData(symbol="AAPL", close_value=101.5, volume=1000)
+
+        for clone in (pickle.loads(pickle.dumps(data)), copy.deepcopy(data)):
+            assert clone == data
+            clone.ai_metadata.add_semantic_tag("source", "test")
+            assert clone.ai_metadata.semantic_tags["source"] == "test"
+            assert "source" not in data.ai_metadata.semantic_tags
+
+        assert asdict(data)["ai_metadata"]["semantic_tags"] == dict(data.ai_metadata.semantic_tags)
+
+
+class TestSeleniumDriverPool:
+    """测试Selenium driver池"""
+
+    def test_discarded_and_cancelled_drivers_free_their_slots(self):
+        """重置失败被丢弃、或启动途中被取消的driver都要归还名额，等待者不会挂起"""
+        import asyncio
+        import time
+        from fetcher.core.fetchers.web_scraper import WebScraper
+
+        started = []
+
+        class FakeDriver:
+            def __init__(self, broken):
+                self.broken = broken
+                self.quit_called = False
+                self.current_url = "https://example.com/page"
+                self.cdp_commands = []
+
+            def execute_cdp_cmd(self, cmd, params):
+                if self.broken:
+                    raise RuntimeError("chrome crashed")
+                self.cdp_commands.append((cmd, params))
+
+            def get(self, url):
+                pass
+
+            def quit(self):
+                self.quit_called = True
+
+        async def scenario():
+            scraper = WebScraper()
+            scraper._driver_slots = asyncio.Semaphore(1)
+
+            # 所有driver都在重置时失败：第二个等待者仍能拿到新driver
+            scraper._create_driver = lambda: started.append(FakeDriver(broken=True)) or started[-1]
+            first = await scraper._acquire_driver()
+            waiter = asyncio.create_task(scraper._acquire_driver())
+            await asyncio.sleep(0)
+            await scraper._release_driver(first)
+            second = await asyncio.wait_for(waiter, 1)
+            assert second is not first and first.quit_called
+            await scraper._release_driver(second)
+
+            # 启动途中取消：名额归还，启动完成的driver随后退出
+            def slow_create():
+                time.sleep(0.05)
+                started.append(FakeDriver(broken=False))
+                return started[-1]
+
+            scraper._create_driver = slow_create
+            task = asyncio.create_task(scraper._acquire_driver())
+            await asyncio.sleep(0.01)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            await asyncio.sleep(0.1)
+            assert started[-1].quit_called
+
+            scraper._create_driver = lambda: FakeDriver(broken=False)
+            driver = await asyncio.wait_for(scraper._acquire_driver(), 1)
+            await scraper._release_driver(driver)
+            # 归还前清除上一个页面源的存储和全部cookie
+            assert driver.cdp_commands == [
+                ("Storage.clearDataForOrigin", {"origin": "https://example.com", "storageTypes": "all"}),
+                ("Network.clearBrowserCookies", {}),
+            ]
+
+        asyncio.run(scenario())
+
+    def test_playwright_launch_failure_falls_back_to_selenium(self, monkeypatch):
+        """Playwright浏览器启动失败时改用Selenium，之后不再尝试启动"""
+        import asyncio
+        from fetcher.core.fetchers import web_scraper
+        from fetcher.core.fetchers.web_scraper import WebScraper
+
+        launches = []
+        stopped = []
+
+        class FakePlaywright:
+            class chromium:
+                @staticmethod
+                async def launch(**kwargs):
+                    launches.append(kwargs)
+                    raise RuntimeError("Executable doesn't exist")
+
+            async def stop(self):
+                stopped.append(True)
+
+        class FakeStarter:
+            async def start(self):
+                return FakePlaywright()
+
+        monkeypatch.setattr(web_scraper, "async_playwright", FakeStarter)
+
+        async def fake_selenium(url, selectors=None, wait_for_element=None):
+            return {"status": "success", "url": url, "engine": "selenium"}
+
+        async def scenario():
+            scraper = WebScraper()
+            scraper._scrape_with_selenium = fake_selenium
+            first = await scraper.scrape_url("https://example.com/a", javascript=True)
+            second = await scraper.scrape_url("https://example.com/b", javascript=True)
+            return scraper, first, second
+
+        scraper, first, second = asyncio.run(scenario())
+
+        assert first["engine"] == second["engine"] == "selenium"
+        assert len(launches) == 1 and stopped == [True]
+        assert scraper._playwright is None and scraper._browser is None
+
+
 # 运行测试的便捷函数
 def run_tests():
     """运行所有测试"""